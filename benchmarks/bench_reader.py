@@ -0,0 +1,269 @@
+"""
+Reader benchmark - page turn costs through PDFHandler on synthetic PDFs
+
+Generates text-dense, vector-heavy, image-heavy and 2,000-page documents and,
+for each, times opening, rendering at several zooms, pixmap to Qt image
+conversion, get_text("dict"), document search and selection hit-testing. Every
+case reports the median of its runs in milliseconds. Results are written as
+JSON and can be compared with a stored baseline; the run fails (exit status 1)
+when a case is slower than the baseline by more than the threshold.
+
+Qt cases run on the offscreen platform and are skipped when PyQt6 is missing.
+
+Usage:
+    python benchmarks/bench_reader.py --save-baseline baseline.json
+    python benchmarks/bench_reader.py --baseline baseline.json --threshold 0.15
+    python benchmarks/bench_reader.py --only text_dense --output results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import fitz  # PyMuPDF
+
+from bench_render import generate_vector_pdf
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+ZOOMS = (1.0, 1.5, 2.0, 3.0)
+QIMAGE_ZOOM = 1.5
+SEARCH_WORD = "throughput"
+SELECTIONS_PER_PAGE = 20
+
+WORDS = ("attention memory reading focus sprint chapter proof lemma theorem margin "
+         "highlight vector cache index latency throughput render page topic").split()
+
+# Synthetic documents
+
+def random_paragraph(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+def generate_text_pdf(path: str, page_count: int, paragraphs: int = 12, seed: int = 11):
+    """Pages of small justified text, like papers and dense books"""
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for number in range(page_count):
+        page = doc.new_page()
+        page.insert_text((72, 60), f"Chapter {number // 20 + 1}", fontsize=16)
+        text = "\n\n".join(random_paragraph(rng, rng.randint(60, 110)) for _ in range(paragraphs))
+        page.insert_textbox(page.rect + (72, 80, -72, -60), text, fontsize=8, align=fitz.TEXT_ALIGN_JUSTIFY)
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+
+def generate_image_pdf(path: str, page_count: int, images_per_page: int = 4, seed: int = 13):
+    """Pages of photos (noise, so nothing compresses away) with captions"""
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for number in range(page_count):
+        page = doc.new_page()
+        width, height = page.rect.width, page.rect.height
+        cell_height = (height - 72) / images_per_page
+        for i in range(images_per_page):
+            pixmap = fitz.Pixmap(fitz.csRGB, 480, 320, rng.randbytes(480 * 320 * 3), False)
+            top = 36 + i * cell_height
+            page.insert_image(fitz.Rect(72, top, width - 72, top + cell_height - 18), pixmap=pixmap)
+            page.insert_text((72, top + cell_height - 6), f"Figure {number + 1}.{i + 1}", fontsize=8)
+    doc.save(path, deflate=True)
+    doc.close()
+
+def generate_long_pdf(path: str, page_count: int, seed: int = 17):
+    """Many short pages, like a long novel"""
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for _ in range(page_count):
+        page = doc.new_page()
+        page.insert_textbox(page.rect + (72, 72, -72, -72), random_paragraph(rng, 250), fontsize=11)
+    doc.save(path, garbage=3, deflate=True)
+    doc.close()
+
+DOCUMENTS = {
+    'text_dense': lambda path, pages: generate_text_pdf(path, pages),
+    'vector_heavy': lambda path, pages: generate_vector_pdf(path, pages, segments=20000),
+    'image_heavy': lambda path, pages: generate_image_pdf(path, pages),
+    'long_2000': lambda path, pages: generate_long_pdf(path, 2000),
+}
+
+# Measurements
+
+def median_ms(run: Callable[[], None], repeat: int, setup: Optional[Callable[[], None]] = None) -> float:
+    """Median wall time of run in milliseconds, setup runs untimed before each run"""
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - start) * 1000)
+    return round(statistics.median(timings), 3)
+
+def sample_pages(page_count: int, sample: int) -> List[int]:
+    """Up to sample page indexes spread evenly over the document"""
+    if page_count <= sample:
+        return list(range(page_count))
+    return sorted({round(i * (page_count - 1) / (sample - 1)) for i in range(sample)})
+
+def load_qt():
+    """Qt helpers for the image and hit-testing cases, or None without PyQt6"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        from PyQt6.QtGui import QGuiApplication
+        from ui.page_rendering import frame_to_qpixmap
+        from notes.highlight_selector import selection_quads
+    except ImportError as e:
+        print(f"⚠️ Skipping Qt cases: {e}")
+        return None
+    app = QGuiApplication.instance() or QGuiApplication([])
+    return app, frame_to_qpixmap, selection_quads
+
+def selection_rects(page_size, count: int, seed: int) -> List[List[float]]:
+    """Drag selections of a few lines up to a paragraph"""
+    rng = random.Random(seed)
+    width, height = page_size
+    rects = []
+    for _ in range(count):
+        x0, y0 = rng.uniform(0, width * 0.6), rng.uniform(0, height * 0.8)
+        rects.append([x0, y0, x0 + rng.uniform(40, width * 0.4), y0 + rng.uniform(10, height * 0.2)])
+    return rects
+
+def bench_document(handler, path: str, pages: List[int], repeat: int, qt) -> Dict[str, float]:
+    """Every case for one document, keyed by case name"""
+    results = {}
+
+    # Closing drops the workers' handles, so every open parses the file again
+    results['open'] = median_ms(lambda: handler.open_document(path), repeat, setup=handler.close_pdf)
+
+    # First touch parses the page; later zooms replay the engine's display list
+    for zoom in ZOOMS:
+        results[f'render@{zoom:g}'] = median_ms(
+            lambda: [handler.get_page_pixmap(page, zoom) for page in pages], repeat
+        ) / len(pages)
+
+    frames = [handler.get_page_pixmap(page, QIMAGE_ZOOM) for page in pages]
+    if qt:
+        _, frame_to_qpixmap, _ = qt
+        results['qimage'] = median_ms(lambda: [frame_to_qpixmap(frame) for frame in frames], repeat) / len(pages)
+
+    results['text_dict'] = median_ms(lambda: [handler.get_page_text_dict(page) for page in pages], repeat) / len(pages)
+    results['search'] = median_ms(lambda: handler.search_text(SEARCH_WORD), repeat)
+
+    if qt:
+        _, _, selection_quads = qt
+        page_sizes = handler.get_page_sizes()
+        selections = [
+            (handler.get_page_text_dict(page).get('blocks', []), rect)
+            for page in pages
+            for rect in selection_rects(page_sizes[page], SELECTIONS_PER_PAGE, seed=page)
+        ]
+        results['hit_test'] = median_ms(
+            lambda: [selection_quads(blocks, rect) for blocks, rect in selections], repeat
+        ) / len(selections)
+
+    handler.close_pdf()
+    return {case: round(value, 3) for case, value in results.items()}
+
+# Baselines
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            threshold: float, min_delta_ms: float) -> List[str]:
+    """Cases slower than baseline by more than threshold (and min_delta_ms)"""
+    regressions = []
+    print(f"\n{'document':<14} {'case':<12} {'baseline':>10} {'now':>10} {'change':>8}")
+    for document, cases in results.items():
+        for case, value in cases.items():
+            before = baseline.get(document, {}).get(case)
+            if before is None:
+                print(f"{document:<14} {case:<12} {'-':>10} {value:>8.2f}ms {'new':>8}")
+                continue
+            change = (value - before) / before if before else 0.0
+            regressed = change > threshold and value - before > min_delta_ms
+            marker = " ❌" if regressed else ""
+            print(f"{document:<14} {case:<12} {before:>8.2f}ms {value:>8.2f}ms {change:>+7.0%}{marker}")
+            if regressed:
+                regressions.append(f"{document}/{case}: {before:.2f}ms -> {value:.2f}ms ({change:+.0%})")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=8, help="pages in each synthetic PDF (not the 2,000-page one)")
+    parser.add_argument("--sample", type=int, default=8, help="pages measured per document")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case, the median is reported")
+    parser.add_argument("--only", action="append", choices=sorted(DOCUMENTS), help="benchmark only these documents")
+    parser.add_argument("--workers", type=int, default=1, help="PDF engine worker processes")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against results saved earlier")
+    parser.add_argument("--save-baseline", help="write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown, 0.15 = 15%%")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="sprintreader-bench-")
+    # Keep the benchmark away from the reader's database and caches
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+    os.environ["CACHE_DIR"] = os.path.join(tmp_dir, "cache")
+
+    from database.models import db_manager
+    from pdf_handler.pdf_engine import PDFEngine
+    from pdf_handler.pdf_handler import PDFHandler
+    db_manager.create_tables()
+
+    qt = load_qt()
+    handler = PDFHandler(PDFEngine(workers=args.workers))
+    results = {}
+    try:
+        for name in args.only or DOCUMENTS:
+            path = os.path.join(tmp_dir, f"{name}.pdf")
+            print(f"Generating {name}...")
+            DOCUMENTS[name](path, args.pages)
+            with fitz.open(path) as doc:
+                pages = sample_pages(len(doc), args.sample)
+            results[name] = bench_document(handler, path, pages, args.repeat, qt)
+            print(f"{name}: " + ", ".join(f"{case} {value:.2f}ms" for case, value in results[name].items()))
+    finally:
+        handler.shutdown()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pymupdf': fitz.VersionBind,
+            'platform': platform.platform(),
+            'qt': qt is not None,
+            'pages': args.pages,
+            'sample': args.sample,
+            'repeat': args.repeat,
+            'workers': args.workers,
+        },
+        'results': results,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps(report, indent=2))
+        print(f"\nSaved baseline to {args.save_baseline}")
+    if not args.output and not args.save_baseline:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())['results']
+        regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) over {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\n✅ No regressions over {args.threshold:.0%}")
+
+if __name__ == "__main__":
+    main()
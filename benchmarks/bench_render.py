@@ -0,0 +1,137 @@
+"""
+Render benchmark - display-list replay versus re-interpreting the page
+
+Builds a synthetic vector-heavy PDF (thousands of stroked paths per page) and,
+for each page, times a zoom sweep, a set of tile clips and a thumbnail, once
+through page.get_pixmap (content stream parsed every time) and once by replaying
+a cached fitz.DisplayList the way the PDF engine workers do.
+
+Usage:
+    python benchmarks/bench_render.py --pages 8 --segments 20000
+    python benchmarks/bench_render.py --pdf some_book.pdf
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import fitz  # PyMuPDF
+
+ZOOMS = (1.0, 1.25, 1.5, 2.0, 1.5, 1.0)  # Zooming in and back out again
+TILE_ZOOM = 2.0
+TILE_GRID = 2                            # 2x2 clips per page
+THUMBNAIL_ZOOM = 24 / 72                 # Matches THUMBNAIL_DPI in ui.thumbnail_strip
+
+def generate_vector_pdf(path: str, page_count: int, segments: int, seed: int = 7):
+    """Write pages covered in short strokes and curves, like plots and diagrams"""
+    rng = random.Random(seed)
+    doc = fitz.open()
+    for _ in range(page_count):
+        page = doc.new_page()
+        width, height = page.rect.width, page.rect.height
+        shape = page.new_shape()
+        for i in range(segments):
+            x, y = rng.uniform(0, width), rng.uniform(0, height)
+            if i % 3:
+                shape.draw_line((x, y), (x + rng.uniform(-12, 12), y + rng.uniform(-12, 12)))
+            else:
+                shape.draw_bezier((x, y), (x + 6, y - 9), (x + 12, y + 9), (x + 18, y))
+            if i % 500 == 499:
+                shape.finish(color=(rng.random(), rng.random(), rng.random()), width=0.4)
+        shape.finish(color=(0, 0, 0), width=0.4)
+        shape.commit()
+        page.insert_text((72, 72), "Vector-heavy benchmark page", fontsize=14)
+    doc.save(path)
+    doc.close()
+
+def tiles(rect: fitz.Rect):
+    """Split a page into a grid of clip rectangles"""
+    width, height = rect.width / TILE_GRID, rect.height / TILE_GRID
+    for row in range(TILE_GRID):
+        for col in range(TILE_GRID):
+            yield fitz.Rect(col * width, row * height, (col + 1) * width, (row + 1) * height)
+
+def run_direct(doc: fitz.Document) -> dict:
+    """Every render parses the page again"""
+    timings = {'zoom_sweep': 0.0, 'tiles': 0.0, 'thumbnail': 0.0}
+    for page in doc:
+        start = time.perf_counter()
+        for zoom in ZOOMS:
+            page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+        timings['zoom_sweep'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for clip in tiles(page.rect):
+            page.get_pixmap(matrix=fitz.Matrix(TILE_ZOOM, TILE_ZOOM), clip=clip)
+        timings['tiles'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        page.get_pixmap(matrix=fitz.Matrix(THUMBNAIL_ZOOM, THUMBNAIL_ZOOM))
+        timings['thumbnail'] += time.perf_counter() - start
+    return timings
+
+def run_display_list(doc: fitz.Document) -> dict:
+    """Parse each page once, then replay its display list (build time is charged to the sweep)"""
+    timings = {'zoom_sweep': 0.0, 'tiles': 0.0, 'thumbnail': 0.0}
+    for page in doc:
+        start = time.perf_counter()
+        display_list = page.get_displaylist()
+        for zoom in ZOOMS:
+            display_list.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        timings['zoom_sweep'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for clip in tiles(page.rect):
+            display_list.get_pixmap(matrix=fitz.Matrix(TILE_ZOOM, TILE_ZOOM), alpha=False, clip=clip)
+        timings['tiles'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        display_list.get_pixmap(matrix=fitz.Matrix(THUMBNAIL_ZOOM, THUMBNAIL_ZOOM), alpha=False)
+        timings['thumbnail'] += time.perf_counter() - start
+    return timings
+
+def best_of(run, doc: fitz.Document, repeat: int) -> dict:
+    """Lowest time per case over several runs"""
+    best = None
+    for _ in range(repeat):
+        timings = run(doc)
+        best = timings if best is None else {k: min(best[k], v) for k, v in timings.items()}
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=8, help="pages in the synthetic PDF")
+    parser.add_argument("--segments", type=int, default=20000, help="stroked paths per page")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per variant, best is reported")
+    parser.add_argument("--pdf", help="benchmark an existing PDF instead of a synthetic one")
+    args = parser.parse_args()
+
+    tmp_dir = None
+    path = args.pdf
+    if not path:
+        tmp_dir = tempfile.mkdtemp(prefix="sprintreader-bench-")
+        path = os.path.join(tmp_dir, "vector.pdf")
+        print(f"Generating {args.pages} pages with {args.segments} paths each...")
+        generate_vector_pdf(path, args.pages, args.segments)
+
+    try:
+        doc = fitz.open(path)
+        print(f"{path}: {len(doc)} pages\n")
+
+        direct = best_of(run_direct, doc, args.repeat)
+        replay = best_of(run_display_list, doc, args.repeat)
+        doc.close()
+
+        print(f"{'case':<12} {'get_pixmap':>12} {'display list':>14} {'speedup':>9}")
+        for case in direct:
+            speedup = direct[case] / replay[case] if replay[case] else float('inf')
+            print(f"{case:<12} {direct[case] * 1000:>10.1f}ms {replay[case] * 1000:>12.1f}ms {speedup:>8.2f}x")
+    finally:
+        if tmp_dir:
+            os.remove(path)
+            os.rmdir(tmp_dir)
+
+if __name__ == "__main__":
+    main()
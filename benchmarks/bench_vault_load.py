@@ -0,0 +1,165 @@
+"""
+Vault load benchmark - cold-start parsing of a synthetic vault
+
+Compares the original line-splitting/eval loader against the strict frontmatter
+parser, serially and with the process pool.
+
+Usage:
+    python benchmarks/bench_vault_load.py --notes 50000 --workers 8
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from notes.frontmatter import dump_frontmatter
+from notes.vault_loader import list_note_files, load_note_files
+
+WORDS = ("attention memory reading focus sprint chapter proof lemma theorem margin "
+         "highlight vector cache index latency throughput render page topic").split()
+
+def generate_vault(base_path: Path, note_count: int, topic_count: int = 20, seed: int = 42):
+    """Write a synthetic vault in the format NoteManager._save_note produces"""
+    rng = random.Random(seed)
+    topic_dirs = []
+    for i in range(topic_count):
+        topic_dir = base_path / f"Topic_{i:02d}"
+        topic_dir.mkdir(parents=True)
+        topic_dirs.append((str(uuid.UUID(int=rng.getrandbits(128))), topic_dir))
+
+    for i in range(note_count):
+        topic_id, topic_dir = topic_dirs[i % topic_count]
+        metadata = {
+            'id': str(uuid.UUID(int=rng.getrandbits(128))),
+            'topic_id': topic_id,
+            'document_id': rng.randint(1, 500),
+            'page_number': rng.randint(1, 900),
+            'created_at': '2024-03-01T10:15:00.000000',
+            'updated_at': '2024-03-02T11:20:00.000000',
+        }
+        if i % 3 == 0:
+            metadata['tags'] = rng.sample(WORDS, 3)
+
+        excerpt = ' '.join(rng.choices(WORDS, k=rng.randint(10, 60)))
+        notes = '\n'.join(' '.join(rng.choices(WORDS, k=12)) for _ in range(rng.randint(0, 8)))
+
+        markdown = dump_frontmatter(metadata) + "\n"
+        markdown += f"# Note {i}\n\n"
+        markdown += f"## Excerpt\n\n> {excerpt}\n\n"
+        if notes:
+            markdown += f"## Notes\n\n{notes}\n"
+
+        (topic_dir / f"Note_{i}.md").write_text(markdown, encoding='utf-8')
+
+def legacy_load(base_path: Path) -> int:
+    """The loader as it was before the strict parser (glob + split + eval)"""
+    loaded = 0
+    for topic_dir in base_path.iterdir():
+        if not topic_dir.is_dir():
+            continue
+        for note_file in topic_dir.glob("*.md"):
+            if note_file.name.startswith('.'):
+                continue
+            try:
+                content = note_file.read_text(encoding='utf-8')
+                if _legacy_parse(content, note_file.stem):
+                    loaded += 1
+            except Exception:
+                pass
+    return loaded
+
+def _legacy_parse(content: str, filename: str):
+    lines = content.split('\n')
+    if lines[0] == '---':
+        frontmatter_end = 1
+        while frontmatter_end < len(lines) and lines[frontmatter_end] != '---':
+            frontmatter_end += 1
+
+        if frontmatter_end < len(lines):
+            frontmatter = {}
+            for line in lines[1:frontmatter_end]:
+                if ':' in line:
+                    key, value = line.split(':', 1)
+                    frontmatter[key.strip()] = value.strip()
+
+            title, excerpt, notes = _legacy_parse_content('\n'.join(lines[frontmatter_end + 1:]))
+            return dict(
+                id=frontmatter.get('id', str(uuid.uuid4())),
+                title=title or filename,
+                content=notes,
+                topic_id=frontmatter.get('topic_id', ''),
+                document_id=int(frontmatter.get('document_id', 0)),
+                page_number=int(frontmatter.get('page_number', 1)),
+                excerpt=excerpt,
+                created_at=frontmatter.get('created_at', ''),
+                updated_at=frontmatter.get('updated_at', ''),
+                tags=eval(frontmatter.get('tags', '[]')) if frontmatter.get('tags') else []
+            )
+    return None
+
+def _legacy_parse_content(content: str):
+    title = excerpt = notes = ""
+    current_section = None
+    for line in content.split('\n'):
+        line = line.strip()
+        if line.startswith('# '):
+            title = line[2:]
+        elif line == '## Excerpt':
+            current_section = 'excerpt'
+        elif line == '## Notes':
+            current_section = 'notes'
+        elif line.startswith('## '):
+            current_section = None
+        elif current_section == 'excerpt' and line.startswith('> '):
+            excerpt += line[2:] + ' '
+        elif current_section == 'notes' and line:
+            notes += line + '\n'
+    return title.strip(), excerpt.strip(), notes.strip()
+
+def strict_load(base_path: Path, workers: int) -> int:
+    """The current loader"""
+    return sum(
+        1 for _, fields, error in load_note_files(list_note_files(base_path), max_workers=workers)
+        if fields and not error
+    )
+
+def timed(label: str, func, *args):
+    start = time.perf_counter()
+    loaded = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.2f}s  {loaded:>7} notes  {loaded / elapsed:>9.0f} notes/s")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--notes', type=int, default=50000, help="number of synthetic notes")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="process pool size")
+    parser.add_argument('--vault', help="reuse or keep the synthetic vault at this path")
+    args = parser.parse_args()
+
+    base_path = Path(args.vault) if args.vault else Path(tempfile.mkdtemp(prefix="sprintreader-bench-"))
+    try:
+        if not base_path.exists() or not any(base_path.iterdir()):
+            start = time.perf_counter()
+            generate_vault(base_path, args.notes)
+            print(f"Generated {args.notes} notes in {time.perf_counter() - start:.1f}s at {base_path}")
+
+        legacy = timed("legacy (split + eval)", legacy_load, base_path)
+        serial = timed("strict, serial", strict_load, base_path, 1)
+        parallel = timed(f"strict, {args.workers} processes", strict_load, base_path, args.workers)
+
+        print(f"\nSpeedup vs legacy: serial {legacy / serial:.2f}x, parallel {legacy / parallel:.2f}x")
+    finally:
+        if not args.vault:
+            shutil.rmtree(base_path, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""
+Aggregates - Grouped counts, sums and averages computed by the database
+One GROUP BY query returns a row per group, so the cost of an aggregate does not
+depend on loading the rows behind it.
+"""
+
+from typing import Any, Dict, Iterable, Optional
+from sqlalchemy import func, select
+from sqlalchemy.sql import ColumnElement
+
+def count(column: Optional[ColumnElement] = None) -> ColumnElement:
+    """Rows in the group, or rows where column is not NULL"""
+    return func.count(column) if column is not None else func.count()
+
+def total(column: ColumnElement) -> ColumnElement:
+    """Sum over the group, 0 when every value is NULL"""
+    return func.coalesce(func.sum(column), 0)
+
+def average(column: ColumnElement) -> ColumnElement:
+    """Mean of the non-NULL values in the group"""
+    return func.avg(column)
+
+def grouped_aggregates(db_session, group_by: ColumnElement, measures: Dict[str, ColumnElement],
+                       filters: Iterable[ColumnElement] = ()) -> Dict[Any, Dict[str, Any]]:
+    """{group value: {measure name: value}} from one GROUP BY query"""
+    query = (
+        select(group_by.label('group_key'), *(measure.label(name) for name, measure in measures.items()))
+        .where(*filters)
+        .group_by(group_by)
+    )
+    return {
+        row.group_key: {name: getattr(row, name) for name in measures}
+        for row in db_session.execute(query)
+    }
+
+def combine_groups(groups: Dict[Any, Dict[str, Any]], names: Iterable[str]) -> Dict[str, float]:
+    """Add up count and total measures across groups"""
+    return {name: sum(group[name] or 0 for group in groups.values()) for name in names}
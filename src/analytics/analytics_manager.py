@@ -4,8 +4,16 @@ Analytics Manager - Reading insights and statistics
 
 from datetime import datetime, timedelta, date
 from typing import Dict, List, Tuple, Optional
-from database.models import db_manager, ReadingSession, Document
-from sqlalchemy import func, and_
+import numpy as np
+from sqlalchemy import func
+from database.models import db_manager, Document, ReadingSession
+from .aggregates import grouped_aggregates, count, total
+from .session_columns import session_columns
+from .streaks import get_streak_summary
+from .result_cache import cached_query, SESSION_DATA, DOCUMENT_DATA
+
+# Session length histogram edges in minutes
+SESSION_LENGTH_BINS = (0, 5, 10, 15, 25, 30, 45, 60, 90, 120, np.inf)
 
 class AnalyticsManager:
     """Manages reading analytics and insights"""
@@ -13,6 +21,7 @@ class AnalyticsManager:
     def __init__(self):
         self.session = db_manager.get_session()
     
+    @cached_query('daily_stats', SESSION_DATA)
     def get_daily_stats(self, target_date: date = None) -> Dict:
         """Get reading statistics for a specific day"""
         if target_date is None:
@@ -22,26 +31,22 @@ class AnalyticsManager:
         end_datetime = datetime.combine(target_date, datetime.max.time())
         
         try:
-            # Query sessions for the day
-            sessions = self.session.query(ReadingSession).filter(
-                and_(
-                    ReadingSession.start_time >= start_datetime,
-                    ReadingSession.start_time <= end_datetime
-                )
-            ).all()
+            # Sessions for the day
+            sessions = session_columns.table().reading().between(start_datetime, end_datetime)
             
-            total_time = sum(s.duration or 0 for s in sessions)
-            total_pages = sum(s.pages_read or 0 for s in sessions)
+            total_time = float(sessions.duration.sum())
+            total_pages = int(sessions.pages.sum())
             session_count = len(sessions)
             
             # Calculate reading speed
             avg_speed = (total_pages / total_time) if total_time > 0 else 0
             
             # Count different session types
-            session_types = {}
-            for session in sessions:
-                session_type = session.session_type or 'regular'
-                session_types[session_type] = session_types.get(session_type, 0) + 1
+            type_counts = np.bincount(sessions.session_type, minlength=len(session_columns.type_names))
+            session_types = {
+                session_columns.type_names[code]: int(count)
+                for code, count in enumerate(type_counts) if count
+            }
             
             return {
                 'date': target_date.isoformat(),
@@ -50,13 +55,14 @@ class AnalyticsManager:
                 'session_count': session_count,
                 'average_reading_speed': round(avg_speed, 2),
                 'session_types': session_types,
-                'longest_session': max([s.duration or 0 for s in sessions]) if sessions else 0
+                'longest_session': float(sessions.duration.max()) if session_count else 0
             }
             
         except Exception as e:
             print(f"❌ Error getting daily stats: {e}")
             return {}
     
+    @cached_query('weekly_stats', SESSION_DATA)
     def get_weekly_stats(self, week_start: date = None) -> Dict:
         """Get reading statistics for a week"""
         if week_start is None:
@@ -66,19 +72,10 @@ class AnalyticsManager:
         week_end = week_start + timedelta(days=6)
         
         # Get daily stats for each day of the week
-        daily_stats = []
-        total_time = 0
-        total_pages = 0
-        total_sessions = 0
-        
-        for i in range(7):
-            day = week_start + timedelta(days=i)
-            day_stats = self.get_daily_stats(day)
-            daily_stats.append(day_stats)
-            
-            total_time += day_stats.get('total_reading_time', 0)
-            total_pages += day_stats.get('total_pages_read', 0)
-            total_sessions += day_stats.get('session_count', 0)
+        daily_stats = [self.get_daily_stats(week_start + timedelta(days=i)) for i in range(7)]
+        total_time = sum(day_stats.get('total_reading_time', 0) for day_stats in daily_stats)
+        total_pages = sum(day_stats.get('total_pages_read', 0) for day_stats in daily_stats)
+        total_sessions = sum(day_stats.get('session_count', 0) for day_stats in daily_stats)
         
         # Calculate weekly averages
         avg_daily_time = total_time / 7
@@ -98,9 +95,10 @@ class AnalyticsManager:
             'average_daily_time': round(avg_daily_time, 1),
             'average_daily_pages': round(avg_daily_pages, 1),
             'most_productive_day': most_productive_day.get('date'),
-            'streak_days': self._calculate_reading_streak(week_start, week_end)
+            'streak_days': self.get_streak_stats().get('current_streak', 0)
         }
     
+    @cached_query('document_analytics', SESSION_DATA + DOCUMENT_DATA)
     def get_document_analytics(self, document_id: int) -> Dict:
         """Get analytics for a specific document"""
         try:
@@ -110,12 +108,11 @@ class AnalyticsManager:
                 return {}
             
             # Get all sessions for this document
-            sessions = self.session.query(ReadingSession).filter_by(
-                document_id=document_id
-            ).all()
+            reading = session_columns.table().reading()
+            sessions = reading.select(reading.document_id == document_id)
             
-            total_time = sum(s.duration or 0 for s in sessions)
-            total_pages = sum(s.pages_read or 0 for s in sessions)
+            total_time = float(sessions.duration.sum())
+            total_pages = int(sessions.pages.sum())
             
             # Calculate progress
             progress_percent = 0
@@ -145,41 +142,38 @@ class AnalyticsManager:
                 'average_session_length': round(avg_session_length, 1),
                 'reading_speed': document.reading_speed,
                 'estimated_completion_time': estimated_completion,
-                'first_session': sessions[0].start_time.isoformat() if sessions else None,
-                'last_session': sessions[-1].start_time.isoformat() if sessions else None
+                'first_session': str(sessions.start.min()) if session_count else None,
+                'last_session': str(sessions.start.max()) if session_count else None
             }
             
         except Exception as e:
             print(f"❌ Error getting document analytics: {e}")
             return {}
     
+    @cached_query('reading_trends', SESSION_DATA)
     def get_reading_trends(self, days: int = 30) -> Dict:
         """Get reading trends over specified number of days"""
         end_date = date.today()
         start_date = end_date - timedelta(days=days-1)
         
-        trends = []
-        total_time = 0
-        total_pages = 0
-        
-        # Get daily data for trend analysis
-        for i in range(days):
-            day = start_date + timedelta(days=i)
-            day_stats = self.get_daily_stats(day)
-            
-            trends.append({
-                'date': day.isoformat(),
-                'reading_time': day_stats.get('total_reading_time', 0),
-                'pages_read': day_stats.get('total_pages_read', 0),
-                'sessions': day_stats.get('session_count', 0)
-            })
-            
-            total_time += day_stats.get('total_reading_time', 0)
-            total_pages += day_stats.get('total_pages_read', 0)
+        # Get daily data for trend analysis in one pass
+        minutes, pages, sessions = session_columns.table().reading().daily_totals(start_date, days)
+        minutes = np.round(minutes, 1)
+        trends = [
+            {
+                'date': (start_date + timedelta(days=i)).isoformat(),
+                'reading_time': float(minutes[i]),
+                'pages_read': int(pages[i]),
+                'sessions': int(sessions[i])
+            }
+            for i in range(days)
+        ]
+        total_time = float(minutes.sum())
+        total_pages = int(pages.sum())
         
         # Calculate trend indicators
-        recent_avg = sum(t['reading_time'] for t in trends[-7:]) / 7  # Last 7 days
-        previous_avg = sum(t['reading_time'] for t in trends[-14:-7]) / 7  # Previous 7 days
+        recent_avg = float(minutes[-7:].sum()) / 7  # Last 7 days
+        previous_avg = float(minutes[-14:-7].sum()) / 7  # Previous 7 days
         
         trend_direction = "improving" if recent_avg > previous_avg else "declining"
         if abs(recent_avg - previous_avg) < 0.1:
@@ -205,44 +199,45 @@ class AnalyticsManager:
             'consistency_score': self._calculate_consistency_score(trends)
         }
     
+    @cached_query('timer_mode_effectiveness', SESSION_DATA)
     def get_timer_mode_effectiveness(self) -> Dict:
         """Analyze effectiveness of different timer modes"""
         try:
-            # Get sessions by timer mode
-            pomodoro_sessions = self.session.query(ReadingSession).filter_by(
-                session_type='pomodoro'
-            ).all()
-            
-            sprint_sessions = self.session.query(ReadingSession).filter_by(
-                session_type='sprint'
-            ).all()
-            
-            regular_sessions = self.session.query(ReadingSession).filter_by(
-                session_type='regular'
-            ).all()
+            # Totals for every session type in one grouped query; untyped sessions are regular
+            by_type = grouped_aggregates(
+                self.session,
+                func.coalesce(ReadingSession.session_type, 'regular'),
+                {
+                    'sessions': count(),
+                    'total_time': total(ReadingSession.duration),
+                    'total_pages': total(ReadingSession.pages_read)
+                }
+            )
             
-            def analyze_sessions(sessions, mode_name):
-                if not sessions:
+            def analyze_sessions(session_type, mode_name):
+                totals = by_type.get(session_type)
+                if not totals or not totals['sessions']:
                     return {'mode': mode_name, 'sessions': 0}
                 
-                total_time = sum(s.duration or 0 for s in sessions)
-                total_pages = sum(s.pages_read or 0 for s in sessions)
+                session_count = totals['sessions']
+                total_time = float(totals['total_time'])
+                total_pages = int(totals['total_pages'])
                 avg_speed = (total_pages / total_time) if total_time > 0 else 0
-                avg_duration = total_time / len(sessions)
+                avg_duration = total_time / session_count
                 
                 return {
                     'mode': mode_name,
-                    'sessions': len(sessions),
+                    'sessions': session_count,
                     'total_time': round(total_time, 1),
                     'total_pages': total_pages,
                     'average_speed': round(avg_speed, 2),
                     'average_duration': round(avg_duration, 1),
-                    'pages_per_session': round(total_pages / len(sessions), 1)
+                    'pages_per_session': round(total_pages / session_count, 1)
                 }
             
-            pomodoro_stats = analyze_sessions(pomodoro_sessions, 'Pomodoro')
-            sprint_stats = analyze_sessions(sprint_sessions, 'Sprint')
-            regular_stats = analyze_sessions(regular_sessions, 'Regular')
+            pomodoro_stats = analyze_sessions('pomodoro', 'Pomodoro')
+            sprint_stats = analyze_sessions('sprint', 'Sprint')
+            regular_stats = analyze_sessions('regular', 'Regular')
             
             # Determine most effective mode
             modes = [pomodoro_stats, sprint_stats, regular_stats]
@@ -260,20 +255,49 @@ class AnalyticsManager:
             print(f"❌ Error analyzing timer modes: {e}")
             return {}
     
-    def _calculate_reading_streak(self, start_date: date, end_date: date) -> int:
-        """Calculate current reading streak in days"""
-        current_date = end_date
-        streak = 0
-        
-        while current_date >= start_date:
-            day_stats = self.get_daily_stats(current_date)
-            if day_stats.get('session_count', 0) > 0:
-                streak += 1
-                current_date -= timedelta(days=1)
-            else:
-                break
-        
-        return streak
+    @cached_query('session_length_distribution', SESSION_DATA)
+    def get_session_length_distribution(self, days: Optional[int] = None) -> Dict:
+        """How many reading sessions fall into each length bucket"""
+        try:
+            sessions = session_columns.table().reading()
+            if days:
+                start = datetime.combine(date.today() - timedelta(days=days - 1), datetime.min.time())
+                sessions = sessions.between(start, datetime.now())
+            
+            counts, edges = np.histogram(sessions.duration, bins=SESSION_LENGTH_BINS)
+            hours = np.bincount(sessions.hours(), minlength=24)
+            
+            return {
+                'session_count': len(sessions),
+                'length_buckets': [
+                    {
+                        'min_minutes': float(low),
+                        'max_minutes': float(high) if np.isfinite(high) else None,
+                        'sessions': int(count)
+                    }
+                    for low, high, count in zip(edges[:-1], edges[1:], counts)
+                ],
+                'median_length': round(float(np.median(sessions.duration)), 1) if len(sessions) else 0,
+                'sessions_by_hour': hours.astype(int).tolist()
+            }
+            
+        except Exception as e:
+            print(f"❌ Error getting session distribution: {e}")
+            return {}
+    
+    @cached_query('streak_stats', SESSION_DATA)
+    def get_streak_stats(self) -> Dict:
+        """Current and longest reading streak from the persisted streak days"""
+        # Fresh session: streak days are written by whoever commits a reading session
+        session = db_manager.get_session()
+        try:
+            return get_streak_summary(session)
+        except Exception as e:
+            print(f"❌ Error getting streak stats: {e}")
+            session.rollback()
+            return {}
+        finally:
+            session.close()
     
     def _calculate_consistency_score(self, trends: List[Dict]) -> float:
         """Calculate reading consistency score (0-100)"""
@@ -281,19 +305,16 @@ class AnalyticsManager:
             return 0.0
         
         # Calculate standard deviation of reading times
-        times = [t['reading_time'] for t in trends]
-        mean_time = sum(times) / len(times)
+        times = np.array([t['reading_time'] for t in trends], dtype=np.float64)
+        mean_time = times.mean()
         
         if mean_time == 0:
             return 0.0
         
-        variance = sum((t - mean_time) ** 2 for t in times) / len(times)
-        std_dev = variance ** 0.5
-        
         # Consistency score: lower std deviation = higher consistency
         # Normalize to 0-100 scale
-        consistency = max(0, 100 - (std_dev / mean_time * 100))
-        return round(consistency, 1)
+        consistency = max(0, 100 - (times.std() / mean_time * 100))
+        return round(float(consistency), 1)
     
     def _get_mode_recommendation(self, modes: List[Dict]) -> str:
         """Generate recommendation based on timer mode analysis"""
@@ -301,9 +322,13 @@ class AnalyticsManager:
         sprint = next(m for m in modes if m['mode'] == 'Sprint')
         regular = next(m for m in modes if m['mode'] == 'Regular')
         
-        if pomodoro['average_speed'] > sprint['average_speed'] and pomodoro['average_speed'] > regular['average_speed']:
+        pomodoro_speed = pomodoro.get('average_speed', 0)
+        sprint_speed = sprint.get('average_speed', 0)
+        regular_speed = regular.get('average_speed', 0)
+        
+        if pomodoro_speed > sprint_speed and pomodoro_speed > regular_speed:
             return "Try more Pomodoro sessions for better focus and speed"
-        elif sprint['average_speed'] > regular['average_speed']:
+        elif sprint_speed > regular_speed:
             return "Sprint sessions work well for you - consider more quick reading bursts"
         else:
             return "Regular reading sessions suit your style - maintain your current approach"
@@ -0,0 +1,168 @@
+"""
+Heatmap - Reading minutes, pages and productivity by weekday and hour of day
+Built with one grouped query per session table, then kept current from commit
+events. Start times are stored in local time, so cells are local weekdays and hours.
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+import numpy as np
+from sqlalchemy import Integer, cast, extract, func
+from sqlalchemy.sql import ColumnElement
+from database.models import db_manager, ReadingSession, FocusSession
+from events.event_bus import event_bus, SESSION_COMMITTED, FOCUS_SESSION_COMMITTED
+from .aggregates import grouped_aggregates, count, total
+
+WEEKDAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+HOURS = 24
+MIN_SLOT_MINUTES = 30.0  # Reading behind a cell before it can be called a best time
+
+def weekday_of(column: ColumnElement, dialect: str) -> ColumnElement:
+    """Day of week of a timestamp column, Monday = 0, for the given SQL dialect"""
+    if dialect == 'sqlite':
+        return (cast(func.strftime('%w', column), Integer) + 6) % 7
+    if dialect == 'postgresql':
+        return cast(extract('isodow', column), Integer) - 1
+    if dialect in ('mysql', 'mariadb'):
+        return func.weekday(column)
+    return (cast(extract('dow', column), Integer) + 6) % 7
+
+def hour_of(column: ColumnElement, dialect: str) -> ColumnElement:
+    """Hour of day of a timestamp column, for the given SQL dialect"""
+    if dialect == 'sqlite':
+        return cast(func.strftime('%H', column), Integer)
+    return cast(extract('hour', column), Integer)
+
+class HeatmapData(NamedTuple):
+    """7x24 arrays indexed [weekday, hour]"""
+    minutes: np.ndarray
+    pages: np.ndarray
+    sessions: np.ndarray
+    productivity: np.ndarray  # Mean focus productivity score, NaN where none was recorded
+    version: int
+
+    def pages_per_minute(self) -> np.ndarray:
+        rate = np.zeros_like(self.minutes)
+        np.divide(self.pages, self.minutes, out=rate, where=self.minutes > 0)
+        return rate
+
+    def best_slots(self, metric: str = 'minutes', limit: int = 3) -> List[Dict]:
+        """Highest cells by 'minutes', 'pages_per_minute' or 'productivity'"""
+        if metric == 'productivity':
+            values = np.where(np.isnan(self.productivity), -np.inf, self.productivity)
+        elif metric == 'pages_per_minute':
+            values = np.where(self.minutes >= MIN_SLOT_MINUTES, self.pages_per_minute(), -np.inf)
+        else:
+            values = self.minutes
+        order = np.argsort(values, axis=None)[::-1][:limit]
+        slots = []
+        for weekday, hour in zip(*np.unravel_index(order, values.shape)):
+            if not np.isfinite(values[weekday, hour]) or values[weekday, hour] <= 0:
+                break
+            slots.append({
+                'weekday': WEEKDAYS[weekday],
+                'hour': int(hour),
+                'label': f"{WEEKDAYS[weekday]} {hour:02d}:00",
+                'value': round(float(values[weekday, hour]), 2)
+            })
+        return slots
+
+    def by_weekday(self) -> np.ndarray:
+        return self.minutes.sum(axis=1)
+
+    def by_hour(self) -> np.ndarray:
+        return self.minutes.sum(axis=0)
+
+class ProductivityHeatmap:
+    """Weekday x hour totals, loaded once and updated per committed session"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.version = 0
+        self.minutes = np.zeros((7, HOURS))
+        self.pages = np.zeros((7, HOURS))
+        self.sessions = np.zeros((7, HOURS), dtype=np.int64)
+        self.score_total = np.zeros((7, HOURS))
+        self.score_count = np.zeros((7, HOURS), dtype=np.int64)
+
+    def snapshot(self) -> HeatmapData:
+        """Current totals; builds them from the database on first use"""
+        with self.lock:
+            if not self.loaded:
+                self._load()
+            productivity = np.full((7, HOURS), np.nan)
+            np.divide(self.score_total, self.score_count, out=productivity, where=self.score_count > 0)
+            return HeatmapData(self.minutes.copy(), self.pages.copy(), self.sessions.copy(),
+                               productivity, self.version)
+
+    def invalidate(self):
+        """Rebuild from the database on next use"""
+        with self.lock:
+            self.loaded = False
+
+    def _add(self, start_time: Optional[datetime], minutes=None, pages=None, score=None, reading=True):
+        if start_time is None:
+            return
+        with self.lock:
+            if not self.loaded:
+                return  # The first snapshot will read it from the database
+            cell = (start_time.weekday(), start_time.hour)
+            if reading:
+                self.minutes[cell] += minutes or 0.0
+                self.pages[cell] += pages or 0
+                self.sessions[cell] += 1
+            if score:
+                self.score_total[cell] += score
+                self.score_count[cell] += 1
+            self.version += 1
+
+    def _on_session_committed(self, start_time=None, duration=None, pages_read=None, **_):
+        self._add(start_time, duration, pages_read)
+
+    def _on_focus_session_committed(self, start_time=None, productivity_score=None, **_):
+        self._add(start_time, score=productivity_score, reading=False)
+
+    def _load(self):
+        dialect = db_manager.engine.dialect.name
+        session = db_manager.get_session()
+        try:
+            reading = grouped_aggregates(
+                session,
+                weekday_of(ReadingSession.start_time, dialect) * HOURS + hour_of(ReadingSession.start_time, dialect),
+                {
+                    'sessions': count(),
+                    'minutes': total(ReadingSession.duration),
+                    'pages': total(ReadingSession.pages_read)
+                }
+            )
+            scored = func.nullif(FocusSession.productivity_score, 0)
+            focus = grouped_aggregates(
+                session,
+                weekday_of(FocusSession.start_time, dialect) * HOURS + hour_of(FocusSession.start_time, dialect),
+                {'scored': count(scored), 'score_total': total(scored)}
+            )
+        finally:
+            session.close()
+
+        for grid in (self.minutes, self.pages, self.sessions, self.score_total, self.score_count):
+            grid.fill(0)
+        for cell, row in reading.items():
+            if cell is not None:
+                weekday, hour = divmod(int(cell), HOURS)
+                self.minutes[weekday, hour] = row['minutes']
+                self.pages[weekday, hour] = row['pages']
+                self.sessions[weekday, hour] = row['sessions']
+        for cell, row in focus.items():
+            if cell is not None:
+                weekday, hour = divmod(int(cell), HOURS)
+                self.score_total[weekday, hour] = row['score_total']
+                self.score_count[weekday, hour] = row['scored']
+        self.loaded = True
+        self.version += 1
+
+# Shared by the dashboard, recommendations and the heatmap widget
+productivity_heatmap = ProductivityHeatmap()
+event_bus.subscribe(SESSION_COMMITTED, productivity_heatmap._on_session_committed)
+event_bus.subscribe(FOCUS_SESSION_COMMITTED, productivity_heatmap._on_focus_session_committed)
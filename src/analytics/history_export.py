@@ -0,0 +1,326 @@
+"""
+History Export - Streams reading history to CSV, JSONL or Parquet files
+Rows are read with server-side cursors in chunks and written as they arrive, so
+memory stays flat however long the history is. Each table remembers the last row
+exported, so a "since last export" run only writes rows added or changed since.
+"""
+
+import csv
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from sqlalchemy import Boolean, DateTime, Float, Integer, JSON, and_, or_, select
+from sqlalchemy.sql import ColumnElement
+from qt_compat import QThread, pyqtSignal
+from database.models import (
+    db_manager, ReadingSession, FocusSession, Goal, PageDwell, StatsAccumulator
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = pq = None
+
+EXPORT_SCOPE = 'history_export'
+CHUNK_ROWS = 2000
+
+ProgressCallback = Callable[[str, int], None]  # table name, rows written so far
+
+class ExportTable(NamedTuple):
+    """A table to export and how to find its new rows"""
+    name: str
+    columns: Tuple[ColumnElement, ...]  # The table's id column first
+    changed_at: Optional[ColumnElement] = None  # Rows can change later; otherwise rows are only added
+
+EXPORT_TABLES = (
+    ExportTable('reading_sessions', tuple(ReadingSession.__table__.columns)),
+    ExportTable('focus_sessions', tuple(FocusSession.__table__.columns)),
+    ExportTable('goals', tuple(Goal.__table__.columns), Goal.__table__.c.updated_at),
+    ExportTable('page_events', tuple(PageDwell.__table__.columns)),
+)
+
+# Notes live in the markdown vault; metadata only, the note text stays there
+NOTES_EXPORT = 'notes'
+NOTE_FIELDS = (
+    ('id', 'string'), ('topic_id', 'string'), ('topic', 'string'), ('document_id', 'int'),
+    ('page_number', 'int'), ('tags', 'json'), ('content_length', 'int'), ('excerpt_length', 'int'),
+    ('highlight_boxes', 'int'), ('created_at', 'datetime'), ('updated_at', 'datetime'),
+)
+
+Field = Tuple[str, str]  # name, kind: 'bool', 'int', 'float', 'datetime', 'json' or 'string'
+PendingNote = Tuple[Tuple[str, str], Any]  # (raw updated_at, id) key and the note
+
+def available_formats() -> List[str]:
+    """Formats that can be written with the installed packages"""
+    return ['csv', 'jsonl'] + (['parquet'] if pa is not None else [])
+
+def table_fields(table: ExportTable) -> List[Field]:
+    """Name and value kind of each exported column"""
+    fields = []
+    for column in table.columns:
+        if isinstance(column.type, Boolean):
+            kind = 'bool'
+        elif isinstance(column.type, Integer):
+            kind = 'int'
+        elif isinstance(column.type, Float):
+            kind = 'float'
+        elif isinstance(column.type, DateTime):
+            kind = 'datetime'
+        elif isinstance(column.type, JSON):
+            kind = 'json'
+        else:
+            kind = 'string'
+        fields.append((column.name, kind))
+    return fields
+
+def stream_rows(db_session, table: ExportTable, mark: Optional[Dict] = None,
+                chunk_rows: int = CHUNK_ROWS) -> Iterator[Sequence]:
+    """Chunks of rows after mark, in key order, from a server-side cursor"""
+    row_id = table.columns[0]
+    query = select(*table.columns)
+    if table.changed_at is not None:
+        query = query.order_by(table.changed_at, row_id)
+        if mark and mark.get('changed_at'):
+            changed_at = datetime.fromisoformat(mark['changed_at'])
+            query = query.where(or_(
+                table.changed_at > changed_at,
+                and_(table.changed_at == changed_at, row_id > mark.get('id', 0))
+            ))
+    else:
+        query = query.order_by(row_id)
+        if mark and mark.get('id'):
+            query = query.where(row_id > mark['id'])
+
+    result = db_session.execute(query.execution_options(stream_results=True, yield_per=chunk_rows))
+    yield from result.partitions()
+
+def _parse_time(value: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+def pending_notes(note_manager, mark: Optional[Dict] = None) -> List[PendingNote]:
+    """Notes after mark with their raw (updated_at, id) keys, in key order"""
+    keyed = sorted(
+        ((note.updated_at or '', note.id), note) for note in list(note_manager.notes.values())
+    )
+    if mark and mark.get('changed_at') is not None:
+        after = (mark['changed_at'], str(mark.get('id', '')))
+        keyed = [(key, note) for key, note in keyed if key > after]
+    return keyed
+
+def note_rows(note_manager, pending: List[PendingNote], chunk_rows: int = CHUNK_ROWS) -> Iterator[List[Tuple]]:
+    """Chunks of metadata rows of pending notes"""
+    topics = {topic_id: topic.name for topic_id, topic in list(note_manager.topics.items())}
+    for start in range(0, len(pending), chunk_rows):
+        yield [
+            (
+                note.id, note.topic_id, topics.get(note.topic_id), note.document_id, note.page_number,
+                list(note.tags or []), len(note.content or ''), len(note.excerpt or ''), len(note.quads or []),
+                _parse_time(note.created_at), _parse_time(note.updated_at)
+            )
+            for _, note in pending[start:start + chunk_rows]
+        ]
+
+class _CsvWriter:
+    def __init__(self, f, fields: Sequence[Field]):
+        self.json_columns = [i for i, (_, kind) in enumerate(fields) if kind == 'json']
+        self.writer = csv.writer(f)
+        self.writer.writerow([name for name, _ in fields])
+
+    def write(self, rows: Sequence):
+        for row in rows:
+            values = [value.isoformat() if isinstance(value, datetime) else value for value in row]
+            for i in self.json_columns:
+                if values[i] is not None:
+                    values[i] = json.dumps(values[i])
+            self.writer.writerow(values)
+
+    def close(self):
+        pass
+
+class _JsonlWriter:
+    def __init__(self, f, fields: Sequence[Field]):
+        self.f = f
+        self.names = [name for name, _ in fields]
+
+    def write(self, rows: Sequence):
+        self.f.writelines(
+            json.dumps({
+                name: value.isoformat() if isinstance(value, datetime) else value
+                for name, value in zip(self.names, row)
+            }, ensure_ascii=False) + '\n'
+            for row in rows
+        )
+
+    def close(self):
+        pass
+
+class _ParquetWriter:
+    def __init__(self, path: str, fields: Sequence[Field]):
+        self.json_columns = {i for i, (_, kind) in enumerate(fields) if kind == 'json'}
+        self.schema = pa.schema([(name, self._arrow_type(kind)) for name, kind in fields])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, rows: Sequence):
+        columns = [list(values) for values in zip(*rows)]
+        for i in self.json_columns:
+            columns[i] = [json.dumps(value) if value is not None else None for value in columns[i]]
+        self.writer.write_batch(pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, self.schema)],
+            schema=self.schema
+        ))
+
+    def close(self):
+        self.writer.close()
+
+    @staticmethod
+    def _arrow_type(kind: str):
+        return {
+            'bool': pa.bool_(),
+            'int': pa.int64(),
+            'float': pa.float64(),
+            'datetime': pa.timestamp('us'),
+        }.get(kind, pa.string())
+
+class HistoryExporter:
+    """Writes one file per table into an export folder"""
+
+    def __init__(self, note_manager=None, tables: Sequence[ExportTable] = EXPORT_TABLES,
+                 chunk_rows: int = CHUNK_ROWS):
+        self.note_manager = note_manager  # Notes are skipped without one
+        self.tables = tables
+        self.chunk_rows = chunk_rows
+
+    def export(self, directory: str, fmt: str = 'csv', since_last_export: bool = False,
+               progress: Optional[ProgressCallback] = None) -> Dict[str, int]:
+        """Export every table; returns rows written per table"""
+        if fmt not in available_formats():
+            raise ValueError(f"Unsupported export format: {fmt} (available: {', '.join(available_formats())})")
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        # Incremental exports go next to earlier ones instead of replacing them
+        suffix = f".{datetime.now().strftime('%Y%m%d-%H%M%S')}" if since_last_export else ''
+
+        session = db_manager.get_session()
+        try:
+            state = session.query(StatsAccumulator).filter_by(scope=EXPORT_SCOPE).first()
+            marks = dict(state.data or {}) if state is not None else {}
+
+            counts = {}
+            for table in self.tables:
+                mark = marks.get(table.name) if since_last_export else None
+                fields = table_fields(table)
+                counts[table.name], last_row = self._write_rows(
+                    directory / f"{table.name}{suffix}.{fmt}", fmt, table.name, fields,
+                    stream_rows(session, table, mark, self.chunk_rows), not since_last_export, progress
+                )
+                if last_row is not None:
+                    names = [name for name, _ in fields]
+                    changed_at = last_row[names.index(table.changed_at.name)] if table.changed_at is not None else None
+                    marks[table.name] = {
+                        'id': last_row[names.index('id')],
+                        'changed_at': changed_at.isoformat() if changed_at else None
+                    }
+
+            if self.note_manager is not None:
+                pending = pending_notes(self.note_manager, marks.get(NOTES_EXPORT) if since_last_export else None)
+                counts[NOTES_EXPORT], _ = self._write_rows(
+                    directory / f"{NOTES_EXPORT}{suffix}.{fmt}", fmt, NOTES_EXPORT, NOTE_FIELDS,
+                    note_rows(self.note_manager, pending, self.chunk_rows), not since_last_export, progress
+                )
+                if pending:
+                    # The raw vault string, as pending_notes compares it; parsing could lose or change it
+                    changed_at, note_id = pending[-1][0]
+                    marks[NOTES_EXPORT] = {'id': note_id, 'changed_at': changed_at}
+
+            # Marks move only once every file is in place
+            if state is None:
+                state = StatsAccumulator(scope=EXPORT_SCOPE, data={})
+                session.add(state)
+            state.data = marks
+            session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+        print(f"📊 Exported {sum(counts.values())} history rows to {directory}")
+        return counts
+
+    def last_export_marks(self) -> Dict[str, Dict]:
+        """Last row exported per table"""
+        session = db_manager.get_session()
+        try:
+            state = session.query(StatsAccumulator).filter_by(scope=EXPORT_SCOPE).first()
+            return dict(state.data or {}) if state is not None else {}
+        finally:
+            session.close()
+
+    def _write_rows(self, path: Path, fmt: str, name: str, fields: Sequence[Field], chunks: Iterator[Sequence],
+                    write_empty: bool, progress: Optional[ProgressCallback]) -> Tuple[int, Optional[Sequence]]:
+        """Stream row chunks into a temp file, then move it into place; returns rows and the last row"""
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+        written = 0
+        last_row = None
+        try:
+            if fmt == 'parquet':
+                os.close(fd)
+                writer = _ParquetWriter(tmp_path, fields)
+                f = None
+            else:
+                f = os.fdopen(fd, 'w', encoding='utf-8', newline='')
+                writer = _CsvWriter(f, fields) if fmt == 'csv' else _JsonlWriter(f, fields)
+
+            try:
+                for rows in chunks:
+                    writer.write(rows)
+                    written += len(rows)
+                    last_row = rows[-1]
+                    if progress:
+                        progress(name, written)
+            finally:
+                writer.close()
+                if f is not None:
+                    f.close()
+
+            if written or write_empty:
+                os.replace(tmp_path, path)
+            else:
+                os.unlink(tmp_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        return written, last_row
+
+class HistoryExportWorker(QThread):
+    """Exports reading history on a worker thread with progress signals"""
+
+    progress = pyqtSignal(str, int)  # table name, rows written
+    export_finished = pyqtSignal(int, str)  # rows_written, export_path
+    export_failed = pyqtSignal(str)  # error message
+
+    def __init__(self, export_path: str, fmt: str = 'csv', since_last_export: bool = False,
+                 note_manager=None, parent=None):
+        super().__init__(parent)
+        self.exporter = HistoryExporter(note_manager)
+        self.export_path = export_path
+        self.fmt = fmt
+        self.since_last_export = since_last_export
+
+    def run(self):
+        try:
+            counts = self.exporter.export(self.export_path, self.fmt, self.since_last_export, self.progress.emit)
+            self.export_finished.emit(sum(counts.values()), self.export_path)
+        except Exception as e:
+            self.export_failed.emit(str(e))
@@ -0,0 +1,190 @@
+"""
+Result Cache - One copy of each analytics result for the whole process
+Results are keyed by (query, parameters), expire after a TTL, and are dropped as soon
+as an event they depend on is published. Concurrent callers of a key that is being
+computed wait for that computation instead of repeating it (single-flight).
+"""
+
+import functools
+import hashlib
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+import numpy as np
+from events.event_bus import (
+    event_bus, SESSION_COMMITTED, FOCUS_SESSION_COMMITTED, PROGRESS_SAVED, DOCUMENT_OPENED,
+    GOAL_PROGRESS, GOAL_COMPLETED
+)
+
+DEFAULT_TTL = 300.0  # Seconds; also bounds staleness of "today" results across midnight
+
+# What analytics results depend on
+SESSION_DATA = (SESSION_COMMITTED, FOCUS_SESSION_COMMITTED)
+DOCUMENT_DATA = (PROGRESS_SAVED, DOCUMENT_OPENED)
+GOAL_DATA = (GOAL_PROGRESS, GOAL_COMPLETED)
+
+def freeze(value: Any) -> Hashable:
+    """A hashable stand-in for a parameter value"""
+    if isinstance(value, np.ndarray):
+        return ('ndarray', value.shape, str(value.dtype), hashlib.sha1(value.tobytes()).hexdigest())
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        frozen = tuple(freeze(item) for item in value)
+        return tuple(sorted(frozen, key=repr)) if isinstance(value, (set, frozenset)) else frozen
+    return value
+
+class _Entry:
+    __slots__ = ('value', 'expires')
+
+    def __init__(self, value: Any, expires: float):
+        self.value = value
+        self.expires = expires
+
+class _Flight:
+    """A computation in progress that other callers can wait on"""
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+class AnalyticsCache:
+    """TTL cache with dependency invalidation, single-flight and hit statistics"""
+
+    def __init__(self, default_ttl: float = DEFAULT_TTL):
+        self.default_ttl = default_ttl
+        self.lock = threading.Lock()
+        self.entries: Dict[Tuple, _Entry] = {}
+        self.in_flight: Dict[Tuple, _Flight] = {}
+        self.dependents: Dict[str, Set[Tuple]] = defaultdict(set)  # dependency -> keys
+        self.generations: Counter = Counter()  # Bumped per dependency on invalidation
+        self.counters: Counter = Counter()
+        self.computations: Counter = Counter()  # Per query name
+        self.compute_seconds: Counter = Counter()
+
+    def get_or_compute(self, query: str, params: Hashable, compute: Callable[[], Any],
+                       depends: Iterable[str] = (), ttl: Optional[float] = None,
+                       keep: Optional[Callable[[Any], bool]] = None) -> Any:
+        """Cached result of compute(); results are shared, treat them as read-only
+
+        A result for which keep() is false is returned but not stored.
+        """
+        key = (query, params)
+        depends = tuple(depends)
+        now = time.monotonic()
+
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                if entry.expires > now:
+                    self.counters['hits'] += 1
+                    return entry.value
+                del self.entries[key]
+                self.counters['expired'] += 1
+
+            flight = self.in_flight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self.in_flight[key] = _Flight()
+                self.counters['misses'] += 1
+                generations = tuple(self.generations[name] for name in depends)
+            else:
+                self.counters['shared'] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        started = time.perf_counter()
+        try:
+            flight.value = compute()
+            return flight.value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self.lock:
+                self.computations[query] += 1
+                self.compute_seconds[query] += time.perf_counter() - started
+                del self.in_flight[key]
+                # Skip storing a result that an invalidation overtook while it was computed
+                current = tuple(self.generations[name] for name in depends)
+                stored = flight.error is None and (keep is None or keep(flight.value))
+                if stored and current == generations:
+                    self.entries[key] = _Entry(flight.value, now + (self.default_ttl if ttl is None else ttl))
+                    for name in depends:
+                        self.dependents[name].add(key)
+            flight.done.set()
+
+    def invalidate(self, dependency: str):
+        """Drop every result that depends on dependency"""
+        with self.lock:
+            self.generations[dependency] += 1
+            dropped = 0
+            for key in self.dependents.pop(dependency, ()):
+                if self.entries.pop(key, None) is not None:
+                    dropped += 1
+            self.counters['invalidated'] += dropped
+
+    def clear(self):
+        """Drop every result"""
+        with self.lock:
+            for name in list(self.dependents) + list(self.generations):
+                self.generations[name] += 1
+            self.entries.clear()
+            self.dependents.clear()
+
+    def stats(self) -> Dict:
+        """Hit, miss and computation counts since start"""
+        with self.lock:
+            hits = self.counters['hits'] + self.counters['shared']
+            lookups = hits + self.counters['misses']
+            return {
+                'entries': len(self.entries),
+                'hits': self.counters['hits'],
+                'shared_in_flight': self.counters['shared'],
+                'misses': self.counters['misses'],
+                'expired': self.counters['expired'],
+                'invalidated': self.counters['invalidated'],
+                'hit_rate': round(hits / lookups * 100, 1) if lookups else 0.0,
+                'computations': dict(self.computations),
+                'compute_ms': {query: round(seconds * 1000, 1) for query, seconds in self.compute_seconds.items()}
+            }
+
+    def _on_event(self, topic: str):
+        def handler(**_):
+            self.invalidate(topic)
+        return handler
+
+def _not_empty(value: Any) -> bool:
+    """False for None and empty dicts, lists and tuples"""
+    return value is not None and not (isinstance(value, (dict, list, tuple)) and not value)
+
+def cached_query(query: str, depends: Iterable[str], ttl: Optional[float] = None):
+    """Cache a method's result in analytics_cache, keyed by its arguments but not by self
+
+    Empty results are not stored: the decorated methods return {} or [] when their
+    query fails, and one transient database error must not be served until the TTL.
+    """
+    depends = tuple(depends)
+
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            params = (freeze(args), freeze(kwargs))
+            return analytics_cache.get_or_compute(
+                query, params, lambda: method(self, *args, **kwargs), depends, ttl, keep=_not_empty
+            )
+        wrapper.uncached = method
+        return wrapper
+    return decorator
+
+# Shared by every analytics consumer in the process
+analytics_cache = AnalyticsCache()
+for _topic in SESSION_DATA + DOCUMENT_DATA + GOAL_DATA:
+    event_bus.subscribe(_topic, analytics_cache._on_event(_topic))
@@ -0,0 +1,213 @@
+"""
+Session Columns - Reading and focus session history as NumPy columns
+Loaded once with a Core query, appended to as sessions commit, and aggregated with
+vectorised operations instead of attribute access on ORM objects
+"""
+
+import threading
+from datetime import date, datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+from sqlalchemy import select
+from database.models import db_manager, ReadingSession, FocusSession
+from events.event_bus import event_bus, SESSION_COMMITTED, FOCUS_SESSION_COMMITTED
+
+READING = 0
+FOCUS = 1
+SESSION_TYPES = ('regular', 'pomodoro', 'sprint', 'focus')  # Codes are positions; new types are appended
+INITIAL_CAPACITY = 1024
+
+COLUMNS = (
+    ('start', 'datetime64[s]'),    # Local start time
+    ('duration', np.float64),      # Minutes, 0 when unknown
+    ('pages', np.int64),
+    ('document_id', np.int64),     # -1 when none
+    ('session_type', np.int16),    # Index into SessionColumns.type_names
+    ('focus', np.bool_),           # Focus mode was on
+    ('source', np.int8),           # READING or FOCUS
+    ('productivity', np.float64),  # Focus sessions only, NaN otherwise
+    ('interruptions', np.int64),   # Focus sessions only, 0 otherwise
+)
+
+class SessionTable(NamedTuple):
+    """A consistent set of column views, one row per session"""
+    start: np.ndarray
+    duration: np.ndarray
+    pages: np.ndarray
+    document_id: np.ndarray
+    session_type: np.ndarray
+    focus: np.ndarray
+    source: np.ndarray
+    productivity: np.ndarray
+    interruptions: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def select(self, mask: np.ndarray) -> 'SessionTable':
+        """Rows where mask is true (or at the given indices)"""
+        return SessionTable(*(column[mask] for column in self))
+
+    def reading(self) -> 'SessionTable':
+        return self.select(self.source == READING)
+
+    def focus_sessions(self) -> 'SessionTable':
+        return self.select(self.source == FOCUS)
+
+    def between(self, start: datetime, end: datetime) -> 'SessionTable':
+        """Sessions starting in [start, end]"""
+        starts = self.start
+        return self.select((starts >= np.datetime64(start, 's')) & (starts <= np.datetime64(end, 's')))
+
+    def day_index(self, first_day: date) -> np.ndarray:
+        """Days since first_day of each session's local start"""
+        return (self.start.astype('datetime64[D]') - np.datetime64(first_day, 'D')).astype(np.int64)
+
+    def daily_totals(self, first_day: date, days: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(minutes, pages, sessions) for each of days consecutive days"""
+        index = self.day_index(first_day)
+        keep = (index >= 0) & (index < days)
+        index = index[keep]
+        minutes = np.bincount(index, weights=self.duration[keep], minlength=days)
+        pages = np.bincount(index, weights=self.pages[keep], minlength=days).astype(np.int64)
+        sessions = np.bincount(index, minlength=days)
+        return minutes, pages, sessions
+
+    def hours(self) -> np.ndarray:
+        """Local hour of day each session started"""
+        return (self.start.astype('datetime64[h]') - self.start.astype('datetime64[D]')).astype(np.int64)
+
+class SessionColumns:
+    """Growable columnar copy of session history, shared by all analytics"""
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        self.lock = threading.RLock()
+        self.loaded = False
+        self.size = 0
+        self.columns = {name: np.empty(capacity, dtype) for name, dtype in COLUMNS}
+        self.type_names: List[str] = list(SESSION_TYPES)
+        self.type_codes: Dict[str, int] = {name: code for code, name in enumerate(SESSION_TYPES)}
+        self.last_ids = {READING: 0, FOCUS: 0}  # Highest row id already held, per source
+
+    def table(self) -> SessionTable:
+        """Current history; loads it from the database on first use"""
+        with self.lock:
+            if not self.loaded:
+                self._load()
+            return SessionTable(*(self.columns[name][:self.size] for name, _ in COLUMNS))
+
+    def type_code(self, session_type: Optional[str]) -> int:
+        """Column code of a session type; sessions without one count as regular"""
+        with self.lock:
+            name = session_type or 'regular'
+            code = self.type_codes.get(name)
+            if code is None:
+                code = self.type_codes[name] = len(self.type_names)
+                self.type_names.append(name)
+            return code
+
+    def append(self, source: int, row_id: int, start_time: datetime, duration: Optional[float],
+               pages: Optional[int], document_id: Optional[int], session_type: Optional[str],
+               focus: bool = False, productivity: Optional[float] = None, interruptions: Optional[int] = None):
+        """Add a committed session; ignored until loaded, or when the load already saw it"""
+        with self.lock:
+            if not self.loaded or row_id is None or row_id <= self.last_ids[source]:
+                return
+            self._reserve(self.size + 1)
+            row = self.size
+            self.columns['start'][row] = np.datetime64(start_time, 's')
+            self.columns['duration'][row] = duration or 0.0
+            self.columns['pages'][row] = pages or 0
+            self.columns['document_id'][row] = document_id if document_id is not None else -1
+            self.columns['session_type'][row] = self.type_code(session_type)
+            self.columns['focus'][row] = bool(focus)
+            self.columns['source'][row] = source
+            self.columns['productivity'][row] = productivity if productivity is not None else np.nan
+            self.columns['interruptions'][row] = interruptions or 0
+            self.size += 1
+            self.last_ids[source] = row_id
+
+    def invalidate(self):
+        """Reload from the database on next use, e.g. after sessions were edited"""
+        with self.lock:
+            self.loaded = False
+            self.size = 0
+
+    def _on_session_committed(self, session_id=None, start_time=None, duration=None, pages_read=None,
+                              document_id=None, session_type=None, focus=False, **_):
+        self.append(READING, session_id, start_time, duration, pages_read, document_id, session_type, focus)
+
+    def _on_focus_session_committed(self, session_id=None, start_time=None, duration=None, pages_read=None,
+                                    document_id=None, productivity_score=None, interruptions=None, **_):
+        self.append(FOCUS, session_id, start_time, duration, pages_read, document_id, 'focus', True,
+                    productivity_score, interruptions)
+
+    def _reserve(self, size: int):
+        capacity = len(self.columns['start'])
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2)
+        for name, dtype in COLUMNS:
+            grown = np.empty(capacity, dtype)
+            grown[:self.size] = self.columns[name][:self.size]
+            # Views handed out earlier keep the old buffers
+            self.columns[name] = grown
+
+    def _load(self):
+        """Read both session tables in two Core queries and build the columns"""
+        reading = ReadingSession.__table__
+        focus = FocusSession.__table__
+        with db_manager.engine.connect() as connection:
+            reading_rows = connection.execute(select(
+                reading.c.id, reading.c.start_time, reading.c.duration, reading.c.pages_read,
+                reading.c.document_id, reading.c.session_type, reading.c.focus_mode
+            )).all()
+            focus_rows = connection.execute(select(
+                focus.c.id, focus.c.start_time, focus.c.duration, focus.c.pages_read,
+                focus.c.document_id, focus.c.was_focus_mode, focus.c.productivity_score,
+                focus.c.interruptions
+            )).all()
+
+        focus_code = self.type_code('focus')
+        rows = [
+            (start, duration, pages, document_id, self.type_code(session_type), bool(focus_mode), READING, None, 0)
+            for _, start, duration, pages, document_id, session_type, focus_mode in reading_rows
+        ] + [
+            (start, duration, pages, document_id, focus_code, bool(was_focus_mode), FOCUS, productivity,
+             interruptions or 0)
+            for _, start, duration, pages, document_id, was_focus_mode, productivity, interruptions in focus_rows
+        ]
+
+        self.size = 0
+        self._reserve(max(INITIAL_CAPACITY, len(rows)))
+        size = len(rows)
+        if size:
+            (start, duration, pages, document_id, session_type, focus_flag, source, productivity,
+             interruptions) = zip(*rows)
+            order = np.argsort(np.array(start, dtype='datetime64[s]'), kind='stable')
+            values = {
+                'start': np.array(start, dtype='datetime64[s]'),
+                'duration': np.nan_to_num(np.array(duration, dtype=np.float64)),
+                'pages': np.array([p or 0 for p in pages], dtype=np.int64),
+                'document_id': np.array([d if d is not None else -1 for d in document_id], dtype=np.int64),
+                'session_type': np.array(session_type, dtype=np.int16),
+                'focus': np.array(focus_flag, dtype=np.bool_),
+                'source': np.array(source, dtype=np.int8),
+                'productivity': np.array(productivity, dtype=np.float64),
+                'interruptions': np.array(interruptions, dtype=np.int64),
+            }
+            for name, _ in COLUMNS:
+                self.columns[name][:size] = values[name][order]
+
+        self.size = size
+        self.last_ids = {
+            READING: max((row[0] for row in reading_rows), default=0),
+            FOCUS: max((row[0] for row in focus_rows), default=0),
+        }
+        self.loaded = True
+        print(f"📊 Session history loaded: {size} sessions")
+
+# Shared by every analytics consumer; kept current by commit events
+session_columns = SessionColumns()
+event_bus.subscribe(SESSION_COMMITTED, session_columns._on_session_committed)
+event_bus.subscribe(FOCUS_SESSION_COMMITTED, session_columns._on_focus_session_committed)
@@ -0,0 +1,156 @@
+"""
+Streaks - Daily reading streaks kept in user_streaks
+Each committed session updates its day in O(1); a full rebuild takes one grouped
+query over reading days and run-length encodes them. Days are local calendar days
+of session start_time (stored in local time), not UTC created_at.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, Optional
+import numpy as np
+from sqlalchemy import func
+from database.models import ReadingSession, Settings, StatsAccumulator, UserStreak
+
+DEFAULT_MINIMUM_MINUTES = 10.0
+STREAK_SCOPE = 'streaks'
+
+def minimum_streak_minutes(db_session) -> float:
+    """Minutes a day needs to count towards a streak (minimum_streak_minutes setting)"""
+    setting = db_session.query(Settings).filter_by(key='minimum_streak_minutes').first()
+    try:
+        return float(setting.value) if setting and setting.value else DEFAULT_MINIMUM_MINUTES
+    except ValueError:
+        return DEFAULT_MINIMUM_MINUTES
+
+def day_start(moment: datetime) -> datetime:
+    """Local midnight starting the day of moment; user_streaks.date holds these"""
+    return datetime.combine(moment.date(), datetime.min.time())
+
+def run_lengths(days: np.ndarray) -> np.ndarray:
+    """Position of each sorted day ordinal within its run of consecutive days, from 1"""
+    if not len(days):
+        return np.zeros(0, dtype=np.int64)
+    index = np.arange(len(days))
+    breaks = np.concatenate([[True], np.diff(days) != 1])
+    run_starts = np.maximum.accumulate(np.where(breaks, index, 0))
+    return index - run_starts + 1
+
+def rebuild_streaks(db_session):
+    """Recompute every streak day from reading history; call before adding a new session row"""
+    minimum = minimum_streak_minutes(db_session)
+    local_day = func.date(ReadingSession.start_time)
+    rows = db_session.query(
+        local_day,
+        func.sum(ReadingSession.duration),
+        func.sum(ReadingSession.pages_read),
+        func.count(ReadingSession.id)
+    ).group_by(local_day).order_by(local_day).all()
+
+    days = [date.fromisoformat(str(day)) for day, *_ in rows]
+    minutes = np.array([total or 0.0 for _, total, _, _ in rows], dtype=np.float64)
+    qualifying = minutes >= minimum
+    ordinals = np.array([day.toordinal() for day in days], dtype=np.int64)
+
+    streak_numbers = np.zeros(len(days), dtype=np.int64)
+    streak_numbers[qualifying] = run_lengths(ordinals[qualifying])
+
+    db_session.query(UserStreak).delete(synchronize_session=False)
+    db_session.add_all(
+        UserStreak(
+            date=datetime.combine(day, datetime.min.time()),
+            minutes_read=float(minutes[i]),
+            pages_read=int(rows[i][2] or 0),
+            sessions_count=int(rows[i][3]),
+            is_streak_day=bool(qualifying[i]),
+            streak_number=int(streak_numbers[i])
+        )
+        for i, day in enumerate(days)
+    )
+    _streak_state(db_session).data = {'minimum_minutes': minimum}
+    db_session.flush()
+
+def record_streak_session(db_session, start_time: datetime, duration: Optional[float],
+                          pages_read: Optional[int]):
+    """Fold a session into its local day; call before adding its row, commit with it"""
+    if _needs_rebuild(db_session):
+        rebuild_streaks(db_session)
+
+    day = day_start(start_time)
+    streak_day = db_session.query(UserStreak).filter_by(date=day).first()
+    if streak_day is None:
+        streak_day = UserStreak(date=day, minutes_read=0.0, pages_read=0, sessions_count=0,
+                                is_streak_day=False, streak_number=0)
+        db_session.add(streak_day)
+
+    streak_day.minutes_read = (streak_day.minutes_read or 0.0) + (duration or 0.0)
+    streak_day.pages_read = (streak_day.pages_read or 0) + (pages_read or 0)
+    streak_day.sessions_count = (streak_day.sessions_count or 0) + 1
+
+    if streak_day.is_streak_day or streak_day.minutes_read < minimum_streak_minutes(db_session):
+        return
+
+    previous = db_session.query(UserStreak).filter_by(date=day - timedelta(days=1)).first()
+    streak_day.is_streak_day = True
+    streak_day.streak_number = (previous.streak_number if previous and previous.is_streak_day else 0) + 1
+
+    # A late session for an earlier day can join it to the streak days that follow
+    number = streak_day.streak_number
+    following = db_session.query(UserStreak).filter(
+        UserStreak.date > day, UserStreak.is_streak_day == True
+    ).order_by(UserStreak.date)
+    expected = day + timedelta(days=1)
+    for later in following:
+        if later.date != expected:
+            break
+        number += 1
+        later.streak_number = number
+        expected += timedelta(days=1)
+
+def get_streak_summary(db_session, today: Optional[date] = None) -> Dict:
+    """Current and longest streak; today still counts as open until it ends"""
+    if _needs_rebuild(db_session):
+        rebuild_streaks(db_session)
+        db_session.commit()
+
+    today = today or date.today()
+    midnight = datetime.combine(today, datetime.min.time())
+    recent = {
+        row.date: row for row in db_session.query(UserStreak).filter(
+            UserStreak.date >= midnight - timedelta(days=1), UserStreak.date <= midnight
+        )
+    }
+    today_row = recent.get(midnight)
+    yesterday_row = recent.get(midnight - timedelta(days=1))
+
+    current = 0
+    if today_row is not None and today_row.is_streak_day:
+        current = today_row.streak_number
+    elif yesterday_row is not None and yesterday_row.is_streak_day:
+        current = yesterday_row.streak_number
+
+    longest = db_session.query(func.max(UserStreak.streak_number)).scalar() or 0
+    minimum = minimum_streak_minutes(db_session)
+    today_minutes = today_row.minutes_read if today_row is not None else 0.0
+
+    return {
+        'current_streak': current,
+        'longest_streak': longest,
+        'today_minutes': round(today_minutes or 0.0, 1),
+        'minimum_minutes': minimum,
+        'today_counts': bool(today_row is not None and today_row.is_streak_day),
+        'at_risk': current > 0 and not (today_row is not None and today_row.is_streak_day)
+    }
+
+def _streak_state(db_session) -> StatsAccumulator:
+    record = db_session.query(StatsAccumulator).filter_by(scope=STREAK_SCOPE).first()
+    if record is None:
+        record = StatsAccumulator(scope=STREAK_SCOPE, data={})
+        db_session.add(record)
+    return record
+
+def _needs_rebuild(db_session) -> bool:
+    """Never built, or built with a different minimum_streak_minutes"""
+    record = db_session.query(StatsAccumulator).filter_by(scope=STREAK_SCOPE).first()
+    if record is None or not record.data:
+        return True
+    return record.data.get('minimum_minutes') != minimum_streak_minutes(db_session)
@@ -5,7 +5,7 @@ SQLAlchemy ORM models for the application with Topic-Based Organization & Goals
 
 from sqlalchemy import (
     Column, Integer, String, DateTime, Boolean, Text, 
-    Float, ForeignKey, create_engine, JSON
+    Float, ForeignKey, Index, create_engine, JSON, inspect, text
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship, sessionmaker
@@ -87,6 +87,9 @@ class FocusSession(Base):
     productivity_score = Column(Float)  # 0-100 based on focus metrics
     
     created_at = Column(DateTime, default=datetime.utcnow)
+    
+    # Focus analytics aggregate a recent window
+    __table_args__ = (Index('ix_focus_sessions_start_time', 'start_time'),)
 
 class UserStreak(Base):
     """Track daily reading streaks - Stage 5"""
@@ -113,13 +116,15 @@ class Document(Base):
     
     id = Column(Integer, primary_key=True)
     filename = Column(String(255), nullable=False)
-    filepath = Column(String(500), nullable=False)
+    filepath = Column(String(500), nullable=False)  # Last known location; updated when the file moves
+    fingerprint = Column(String(40), index=True)  # Content identity, see pdf_handler.document_fingerprint
     title = Column(String(255))
     total_pages = Column(Integer)
     current_page = Column(Integer, default=1)
     total_reading_time = Column(Float, default=0.0)  # in minutes
     estimated_reading_time = Column(Float)  # estimated total time
     reading_speed = Column(Float)  # pages per minute
+    reading_stats = Column(JSON)  # Running speed/consistency accumulators, see estimation.online_stats
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -155,6 +160,20 @@ class ReadingSession(Base):
     
     # Relationships
     document = relationship("Document", back_populates="reading_sessions")
+    
+    # Covers the per-type totals, so they are read from the index alone
+    __table_args__ = (Index('ix_reading_sessions_type_totals', 'session_type', 'duration', 'pages_read'),)
+
+class PageDwell(Base):
+    """Time spent on one page during a reading session"""
+    __tablename__ = 'page_dwells'
+    
+    id = Column(Integer, primary_key=True)
+    document_id = Column(Integer, ForeignKey('documents.id'), nullable=False, index=True)
+    session_id = Column(Integer, ForeignKey('reading_sessions.id'), nullable=True)
+    page_number = Column(Integer, nullable=False)  # 1-based
+    seconds = Column(Float, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
 
 class Note(Base):
     """Notes and highlights from PDFs - Enhanced for Stage 5"""
@@ -180,6 +199,15 @@ class Note(Base):
     # Relationships
     document = relationship("Document", back_populates="notes")
 
+class StatsAccumulator(Base):
+    """Running statistics that span documents, one row per scope"""
+    __tablename__ = 'stats_accumulators'
+    
+    id = Column(Integer, primary_key=True)
+    scope = Column(String(50), unique=True, nullable=False)  # 'global'
+    data = Column(JSON, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 class Settings(Base):
     """Application settings - Enhanced for Stage 5"""
     __tablename__ = 'settings'
@@ -200,8 +228,33 @@ class DatabaseManager:
     def create_tables(self):
         """Create all tables including Stage 5 enhancements"""
         Base.metadata.create_all(bind=self.engine)
+        self._add_missing_columns()
         print("✅ Database tables created successfully (including Stage 5)")
     
+    def _add_missing_columns(self):
+        """Add columns and indexes introduced after a table was created; create_all never alters tables"""
+        inspector = inspect(self.engine)
+        existing_tables = set(inspector.get_table_names())
+        preparer = self.engine.dialect.identifier_preparer
+        
+        with self.engine.begin() as connection:
+            for table in Base.metadata.sorted_tables:
+                if table.name not in existing_tables:
+                    continue
+                
+                present = {column['name'] for column in inspector.get_columns(table.name)}
+                missing = [column for column in table.columns if column.name not in present]
+                for column in missing:
+                    column_type = column.type.compile(dialect=self.engine.dialect)
+                    connection.execute(text(
+                        f"ALTER TABLE {preparer.quote(table.name)} "
+                        f"ADD COLUMN {preparer.quote(column.name)} {column_type}"
+                    ))
+                    print(f"✅ Added column {table.name}.{column.name}")
+                
+                for index in table.indexes:
+                    index.create(connection, checkfirst=True)
+    
     def get_session(self):
         """Get database session"""
         return self.SessionLocal()
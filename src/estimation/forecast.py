@@ -0,0 +1,195 @@
+"""
+Forecast - Monte Carlo completion dates from the reader's own history
+Each simulation draws a reading speed from past sessions and then calendar days of
+reading minutes from past days (days without reading included) until the remaining
+pages are done. Percentiles of the finishing day give P10/P50/P90 completion dates.
+Results live in analytics_cache, like every other analytics result.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+import numpy as np
+from analytics.result_cache import cached_query, SESSION_DATA, DOCUMENT_DATA
+from analytics.session_columns import session_columns
+
+SIMULATIONS = 4000
+HISTORY_DAYS = 90            # Calendar days of reading minutes to resample
+MIN_HISTORY_DAYS = 7         # Fewer days of history fall back to a flat daily pace
+MIN_SPEED_SAMPLES = 3        # Fewer document sessions are pooled with all reading
+MAX_SESSIONS_AVERAGED = 16   # Cap on sessions whose speeds are averaged per simulation
+DAY_BLOCK = 64               # Days simulated per step
+MAX_FORECAST_DAYS = 3650
+NEVER = MAX_FORECAST_DAYS + 1  # Stands in for simulations that do not finish within the horizon
+MIN_SECONDS_PER_PAGE, MAX_SECONDS_PER_PAGE = 1.0, 600.0
+DEFAULT_SECONDS_PER_PAGE = 120.0
+DEFAULT_DAILY_MINUTES = 30.0
+PERCENTILES = (10, 50, 90)
+SEED = 20240101              # Fixed so a refresh with unchanged data gives the same dates
+
+def confidence_label(p10_days: float, p50_days: float, p90_days: float) -> str:
+    """High/Medium/Low from the width of the 80% interval relative to the median"""
+    if not np.isfinite(p90_days):
+        return "Low"
+    spread = (p90_days - p10_days) / max(p50_days, 1.0)
+    if spread <= 0.5:
+        return "High"
+    elif spread <= 1.0:
+        return "Medium"
+    return "Low"
+
+def days_to_finish(minutes_needed: np.ndarray, daily_minutes: np.ndarray,
+                   rng: np.random.Generator) -> np.ndarray:
+    """Calendar days each simulation needs (1 = finishes today), inf beyond MAX_FORECAST_DAYS"""
+    finished = np.full(len(minutes_needed), np.inf)
+    pending = np.flatnonzero(minutes_needed > 0)
+    finished[minutes_needed <= 0] = 0
+    read = np.zeros(len(minutes_needed))
+    elapsed = 0
+
+    while len(pending) and elapsed < MAX_FORECAST_DAYS and daily_minutes.max() > 0:
+        block = daily_minutes[rng.integers(0, len(daily_minutes), size=(len(pending), DAY_BLOCK))]
+        cumulative = read[pending, None] + np.cumsum(block, axis=1)
+        done = cumulative >= minutes_needed[pending, None]
+        hit = done.any(axis=1)
+        finished[pending[hit]] = elapsed + done[hit].argmax(axis=1) + 1
+        read[pending] = cumulative[:, -1]
+        pending = pending[~hit]
+        elapsed += DAY_BLOCK
+    return finished
+
+class CompletionForecaster:
+    """Percentile completion forecasts from the reader's session history"""
+
+    def __init__(self, simulations: int = SIMULATIONS):
+        self.simulations = simulations
+
+    def forecast_document(self, document_id: int, remaining_pages: int,
+                          expected_minutes: Optional[float] = None) -> Dict:
+        """P10/P50/P90 completion of one document
+
+        expected_minutes, when given (e.g. from the page content model), centres the
+        simulated reading time; the spread still comes from session-to-session speed.
+        """
+        return self._forecast_document(document_id, remaining_pages,
+                                       round(expected_minutes, 1) if expected_minutes is not None else None)
+
+    def forecast_library(self, documents: Iterable[Tuple[int, int, Optional[float]]]) -> Dict:
+        """P10/P50/P90 completion of several documents read one after another
+
+        documents are (document_id, remaining_pages, expected_minutes) tuples.
+        """
+        return self._forecast_library(tuple((doc_id, pages, round(minutes, 1) if minutes is not None else None)
+                                            for doc_id, pages, minutes in documents))
+
+    @cached_query('session_minutes_range', SESSION_DATA)
+    def session_minutes_range(self, document_id: int, pages: int,
+                              percentiles: Tuple[int, int] = (10, 90)) -> Optional[Tuple[float, float]]:
+        """Range of minutes reading pages of a document takes, None without speed history"""
+        speeds = self._speed_samples(document_id)
+        if not len(speeds):
+            return None
+        low, high = np.percentile(speeds * pages / 60, percentiles)
+        return float(low), float(high)
+
+    @cached_query('document_forecast', SESSION_DATA + DOCUMENT_DATA)
+    def _forecast_document(self, document_id: int, remaining_pages: int,
+                           expected_minutes: Optional[float]) -> Dict:
+        rng = np.random.default_rng(SEED)
+        minutes = self._reading_minutes(rng, document_id, remaining_pages, expected_minutes)
+        return self._summarise(minutes, rng)
+
+    @cached_query('library_forecast', SESSION_DATA + DOCUMENT_DATA)
+    def _forecast_library(self, documents: Tuple[Tuple[int, int, Optional[float]], ...]) -> Dict:
+        rng = np.random.default_rng(SEED)
+        minutes = np.zeros(self.simulations)
+        for document_id, remaining_pages, expected_minutes in documents:
+            minutes += self._reading_minutes(rng, document_id, remaining_pages, expected_minutes)
+        result = self._summarise(minutes, rng)
+        result['documents'] = len(documents)
+        return result
+
+    def _reading_minutes(self, rng: np.random.Generator, document_id: int, remaining_pages: int,
+                         expected_minutes: Optional[float]) -> np.ndarray:
+        """Simulated minutes to read the remaining pages"""
+        if remaining_pages <= 0:
+            return np.zeros(self.simulations)
+        speeds = self._speed_samples(document_id)
+        if not len(speeds):
+            seconds_per_page = (expected_minutes * 60 / remaining_pages if expected_minutes
+                                else DEFAULT_SECONDS_PER_PAGE)
+            return np.full(self.simulations, remaining_pages * seconds_per_page / 60)
+
+        # The rest of the document takes several sessions, so average that many session speeds
+        _, _, _, session_minutes = self._history()
+        typical_minutes = expected_minutes or remaining_pages * speeds.mean() / 60
+        sessions = int(np.clip(round(typical_minutes / max(session_minutes, 1.0)), 1, MAX_SESSIONS_AVERAGED))
+        draws = speeds[rng.integers(0, len(speeds), size=(self.simulations, sessions))].mean(axis=1)
+        minutes = remaining_pages * draws / 60
+        if expected_minutes:
+            minutes *= expected_minutes / (remaining_pages * speeds.mean() / 60)
+        return minutes
+
+    def _speed_samples(self, document_id: int) -> np.ndarray:
+        """Seconds per page of past sessions on the document, pooled with all reading when few"""
+        _, speeds, documents, _ = self._history()
+        own = speeds[documents == document_id]
+        return own if len(own) >= MIN_SPEED_SAMPLES else speeds
+
+    @cached_query('forecast_history', SESSION_DATA)
+    def _history(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+        """(daily minutes, session seconds per page, their document ids, mean session minutes)"""
+        sessions = session_columns.table().reading()
+
+        readable = (sessions.pages > 0) & (sessions.duration > 0)
+        speeds = np.clip(sessions.duration[readable] * 60 / sessions.pages[readable],
+                         MIN_SECONDS_PER_PAGE, MAX_SECONDS_PER_PAGE)
+
+        # Completed days since reading started, up to HISTORY_DAYS
+        today = date.today()
+        daily = np.zeros(0)
+        if len(sessions):
+            first_day = sessions.start.min().astype('datetime64[D]').astype(date)
+            start = max(first_day, today - timedelta(days=HISTORY_DAYS))
+            days = (today - start).days
+            if days > 0:
+                daily, _, _ = sessions.daily_totals(start, days)
+        if len(daily) < MIN_HISTORY_DAYS or not daily.any():
+            reading_days = daily[daily > 0]
+            daily = np.array([reading_days.mean() if len(reading_days) else DEFAULT_DAILY_MINUTES])
+
+        session_minutes = float(sessions.duration[readable].mean()) if readable.any() else 0.0
+        return daily, speeds, sessions.document_id[readable], session_minutes
+
+    def _summarise(self, minutes: np.ndarray, rng: np.random.Generator) -> Dict:
+        daily = self._history()[0]
+        # inf would turn percentiles into nan; 'higher' keeps each one an actual simulated day count
+        days = np.minimum(days_to_finish(minutes, daily, rng), NEVER)
+        p10, p50, p90 = (
+            float(value) if value < NEVER else np.inf
+            for value in np.percentile(days, PERCENTILES, method='higher')
+        )
+        minutes_p10, minutes_p50, minutes_p90 = np.percentile(minutes, PERCENTILES)
+        today = date.today()
+
+        def finish_date(day_count: float) -> Optional[str]:
+            if not np.isfinite(day_count):
+                return None
+            return (today + timedelta(days=max(0, int(np.ceil(day_count)) - 1))).isoformat()
+
+        return {
+            'p10_date': finish_date(p10),
+            'p50_date': finish_date(p50),
+            'p90_date': finish_date(p90),
+            'p10_days': p10 if np.isfinite(p10) else None,
+            'p50_days': p50 if np.isfinite(p50) else None,
+            'p90_days': p90 if np.isfinite(p90) else None,
+            'minutes_p10': round(float(minutes_p10), 1),
+            'minutes_p50': round(float(minutes_p50), 1),
+            'minutes_p90': round(float(minutes_p90), 1),
+            'confidence_level': confidence_label(p10, p50, p90),
+            'simulations': len(minutes),
+            'generated_at': datetime.now().isoformat()
+        }
+
+# Shared by the estimators
+completion_forecaster = CompletionForecaster()
@@ -0,0 +1,204 @@
+"""
+Online Stats - Reading speed and consistency accumulators updated as sessions commit
+Each committed session is folded in O(1); estimates read the accumulators instead of
+re-reducing reading_sessions. Per-document stats live on the document row, global
+ones in stats_accumulators.
+"""
+
+from datetime import datetime
+from typing import Dict, Optional
+from database.models import Document, FocusSession, ReadingSession, StatsAccumulator
+
+EWMA_ALPHA = 0.1        # Weight of the newest session, roughly the last 20 sessions dominate
+DAILY_EWMA_ALPHA = 0.2  # Weight of the newest reading day
+GLOBAL_SCOPE = 'global'
+
+class OnlineStats:
+    """Count, mean and variance (Welford) plus an exponentially weighted mean and variance"""
+
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0,
+                 ewma: Optional[float] = None, ewvar: float = 0.0, alpha: float = EWMA_ALPHA):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2        # Sum of squared differences from the mean
+        self.ewma = ewma
+        self.ewvar = ewvar
+        self.alpha = alpha
+
+    def add(self, value: float):
+        """Fold in one observation"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+        if self.ewma is None:
+            self.ewma = value
+        else:
+            diff = value - self.ewma
+            increment = self.alpha * diff
+            self.ewma += increment
+            self.ewvar = (1 - self.alpha) * (self.ewvar + diff * increment)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return self.variance ** 0.5
+
+    def consistency_score(self, recent: bool = False, minimum_count: int = 2) -> float:
+        """0-100, higher when values vary less relative to their mean"""
+        if self.count < minimum_count:
+            return 0.0
+        mean, stdev = (self.ewma or 0.0, self.ewvar ** 0.5) if recent else (self.mean, self.stdev)
+        if mean <= 0:
+            return 0.0
+        return round(min(100.0, max(0.0, 100 - stdev / mean * 100)), 1)
+
+    def to_dict(self) -> Dict:
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2, 'ewma': self.ewma, 'ewvar': self.ewvar}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict], alpha: float = EWMA_ALPHA) -> 'OnlineStats':
+        return cls(alpha=alpha, **(data or {}))
+
+class ReadingStats:
+    """Accumulators for one document, or for all reading"""
+
+    def __init__(self, data: Optional[Dict] = None):
+        data = data or {}
+        self.pages = data.get('pages', 0)
+        self.seconds = data.get('seconds', 0.0)
+        self.seconds_per_page = OnlineStats.from_dict(data.get('seconds_per_page'))
+        self.pages_per_minute = OnlineStats.from_dict(data.get('pages_per_minute'))
+        self.session_minutes = OnlineStats.from_dict(data.get('session_minutes'))
+        self.focus_minutes = OnlineStats.from_dict(data.get('focus_minutes'))
+        # Completed reading days, plus the day still being read
+        self.daily_minutes = OnlineStats.from_dict(data.get('daily_minutes'), DAILY_EWMA_ALPHA)
+        self.day = data.get('day')
+        self.day_minutes = data.get('day_minutes', 0.0)
+
+    @property
+    def session_count(self) -> int:
+        return self.session_minutes.count
+
+    def add_session(self, start_time: datetime, duration: Optional[float], pages_read: Optional[int]):
+        """Fold in a reading session of duration minutes"""
+        if not duration or duration <= 0:
+            return
+        self.session_minutes.add(duration)
+        self._add_day_minutes(start_time, duration)
+
+        if pages_read and pages_read > 0:
+            seconds = duration * 60
+            self.pages += pages_read
+            self.seconds += seconds
+            self.seconds_per_page.add(seconds / pages_read)
+            self.pages_per_minute.add(pages_read / duration)
+
+    def add_focus_session(self, duration: Optional[float]):
+        """Fold in a focus session of duration minutes"""
+        if duration and duration > 0:
+            self.focus_minutes.add(duration)
+
+    def average_seconds_per_page(self) -> Optional[float]:
+        """Total time over total pages, None before any page was read"""
+        return self.seconds / self.pages if self.pages else None
+
+    def average_daily_minutes(self) -> Optional[float]:
+        """Recent minutes per day on days with reading"""
+        if self.daily_minutes.count:
+            return self.daily_minutes.ewma
+        return self.day_minutes or None
+
+    def _add_day_minutes(self, start_time: datetime, minutes: float):
+        day = start_time.date().isoformat()
+        if self.day is None or day > self.day:
+            if self.day is not None and self.day_minutes > 0:
+                self.daily_minutes.add(self.day_minutes)
+            self.day = day
+            self.day_minutes = 0.0
+        # Late arrivals for an earlier day count towards the current one
+        self.day_minutes += minutes
+
+    def to_dict(self) -> Dict:
+        return {
+            'pages': self.pages,
+            'seconds': self.seconds,
+            'seconds_per_page': self.seconds_per_page.to_dict(),
+            'pages_per_minute': self.pages_per_minute.to_dict(),
+            'session_minutes': self.session_minutes.to_dict(),
+            'focus_minutes': self.focus_minutes.to_dict(),
+            'daily_minutes': self.daily_minutes.to_dict(),
+            'day': self.day,
+            'day_minutes': self.day_minutes,
+        }
+
+def load_document_stats(db_session, document_id: int) -> ReadingStats:
+    """A document's accumulators, rebuilt from its sessions the first time"""
+    document = db_session.get(Document, document_id)
+    if document is None:
+        return ReadingStats()
+    if document.reading_stats is None:
+        stats = _rebuild(db_session, document_id)
+        document.reading_stats = stats.to_dict()
+        db_session.commit()
+        return stats
+    return ReadingStats(document.reading_stats)
+
+def load_global_stats(db_session) -> ReadingStats:
+    """Accumulators over all reading, rebuilt from history the first time"""
+    record = _global_record(db_session)
+    if record.id is None:
+        db_session.commit()
+    return ReadingStats(record.data)
+
+def record_reading_session(db_session, document_id: int, start_time: datetime,
+                           duration: Optional[float], pages_read: Optional[int]):
+    """Fold a session into the document and global stats; call before adding its row, commit with it"""
+    document = db_session.get(Document, document_id)
+    if document is not None:
+        stats = (ReadingStats(document.reading_stats) if document.reading_stats is not None
+                 else _rebuild(db_session, document_id))
+        stats.add_session(start_time, duration, pages_read)
+        document.reading_stats = stats.to_dict()
+
+    record = _global_record(db_session)
+    stats = ReadingStats(record.data)
+    stats.add_session(start_time, duration, pages_read)
+    record.data = stats.to_dict()
+
+def record_focus_session(db_session, duration: Optional[float]):
+    """Fold a focus session into the global stats; call before adding its row, commit with it"""
+    record = _global_record(db_session)
+    stats = ReadingStats(record.data)
+    stats.add_focus_session(duration)
+    record.data = stats.to_dict()
+
+def _global_record(db_session) -> StatsAccumulator:
+    record = db_session.query(StatsAccumulator).filter_by(scope=GLOBAL_SCOPE).first()
+    if record is None:
+        record = StatsAccumulator(scope=GLOBAL_SCOPE, data=_rebuild(db_session, include_focus=True).to_dict())
+        db_session.add(record)
+    return record
+
+def _rebuild(db_session, document_id: Optional[int] = None, include_focus: bool = False) -> ReadingStats:
+    """Replay history once, in start order, for databases that predate the accumulators"""
+    stats = ReadingStats()
+    query = db_session.query(
+        ReadingSession.start_time, ReadingSession.duration, ReadingSession.pages_read
+    )
+    if document_id is not None:
+        query = query.filter(ReadingSession.document_id == document_id)
+    for start_time, duration, pages_read in query.order_by(ReadingSession.start_time):
+        stats.add_session(start_time, duration, pages_read)
+
+    if include_focus:
+        focus_durations = db_session.query(FocusSession.duration).filter(
+            FocusSession.was_focus_mode == True
+        ).order_by(FocusSession.start_time)
+        for (duration,) in focus_durations:
+            stats.add_focus_session(duration)
+    return stats
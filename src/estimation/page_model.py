@@ -0,0 +1,68 @@
+"""
+Page Model - Reading time of each page predicted from its content
+Fits seconds per word, per image-covered page and per formula character to a
+document's recorded page dwell times, so slides and dense proofs differ
+"""
+
+from typing import Sequence
+import numpy as np
+from pdf_handler.pdf_engine import PAGE_FEATURES
+
+MIN_DWELL_SECONDS = 2.0     # Shorter visits are page flips, not reading
+MAX_DWELL_SECONDS = 600.0   # Longer ones mean the reader walked away
+MIN_SAMPLES = 8             # Pages read before the fit is used
+RIDGE = 1.0                 # Pull towards the flat per-page speed while data is thin
+MIN_PAGE_SECONDS = 1.0
+
+def design_matrix(features: np.ndarray) -> np.ndarray:
+    """Intercept column followed by the PAGE_FEATURES columns"""
+    features = np.asarray(features, dtype=np.float64).reshape(-1, len(PAGE_FEATURES))
+    return np.hstack([np.ones((len(features), 1)), features])
+
+class PageTimeModel:
+    """Seconds to read a page as a linear function of its features"""
+
+    def __init__(self, coefficients: np.ndarray, samples: int = 0):
+        self.coefficients = coefficients  # Intercept, then one per PAGE_FEATURES column
+        self.samples = samples            # Dwell times behind the fit, 0 for a flat model
+
+    @classmethod
+    def flat(cls, seconds_per_page: float) -> 'PageTimeModel':
+        """Every page takes the same time"""
+        coefficients = np.zeros(len(PAGE_FEATURES) + 1)
+        coefficients[0] = seconds_per_page
+        return cls(coefficients)
+
+    @classmethod
+    def fit(cls, features: np.ndarray, pages: Sequence[int], seconds: Sequence[float],
+            seconds_per_page: float) -> 'PageTimeModel':
+        """Least squares fit to 0-based page dwell times, regularised towards the flat speed"""
+        pages = np.asarray(pages, dtype=np.intp)
+        seconds = np.asarray(seconds, dtype=np.float64)
+        keep = ((pages >= 0) & (pages < len(features))
+                & (seconds >= MIN_DWELL_SECONDS) & (seconds <= MAX_DWELL_SECONDS))
+        pages, seconds = pages[keep], seconds[keep]
+        if len(pages) < MIN_SAMPLES:
+            return cls.flat(seconds_per_page)
+
+        design = design_matrix(features[pages])
+        # Scale columns so one ridge strength suits word counts and image shares alike
+        scale = np.abs(design).max(axis=0)
+        scale[scale == 0] = 1.0
+        prior = cls.flat(seconds_per_page).coefficients * scale
+        penalty = np.sqrt(RIDGE) * np.eye(design.shape[1])
+
+        solution, *_ = np.linalg.lstsq(
+            np.vstack([design / scale, penalty]),
+            np.concatenate([seconds, penalty @ prior]),
+            rcond=None
+        )
+        return cls(solution / scale, len(pages))
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """Seconds for each page"""
+        return np.maximum(design_matrix(features) @ self.coefficients, MIN_PAGE_SECONDS)
+
+    def remaining_seconds(self, features: np.ndarray, current_page: int) -> float:
+        """Time to read the pages after a 1-based current page"""
+        return float(self.predict(features[current_page:]).sum())
@@ -2,10 +2,13 @@
 Reading Predictor - Advanced estimation algorithms
 """
 
-from datetime import datetime, timedelta
 from typing import Dict, List
-import statistics
-from database.models import db_manager, ReadingSession, Document
+import numpy as np
+from database.models import db_manager, Document
+from analytics.session_columns import session_columns, SessionTable
+from analytics.result_cache import cached_query, SESSION_DATA
+from .online_stats import OnlineStats, load_document_stats, load_global_stats
+from .forecast import completion_forecaster
 
 class ReadingPredictor:
     """Advanced reading prediction and pattern analysis"""
@@ -24,7 +27,7 @@ class ReadingPredictor:
             estimated_minutes = estimated_seconds / 60
             
             # Add confidence intervals
-            confidence_range = self._calculate_confidence_range(document_id, estimated_minutes)
+            confidence_range = self._calculate_confidence_range(document_id, target_pages, estimated_minutes)
             
             return {
                 'target_pages': target_pages,
@@ -39,27 +42,24 @@ class ReadingPredictor:
             print(f"❌ Error predicting session duration: {e}")
             return {}
     
+    @cached_query('reading_patterns', SESSION_DATA)
     def analyze_reading_patterns(self) -> Dict:
         """Analyze user's reading patterns and habits"""
         try:
-            sessions = self.session.query(ReadingSession).order_by(
-                ReadingSession.start_time.desc()
-            ).limit(100).all()
+            # Last 100 sessions, columns are in start order
+            sessions = session_columns.table().reading()
+            sessions = sessions.select(slice(-100, None))
             
-            if not sessions:
+            if not len(sessions):
                 return {}
             
             # Analyze patterns
-            session_lengths = [s.duration for s in sessions if s.duration]
-            pages_per_session = [s.pages_read for s in sessions if s.pages_read]
+            stats = load_global_stats(self.session)
+            pages_per_session = sessions.pages[sessions.pages > 0]
             
             # Time of day analysis
-            hour_counts = {}
-            for session in sessions:
-                hour = session.start_time.hour
-                hour_counts[hour] = hour_counts.get(hour, 0) + 1
-            
-            most_productive_hour = max(hour_counts, key=hour_counts.get) if hour_counts else None
+            hour_counts = np.bincount(sessions.hours(), minlength=24)
+            most_productive_hour = int(hour_counts.argmax())
             
             # Reading efficiency over time
             recent_speed = self._calculate_recent_reading_speed()
@@ -68,13 +68,13 @@ class ReadingPredictor:
             
             return {
                 'total_sessions_analyzed': len(sessions),
-                'average_session_length': round(statistics.mean(session_lengths), 1) if session_lengths else 0,
-                'average_pages_per_session': round(statistics.mean(pages_per_session), 1) if pages_per_session else 0,
+                'average_session_length': round(stats.session_minutes.mean, 1),
+                'average_pages_per_session': round(float(pages_per_session.mean()), 1) if len(pages_per_session) else 0,
                 'most_productive_hour': most_productive_hour,
                 'reading_speed_trend': speed_trend,
                 'recent_avg_speed': round(recent_speed, 2),
                 'historical_avg_speed': round(historical_speed, 2),
-                'consistency_score': self._calculate_consistency_score(session_lengths),
+                'consistency_score': self._calculate_consistency_score(stats.session_minutes),
                 'recommendations': self._generate_pattern_recommendations(sessions)
             }
             
@@ -84,27 +84,17 @@ class ReadingPredictor:
     
     def _get_document_time_per_page(self, document_id: int) -> float:
         """Get time per page for specific document"""
-        sessions = self.session.query(ReadingSession).filter_by(
-            document_id=document_id
-        ).all()
-        
-        total_time = 0
-        total_pages = 0
-        
-        for session in sessions:
-            if session.duration and session.pages_read:
-                total_time += session.duration * 60  # Convert to seconds
-                total_pages += session.pages_read
-        
-        return total_time / total_pages if total_pages > 0 else 120  # Default 2 minutes
+        seconds_per_page = load_document_stats(self.session, document_id).average_seconds_per_page()
+        return seconds_per_page or 120  # Default 2 minutes
     
-    def _calculate_confidence_range(self, document_id: int, estimated_minutes: float) -> tuple:
-        """Calculate confidence range for estimate"""
-        # Simple confidence range: ±20% based on variance
-        variance_factor = 0.2
-        min_estimate = estimated_minutes * (1 - variance_factor)
-        max_estimate = estimated_minutes * (1 + variance_factor)
-        return (min_estimate, max_estimate)
+    def _calculate_confidence_range(self, document_id: int, target_pages: int, estimated_minutes: float) -> tuple:
+        """P10-P90 range of past session speeds applied to the target pages"""
+        session_range = completion_forecaster.session_minutes_range(document_id, target_pages)
+        if session_range:
+            return session_range
+        
+        # ±20% until there are sessions to resample
+        return (estimated_minutes * 0.8, estimated_minutes * 1.2)
     
     def _recommend_timer_mode(self, estimated_minutes: float) -> str:
         """Recommend best timer mode for estimated duration"""
@@ -131,44 +121,19 @@ class ReadingPredictor:
         return recommendations or ["No breaks needed for short session"]
     
     def _calculate_recent_reading_speed(self) -> float:
-        """Calculate reading speed from recent sessions"""
-        recent_date = datetime.now() - timedelta(days=7)
-        sessions = self.session.query(ReadingSession).filter(
-            ReadingSession.start_time >= recent_date
-        ).all()
-        
-        total_time = sum(s.duration for s in sessions if s.duration)
-        total_pages = sum(s.pages_read for s in sessions if s.pages_read)
-        
-        return total_pages / total_time if total_time > 0 else 0
+        """Pages per minute, weighted towards recent sessions"""
+        return load_global_stats(self.session).pages_per_minute.ewma or 0
     
     def _calculate_historical_reading_speed(self) -> float:
-        """Calculate reading speed from historical sessions"""
-        old_date = datetime.now() - timedelta(days=30)
-        recent_date = datetime.now() - timedelta(days=7)
-        
-        sessions = self.session.query(ReadingSession).filter(
-            ReadingSession.start_time.between(old_date, recent_date)
-        ).all()
-        
-        total_time = sum(s.duration for s in sessions if s.duration)
-        total_pages = sum(s.pages_read for s in sessions if s.pages_read)
-        
-        return total_pages / total_time if total_time > 0 else 0
+        """Pages per minute averaged over all sessions"""
+        return load_global_stats(self.session).pages_per_minute.mean
     
-    def _calculate_consistency_score(self, session_lengths: List[float]) -> float:
-        """Calculate reading consistency score (0-100)"""
-        if len(session_lengths) < 2:
-            return 0
-        
-        mean_length = statistics.mean(session_lengths)
-        std_dev = statistics.stdev(session_lengths)
-        
+    def _calculate_consistency_score(self, session_lengths: OnlineStats) -> float:
+        """Calculate reading consistency score (0-100) of recent session lengths"""
         # Lower standard deviation = higher consistency
-        consistency = max(0, 100 - (std_dev / mean_length * 100))
-        return round(consistency, 1)
+        return session_lengths.consistency_score(recent=True)
     
-    def _generate_pattern_recommendations(self, sessions: List) -> List[str]:
+    def _generate_pattern_recommendations(self, sessions: SessionTable) -> List[str]:
         """Generate recommendations based on reading patterns"""
         recommendations = []
         
@@ -176,8 +141,7 @@ class ReadingPredictor:
             recommendations.append("Build more reading data for better predictions")
         
         # Analyze session frequency
-        session_dates = [s.start_time.date() for s in sessions]
-        unique_dates = len(set(session_dates))
+        unique_dates = len(np.unique(sessions.start.astype('datetime64[D]')))
         
         if unique_dates < len(sessions) * 0.7:
             recommendations.append("Try spreading reading across more days for better retention")
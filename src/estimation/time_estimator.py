@@ -3,10 +3,62 @@ Smart Time Estimation System
 Calculates completion times based on actual reading behavior
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
-from database.models import db_manager, Document, ReadingSession
-from sqlalchemy import func, and_
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+from database.models import db_manager, Document, PageDwell
+from analytics.result_cache import cached_query, SESSION_DATA, DOCUMENT_DATA
+from .page_model import PageTimeModel
+from .online_stats import load_document_stats, load_global_stats
+from .forecast import completion_forecaster
+
+class Chapter(NamedTuple):
+    """An outline entry with the pages it covers"""
+    level: int
+    title: str
+    start_page: int  # 1-based, inclusive
+    end_page: int    # 1-based, inclusive
+
+def build_chapters(outline: List[List], total_pages: int) -> List[Chapter]:
+    """Turn [level, title, page] outline rows into page ranges in one pass
+    
+    A chapter ends where the next entry at the same or a higher level starts.
+    """
+    chapters: List[Optional[Chapter]] = []
+    open_entries: List[Tuple[int, int]] = []  # (level, index into chapters), innermost last
+    
+    for level, title, page, *_ in outline:
+        if page < 1 or total_pages < 1:
+            continue  # Entries pointing outside the document
+        start = min(page, total_pages)
+        while open_entries and open_entries[-1][0] >= level:
+            _, index = open_entries.pop()
+            chapter = chapters[index]
+            chapters[index] = chapter._replace(end_page=max(chapter.start_page, start - 1))
+        chapters.append(Chapter(level, title, start, total_pages))
+        open_entries.append((level, len(chapters) - 1))
+    
+    return chapters
+
+def chapter_remaining_minutes(chapters: List[Chapter], current_page: int,
+                              seconds_per_page: float) -> List[float]:
+    """Minutes left in every chapter when reading a 1-based page, in one pass"""
+    return [
+        max(0, chapter.end_page - max(chapter.start_page, current_page) + 1) * seconds_per_page / 60
+        for chapter in chapters
+    ]
+
+def format_time_estimate(minutes: float) -> str:
+    """Format time estimate in human-readable format"""
+    if minutes < 60:
+        return f"{int(minutes)}m"
+    else:
+        hours = int(minutes // 60)
+        remaining_minutes = int(minutes % 60)
+        if remaining_minutes == 0:
+            return f"{hours}h"
+        else:
+            return f"{hours}h {remaining_minutes}m"
 
 class TimeEstimator:
     """Estimates reading completion times based on user behavior"""
@@ -16,8 +68,10 @@ class TimeEstimator:
         self.minimum_sample_pages = 3  # Need at least 3 pages for reliable estimate
         self.default_time_per_page = 120  # 2 minutes default if no data
     
-    def estimate_document_completion(self, document_id: int) -> Dict:
-        """Estimate completion time using actual reading data"""
+    @cached_query('document_completion', SESSION_DATA + DOCUMENT_DATA)
+    def estimate_document_completion(self, document_id: int,
+                                     page_features: Optional[np.ndarray] = None) -> Dict:
+        """Estimate completion time using actual reading data, per page when features are given"""
         try:
             document = self.session.query(Document).filter_by(id=document_id).first()
             if not document:
@@ -36,23 +90,27 @@ class TimeEstimator:
             
             # Calculate time estimates
             estimated_seconds = remaining_pages * seconds_per_page
+            estimation_model = 'average speed'
+            if page_features is not None and len(page_features) == total_pages:
+                page_model = self._fit_page_model(document_id, page_features, seconds_per_page)
+                if page_model.samples:
+                    estimated_seconds = page_model.remaining_seconds(page_features, current_page)
+                    if remaining_pages:
+                        seconds_per_page = estimated_seconds / remaining_pages
+                    estimation_model = 'page content'
+                    print(f"📊 Page content model fitted to {page_model.samples} pages")
             estimated_minutes = estimated_seconds / 60
             
             print(f"📊 Progress: {current_page}/{total_pages} ({progress_percent:.1f}%)")
             print(f"📊 Speed: {seconds_per_page:.1f}s/page")
             print(f"📊 Remaining: {remaining_pages} pages = {estimated_minutes:.1f} minutes")
             
-            # Estimate completion date based on reading habits
-            daily_reading_time = self._get_realistic_daily_reading_time()
-            days_to_complete = estimated_minutes / daily_reading_time if daily_reading_time > 0 else None
-            
-            completion_date = None
-            if days_to_complete and days_to_complete > 0:
-                from datetime import datetime, timedelta
-                completion_date = datetime.now() + timedelta(days=days_to_complete)
+            # Completion dates simulated from past reading days and session speeds
+            forecast = completion_forecaster.forecast_document(document_id, remaining_pages, estimated_minutes)
+            completion_date = forecast.get('p50_date') if remaining_pages else None
             
-            # Confidence based on amount of data
-            confidence = self._calculate_confidence_level(document_id)
+            # Confidence from how far apart the likely completion dates are
+            confidence = self._calculate_confidence_level(forecast)
             
             return {
                 'document_id': document_id,
@@ -64,14 +122,36 @@ class TimeEstimator:
                 'avg_time_per_page_seconds': round(seconds_per_page, 1),
                 'estimated_time_remaining_minutes': round(estimated_minutes, 1),
                 'estimated_time_remaining_formatted': self._format_time_estimate(estimated_minutes),
-                'estimated_completion_date': completion_date.isoformat() if completion_date else None,
+                'estimated_completion_date': completion_date,
+                'completion_forecast': forecast,
                 'confidence_level': confidence,
+                'estimation_model': estimation_model,
                 'recommendation': self._get_reading_recommendation(estimated_minutes, remaining_pages)
             }
             
         except Exception as e:
             print(f"❌ Error estimating document completion: {e}")
             return {}
+    
+    def estimate_chapter_completion(self, document_id: int, chapters: List[Chapter],
+                                    current_page: int) -> List[Dict]:
+        """Remaining time of every chapter, from one reading-speed lookup"""
+        seconds_per_page = self._get_document_reading_speed(document_id)
+        remaining = chapter_remaining_minutes(chapters, current_page, seconds_per_page)
+        
+        return [
+            {
+                'title': chapter.title,
+                'level': chapter.level,
+                'start_page': chapter.start_page,
+                'end_page': chapter.end_page,
+                'remaining_minutes': round(minutes, 1),
+                'remaining_formatted': self._format_time_estimate(minutes)
+            }
+            for chapter, minutes in zip(chapters, remaining)
+        ]
+    
+    @cached_query('all_documents_completion', SESSION_DATA + DOCUMENT_DATA)
     def estimate_all_documents_completion(self) -> Dict:
         """Estimate total time to complete all documents"""
         try:
@@ -92,9 +172,15 @@ class TimeEstimator:
                         completed_documents += 1
             
             # Calculate daily recommendation
-            daily_avg_minutes = self._get_daily_reading_average()
+            daily_avg_minutes = self._get_realistic_daily_reading_time()
             days_to_complete_all = total_estimated_minutes / daily_avg_minutes if daily_avg_minutes > 0 else None
             
+            # Finishing everything, one document after another
+            library_forecast = completion_forecaster.forecast_library(
+                (estimate['document_id'], estimate['remaining_pages'], estimate['estimated_time_remaining_minutes'])
+                for estimate in document_estimates
+            )
+            
             total_documents = len(documents)
             completion_percentage = (completed_documents / total_documents * 100) if total_documents > 0 else 0
             
@@ -107,6 +193,7 @@ class TimeEstimator:
                 'total_estimated_time_formatted': self._format_time_estimate(total_estimated_minutes),
                 'daily_average_reading_minutes': round(daily_avg_minutes, 1),
                 'estimated_days_to_complete': round(days_to_complete_all, 1) if days_to_complete_all else None,
+                'completion_forecast': library_forecast,
                 'document_estimates': document_estimates,
                 'overall_recommendation': self._get_overall_recommendation(total_estimated_minutes, days_to_complete_all)
             }
@@ -115,6 +202,7 @@ class TimeEstimator:
             print(f"❌ Error estimating total completion: {e}")
             return {}
     
+    @cached_query('goal_feasibility', SESSION_DATA + DOCUMENT_DATA)
     def estimate_goal_feasibility(self, target_date: datetime, document_ids: List[int] = None) -> Dict:
         """Check if completing documents by target date is feasible"""
         try:
@@ -140,7 +228,7 @@ class TimeEstimator:
             
             # Calculate required daily reading time
             required_daily_minutes = total_estimated_minutes / days_available
-            daily_avg_minutes = self._get_daily_reading_average()
+            daily_avg_minutes = self._get_realistic_daily_reading_time()
             
             # Determine feasibility
             feasible = required_daily_minutes <= (daily_avg_minutes * 1.5)  # Allow 50% increase
@@ -162,120 +250,74 @@ class TimeEstimator:
             return {}
     
     def _get_document_reading_speed(self, document_id: int) -> float:
-        """Calculate actual time per page from reading sessions"""
+        """Calculate actual time per page from the document's running statistics"""
         try:
-            # Get all reading sessions for this document
-            sessions = self.session.query(ReadingSession).filter_by(
-                document_id=document_id
-            ).all()
+            stats = load_document_stats(self.session, document_id)
+            avg_seconds_per_page = stats.average_seconds_per_page()
             
-            if not sessions:
+            if avg_seconds_per_page is None:
                 print(f"📊 No reading data for document {document_id}, using overall speed")
                 return self._get_user_overall_reading_speed()
             
-            total_time_seconds = 0
-            total_pages_read = 0
-            valid_sessions = []
-            
-            # Process each session to extract time-per-page data
-            for session in sessions:
-                if session.duration and session.pages_read and session.pages_read > 0:
-                    session_seconds = session.duration * 60  # Convert minutes to seconds
-                    total_time_seconds += session_seconds
-                    total_pages_read += session.pages_read
-                    
-                    time_per_page = session_seconds / session.pages_read
-                    valid_sessions.append({
-                        'pages': session.pages_read,
-                        'time': session.duration,
-                        'speed': time_per_page
-                    })
+            print(f"📊 Document {document_id}: {stats.pages} pages over {stats.session_count} sessions")
+            print(f"📊 Average speed: {avg_seconds_per_page:.1f} seconds per page")
             
-            if total_pages_read >= 1:  # Need at least 1 page of data
-                avg_seconds_per_page = total_time_seconds / total_pages_read
-                
-                # Debug output
-                print(f"📊 Document {document_id} reading analysis:")
-                for sess in valid_sessions[-3:]:  # Show last 3 sessions
-                    print(f"   {sess['pages']} pages in {sess['time']:.1f}min = {sess['speed']:.1f}s/page")
-                print(f"📊 Average speed: {avg_seconds_per_page:.1f} seconds per page")
-                
-                # Sanity check: reasonable bounds
-                if avg_seconds_per_page < 0.5:
-                    print("📊 Speed unusually fast, using 1s/page minimum")
-                    return 1.0
-                elif avg_seconds_per_page > 600:  # 10 minutes per page max
-                    print("📊 Speed unusually slow, using 60s/page maximum")
-                    return 60.0
-                else:
-                    return avg_seconds_per_page
+            # Sanity check: reasonable bounds
+            if avg_seconds_per_page < 0.5:
+                print("📊 Speed unusually fast, using 1s/page minimum")
+                return 1.0
+            elif avg_seconds_per_page > 600:  # 10 minutes per page max
+                print("📊 Speed unusually slow, using 60s/page maximum")
+                return 60.0
             else:
-                print(f"📊 No valid reading data, using fallback speed")
-                return self._get_user_overall_reading_speed()
+                return avg_seconds_per_page
                 
         except Exception as e:
             print(f"❌ Error calculating reading speed: {e}")
             return 30.0  # Reasonable default
+    
+    def _fit_page_model(self, document_id: int, page_features: np.ndarray,
+                        seconds_per_page: float) -> PageTimeModel:
+        """Fit per-page reading time to this document's recorded page dwell times"""
+        try:
+            dwells = self.session.query(PageDwell.page_number, PageDwell.seconds).filter_by(
+                document_id=document_id
+            ).all()
+        except Exception as e:
+            print(f"❌ Error loading page dwell times: {e}")
+            return PageTimeModel.flat(seconds_per_page)
+        
+        if not dwells:
+            return PageTimeModel.flat(seconds_per_page)
+        pages, seconds = zip(*dwells)
+        return PageTimeModel.fit(page_features, np.asarray(pages) - 1, seconds, seconds_per_page)
+    
     def _get_user_overall_reading_speed(self) -> float:
-        """Calculate overall reading speed across all documents"""
+        """Reading speed across all documents, weighted towards recent sessions"""
         try:
-            # Get recent reading sessions from all documents
-            recent_sessions = self.session.query(ReadingSession).filter(
-                ReadingSession.duration.isnot(None),
-                ReadingSession.pages_read.isnot(None),
-                ReadingSession.pages_read > 0
-            ).order_by(ReadingSession.start_time.desc()).limit(30).all()
+            speeds = load_global_stats(self.session).seconds_per_page
             
-            if not recent_sessions:
+            if not speeds.count:
                 print("📊 No reading history found, using 15s/page default")
                 return 15.0
             
-            total_seconds = 0
-            total_pages = 0
-            
-            for session in recent_sessions:
-                total_seconds += session.duration * 60
-                total_pages += session.pages_read
+            overall_speed = speeds.ewma
+            print(f"📊 Overall reading speed: {overall_speed:.1f}s/page (from {speeds.count} sessions)")
             
-            if total_pages > 0:
-                overall_speed = total_seconds / total_pages
-                print(f"📊 Overall reading speed: {overall_speed:.1f}s/page (from {len(recent_sessions)} sessions)")
-                
-                # Apply reasonable bounds
-                return max(1.0, min(overall_speed, 120.0))
-            else:
-                return 15.0
+            # Apply reasonable bounds
+            return max(1.0, min(overall_speed, 120.0))
                 
         except Exception as e:
             print(f"❌ Error calculating overall speed: {e}")
             return 15.0
+    
     def _get_realistic_daily_reading_time(self) -> float:
         """Calculate realistic daily reading time based on actual usage"""
         try:
-            from datetime import datetime, timedelta
-            from sqlalchemy import func, and_
-            
-            # Look at last 2 weeks of actual reading
-            two_weeks_ago = datetime.now() - timedelta(days=14)
-            
-            # Get daily reading totals
-            daily_totals = self.session.query(
-                func.date(ReadingSession.start_time).label('date'),
-                func.sum(ReadingSession.duration).label('daily_minutes')
-            ).filter(
-                and_(
-                    ReadingSession.start_time >= two_weeks_ago,
-                    ReadingSession.duration.isnot(None)
-                )
-            ).group_by(func.date(ReadingSession.start_time)).all()
+            avg_daily_minutes = load_global_stats(self.session).average_daily_minutes()
             
-            if daily_totals:
-                # Calculate average from days when you actually read
-                total_minutes = sum(day.daily_minutes or 0 for day in daily_totals)
-                reading_days = len(daily_totals)
-                avg_daily_minutes = total_minutes / reading_days
-                
-                print(f"📊 Daily reading pattern: {avg_daily_minutes:.1f} min/day ({reading_days} active days)")
+            if avg_daily_minutes:
+                print(f"📊 Daily reading pattern: {avg_daily_minutes:.1f} min/day")
                 return max(avg_daily_minutes, 10.0)  # Minimum 10 minutes per day
             else:
                 print("📊 No recent reading pattern, using 30 min/day estimate")
@@ -284,34 +326,14 @@ class TimeEstimator:
         except Exception as e:
             print(f"❌ Error calculating daily reading time: {e}")
             return 30.0
-    def _calculate_confidence_level(self, document_id: int) -> str:
-        """Calculate confidence level of the estimate"""
-        try:
-            session_count = self.session.query(ReadingSession).filter_by(
-                document_id=document_id
-            ).count()
-            
-            if session_count >= 5:
-                return "High"
-            elif session_count >= 2:
-                return "Medium"
-            else:
-                return "Low"
-                
-        except Exception as e:
-            return "Unknown"
+    
+    def _calculate_confidence_level(self, forecast: Dict) -> str:
+        """Calculate confidence level of the estimate from its forecast spread"""
+        return forecast.get('confidence_level', "Unknown")
     
     def _format_time_estimate(self, minutes: float) -> str:
         """Format time estimate in human-readable format"""
-        if minutes < 60:
-            return f"{int(minutes)}m"
-        else:
-            hours = int(minutes // 60)
-            remaining_minutes = int(minutes % 60)
-            if remaining_minutes == 0:
-                return f"{hours}h"
-            else:
-                return f"{hours}h {remaining_minutes}m"
+        return format_time_estimate(minutes)
     
     def _get_reading_recommendation(self, estimated_minutes: float, days_to_complete: float) -> str:
         """Get recommendation based on estimated time"""
@@ -0,0 +1,27 @@
+"""
+SprintReader Events Module
+Change notifications from models to views
+"""
+
+from .event_bus import (
+    EventBus, event_bus,
+    PAGE_CHANGED, DOCUMENT_OPENED, DOCUMENT_CLOSED, PROGRESS_SAVED,
+    SESSION_COMMITTED, FOCUS_SESSION_COMMITTED, NOTE_SAVED, NOTE_DELETED, ESTIMATE_UPDATED,
+    GOAL_PROGRESS, GOAL_COMPLETED
+)
+
+__all__ = [
+    'EventBus',
+    'event_bus',
+    'PAGE_CHANGED',
+    'DOCUMENT_OPENED',
+    'DOCUMENT_CLOSED',
+    'PROGRESS_SAVED',
+    'SESSION_COMMITTED',
+    'FOCUS_SESSION_COMMITTED',
+    'NOTE_SAVED',
+    'NOTE_DELETED',
+    'ESTIMATE_UPDATED',
+    'GOAL_PROGRESS',
+    'GOAL_COMPLETED'
+]
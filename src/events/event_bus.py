@@ -0,0 +1,48 @@
+"""
+Event Bus - Models announce what changed so views refresh instead of polling
+Events are delivered synchronously to subscribers; publish from the GUI thread
+"""
+
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+# Topics and their payload keywords
+PAGE_CHANGED = 'page_changed'            # document_id, page (0-based)
+DOCUMENT_OPENED = 'document_opened'      # filepath
+DOCUMENT_CLOSED = 'document_closed'      # filepath
+PROGRESS_SAVED = 'progress_saved'        # document_id, page (0-based)
+SESSION_COMMITTED = 'session_committed'  # session_id, document_id, start_time, duration (minutes),
+                                         # pages_read, session_type, focus
+FOCUS_SESSION_COMMITTED = 'focus_session_committed'  # session_id, document_id, topic_id, start_time,
+                                                     # duration, pages_read, productivity_score[, interruptions]
+NOTE_SAVED = 'note_saved'                # note_id
+NOTE_DELETED = 'note_deleted'            # note_id
+ESTIMATE_UPDATED = 'estimate_updated'    # document_id
+GOAL_PROGRESS = 'goal_progress'          # goal_ids
+GOAL_COMPLETED = 'goal_completed'        # goal_id, goal_type, target_value
+
+class EventBus:
+    """Topic-based publish/subscribe"""
+
+    def __init__(self):
+        self.subscribers: Dict[str, List[Callable]] = defaultdict(list)
+
+    def subscribe(self, topic: str, callback: Callable) -> Callable[[], None]:
+        """Call callback(**payload) for every event on a topic; returns an unsubscribe function"""
+        self.subscribers[topic].append(callback)
+
+        def unsubscribe():
+            if callback in self.subscribers[topic]:
+                self.subscribers[topic].remove(callback)
+        return unsubscribe
+
+    def publish(self, topic: str, **payload):
+        """Deliver an event; one failing subscriber does not stop the others"""
+        for callback in list(self.subscribers.get(topic, ())):
+            try:
+                callback(**payload)
+            except Exception as e:
+                print(f"❌ Error handling {topic} event: {e}")
+
+# Shared by models and views
+event_bus = EventBus()
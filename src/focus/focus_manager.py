@@ -7,6 +7,9 @@ from qt_compat import QObject, QTimer, pyqtSignal, QSettings, QWidget
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from enum import Enum
+from events.event_bus import event_bus, FOCUS_SESSION_COMMITTED
+from analytics.result_cache import cached_query, SESSION_DATA
+from analytics.heatmap import productivity_heatmap
 
 class FocusLevel(Enum):
     """Stage 5: Enhanced focus levels"""
@@ -410,39 +413,77 @@ class FocusManager(QObject):
     def _save_focus_session_to_db(self, session_summary: dict):
         """Save focus session to database"""
         try:
-            from database.models import db_manager
+            from database.models import db_manager, FocusSession
+            from estimation.online_stats import record_focus_session
             
-            db_manager.record_focus_session(
-                topic_id=session_summary.get('topic_id'),
-                document_id=session_summary.get('document_id'),
-                start_time=self.session_start_time,
-                end_time=datetime.now(),
-                pages_read=session_summary.get('pages_read', 0),
-                focus_level=session_summary.get('focus_level', 'standard'),
-                productivity_score=session_summary.get('productivity_score', 0)
-            )
+            end_time = datetime.now()
+            duration = (end_time - self.session_start_time).total_seconds() / 60
+            
+            session = db_manager.get_session()
+            try:
+                # Running consistency stats commit together with the session row
+                record_focus_session(session, duration)
+                
+                focus_session = FocusSession(
+                    topic_id=session_summary.get('topic_id'),
+                    document_id=session_summary.get('document_id'),
+                    start_time=self.session_start_time,
+                    end_time=end_time,
+                    duration=duration,
+                    pages_read=session_summary.get('pages_read', 0),
+                    was_focus_mode=True,
+                    focus_level=session_summary.get('focus_level', 'standard'),
+                    productivity_score=session_summary.get('productivity_score', 0)
+                )
+                session.add(focus_session)
+                session.commit()
+                focus_session_id = focus_session.id
+            except Exception as e:
+                session.rollback()
+                print(f"❌ Error saving focus session: {e}")
+                focus_session_id = None
+            finally:
+                session.close()
+            
+            if focus_session_id:
+                event_bus.publish(
+                    FOCUS_SESSION_COMMITTED,
+                    session_id=focus_session_id,
+                    document_id=session_summary.get('document_id'),
+                    topic_id=session_summary.get('topic_id'),
+                    start_time=self.session_start_time,
+                    duration=duration,
+                    pages_read=session_summary.get('pages_read', 0),
+                    productivity_score=session_summary.get('productivity_score', 0)
+                )
             
         except Exception as e:
             print(f"❌ Error saving focus session to database: {e}")
     
+    @cached_query('focus_analytics', SESSION_DATA)
     def get_focus_analytics(self, days: int = 30) -> dict:
         """Get focus session analytics for specified period"""
         try:
+            from sqlalchemy import extract, func
             from database.models import db_manager, FocusSession
-            from datetime import datetime, timedelta
+            from analytics.aggregates import grouped_aggregates, combine_groups, count, total, average
             
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days)
+            start_date = datetime.now() - timedelta(days=days)
+            in_range = (FocusSession.start_time >= start_date, FocusSession.was_focus_mode == True)
+            scored = func.nullif(FocusSession.productivity_score, 0)
             
             session = db_manager.get_session()
             try:
-                # Get focus sessions in date range
-                focus_sessions = session.query(FocusSession).filter(
-                    FocusSession.start_time >= start_date,
-                    FocusSession.was_focus_mode == True
-                ).all()
+                # Totals per focus level in one grouped query
+                by_level = grouped_aggregates(session, FocusSession.focus_level, {
+                    'sessions': count(),
+                    'total_time': total(FocusSession.duration),
+                    'scored_sessions': count(scored),
+                    'score_total': total(scored),
+                    'interruptions': total(FocusSession.interruptions)
+                }, in_range)
                 
-                if not focus_sessions:
+                if not by_level:
                     return {
                         'total_sessions': 0,
                         'total_focus_time': 0,
@@ -450,49 +491,52 @@ class FocusManager(QObject):
                         'average_productivity_score': 0,
                         'most_productive_time': "09:00",
                         'interruption_rate': 0,
-                        'consistency_score': 0
+                        'consistency_score': 0,
+                        'focus_levels': {}
                     }
                 
-                # Calculate analytics
-                total_sessions = len(focus_sessions)
-                total_time = sum(s.duration or 0 for s in focus_sessions)
-                avg_session_length = total_time / total_sessions if total_sessions > 0 else 0
-                
-                # Productivity scores
-                productivity_scores = [s.productivity_score or 0 for s in focus_sessions if s.productivity_score]
-                avg_productivity = sum(productivity_scores) / len(productivity_scores) if productivity_scores else 0
-                
-                # Find most productive time of day
-                hour_productivity = {}
-                for fs in focus_sessions:
-                    hour = fs.start_time.hour
-                    if hour not in hour_productivity:
-                        hour_productivity[hour] = []
-                    hour_productivity[hour].append(fs.productivity_score or 0)
-                
-                most_productive_hour = 9  # Default
-                if hour_productivity:
-                    most_productive_hour = max(
-                        hour_productivity.keys(),
-                        key=lambda h: sum(hour_productivity[h]) / len(hour_productivity[h])
-                    )
-                
-                # Calculate interruption rate
-                total_interruptions = sum(s.interruptions or 0 for s in focus_sessions)
-                interruption_rate = total_interruptions / total_time if total_time > 0 else 0
-                
-                return {
-                    'total_sessions': total_sessions,
-                    'total_focus_time': total_time,
-                    'average_session_length': avg_session_length,
-                    'average_productivity_score': avg_productivity,
-                    'most_productive_time': f"{most_productive_hour:02d}:00",
-                    'interruption_rate': interruption_rate,
-                    'consistency_score': self._calculate_consistency_score([s.duration for s in focus_sessions if s.duration])
-                }
+                # Average productivity per hour of day
+                by_hour = grouped_aggregates(session, extract('hour', FocusSession.start_time), {
+                    'productivity': average(func.coalesce(FocusSession.productivity_score, 0))
+                }, in_range)
                 
+                consistency_score = self._calculate_consistency_score(session)
             finally:
                 session.close()
+            
+            # Calculate analytics
+            totals = combine_groups(by_level, ('sessions', 'total_time', 'scored_sessions', 'score_total', 'interruptions'))
+            total_sessions = totals['sessions']
+            total_time = float(totals['total_time'])
+            avg_session_length = total_time / total_sessions if total_sessions > 0 else 0
+            
+            # Productivity scores
+            scored_sessions = totals['scored_sessions']
+            avg_productivity = float(totals['score_total']) / scored_sessions if scored_sessions else 0
+            
+            # Find most productive time of day
+            most_productive_hour = 9  # Default
+            if by_hour:
+                most_productive_hour = int(max(by_hour, key=lambda hour: by_hour[hour]['productivity']))
+            
+            # Calculate interruption rate
+            interruption_rate = totals['interruptions'] / total_time if total_time > 0 else 0
+            
+            # Sessions per focus level; older rows without one used the standard level
+            focus_levels = {}
+            for level, group in by_level.items():
+                focus_levels[level or 'standard'] = focus_levels.get(level or 'standard', 0) + group['sessions']
+            
+            return {
+                'total_sessions': total_sessions,
+                'total_focus_time': total_time,
+                'average_session_length': avg_session_length,
+                'average_productivity_score': avg_productivity,
+                'most_productive_time': f"{most_productive_hour:02d}:00",
+                'interruption_rate': interruption_rate,
+                'consistency_score': consistency_score,
+                'focus_levels': focus_levels
+            }
                 
         except Exception as e:
             print(f"❌ Error getting focus analytics: {e}")
@@ -527,28 +571,30 @@ class FocusManager(QObject):
             recommendations.append("Try Immersive mode to minimize external distractions")
             recommendations.append("Put devices in Do Not Disturb mode during focus sessions")
         
-        # Timing recommendations
-        most_productive_time = analytics.get('most_productive_time')
-        if most_productive_time:
+        # Timing recommendations, from all-time focus scores by weekday and hour
+        heatmap = productivity_heatmap.snapshot()
+        best_slots = heatmap.best_slots('productivity', 2) or heatmap.best_slots('minutes', 2)
+        if best_slots:
             recommendations.append(
-                f"Schedule important reading during your peak time: {most_productive_time}"
+                f"Schedule important reading during your peak times: "
+                f"{' and '.join(slot['label'] for slot in best_slots)}"
             )
+        else:
+            most_productive_time = analytics.get('most_productive_time')
+            if most_productive_time:
+                recommendations.append(
+                    f"Schedule important reading during your peak time: {most_productive_time}"
+                )
         
         return recommendations or ["Keep up the great focus work!"]
     
-    def _calculate_consistency_score(self, durations: List[float]) -> float:
-        """Calculate consistency score from session durations"""
-        if len(durations) < 3:
-            return 0.0
-        
+    def _calculate_consistency_score(self, session) -> float:
+        """Consistency of recent focus session lengths, from the running statistics"""
         try:
-            import statistics
-            std_dev = statistics.stdev(durations)
-            mean_duration = statistics.mean(durations)
-            # Lower std dev relative to mean = higher consistency
-            consistency = max(0, 100 - (std_dev / mean_duration * 100)) if mean_duration > 0 else 0
-            return min(consistency, 100)
-        except:
+            from estimation.online_stats import load_global_stats
+            return load_global_stats(session).focus_minutes.consistency_score(recent=True, minimum_count=3)
+        except Exception as e:
+            print(f"❌ Error reading focus consistency: {e}")
             return 50.0  # Default moderate score
     
     def get_current_session_info(self) -> Optional[dict]:
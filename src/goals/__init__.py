@@ -0,0 +1,8 @@
+"""
+SprintReader Goals Module
+Goal progress and adaptive daily targets
+"""
+
+from .goal_engine import GoalEngine
+
+__all__ = ['GoalEngine']
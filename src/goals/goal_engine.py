@@ -0,0 +1,195 @@
+"""
+Goal Engine - Keeps goal progress current as sessions commit
+Each committed session is applied as a delta to every matching open goal in one
+UPDATE, so dashboards read goals.current_value instead of re-scanning sessions.
+Adaptive daily targets are recomputed once per day.
+"""
+
+from datetime import date, datetime
+from typing import Dict, List, Optional
+from sqlalchemy import case, func, or_, select, update
+from database.models import db_manager, Document, Goal, Settings, StatsAccumulator
+from events.event_bus import (
+    event_bus, SESSION_COMMITTED, FOCUS_SESSION_COMMITTED, GOAL_PROGRESS, GOAL_COMPLETED
+)
+from analytics.result_cache import cached_query, GOAL_DATA
+
+GOAL_SCOPE = 'goals'
+TIME_GOAL_TYPES = ('time',)  # Measured in minutes; every other type counts pages
+
+class GoalEngine:
+    """Applies reading and focus sessions to goals"""
+
+    def __init__(self):
+        self.unsubscribers = [
+            event_bus.subscribe(SESSION_COMMITTED, self._on_session_committed),
+            event_bus.subscribe(FOCUS_SESSION_COMMITTED, self._on_focus_session_committed),
+        ]
+
+    def apply_session(self, minutes: Optional[float], pages: Optional[int],
+                      document_id: Optional[int] = None, topic_id: Optional[int] = None) -> List[int]:
+        """Add a session to the open goals of its document and topic; returns the goal ids updated"""
+        matches = []
+        if document_id is not None:
+            matches.append(Goal.document_id == document_id)
+        if topic_id is not None:
+            matches.append(Goal.topic_id == topic_id)
+        if not matches or not (minutes or pages):
+            return []
+
+        now = datetime.now()
+        delta = case((Goal.goal_type.in_(TIME_GOAL_TYPES), minutes or 0.0), else_=float(pages or 0))
+        progress = func.coalesce(Goal.current_value, 0.0) + delta
+        reached = progress >= Goal.target_value
+
+        session = db_manager.get_session()
+        try:
+            targets_refreshed = self._refresh_daily_targets(session)
+            # Right-hand sides see the row before the update, so all three agree
+            rows = session.execute(
+                update(Goal)
+                .where(Goal.is_completed == False, or_(*matches))
+                .values(
+                    current_value=progress,
+                    is_completed=reached,
+                    completion_date=case((reached, now), else_=None),
+                    updated_at=datetime.utcnow()  # UTC like the column's default and onupdate
+                )
+                .returning(Goal.id, Goal.goal_type, Goal.target_value, Goal.is_completed)
+                .execution_options(synchronize_session=False)
+            ).all()
+            session.commit()
+        except Exception as e:
+            print(f"❌ Error updating goal progress: {e}")
+            session.rollback()
+            return []
+        finally:
+            session.close()
+
+        goal_ids = [row.id for row in rows]
+        if goal_ids or targets_refreshed:
+            event_bus.publish(GOAL_PROGRESS, goal_ids=goal_ids)
+        for row in rows:
+            if row.is_completed:
+                print(f"🏆 Goal completed: {row.target_value:g} {row.goal_type}")
+                event_bus.publish(GOAL_COMPLETED, goal_id=row.id, goal_type=row.goal_type,
+                                  target_value=row.target_value)
+        return goal_ids
+
+    def create_goal(self, goal_type: str, target_value: float, topic_id: Optional[int] = None,
+                    document_id: Optional[int] = None, target_date: Optional[datetime] = None) -> Optional[int]:
+        """Create a goal and let goal views know"""
+        goal_id = db_manager.create_goal(goal_type, target_value, topic_id, document_id, target_date)
+        if goal_id:
+            event_bus.publish(GOAL_PROGRESS, goal_ids=[goal_id])
+        return goal_id
+
+    def refresh_daily_targets(self, force: bool = False):
+        """Recompute adaptive daily targets if today's have not been computed yet"""
+        session = db_manager.get_session()
+        try:
+            refreshed = self._refresh_daily_targets(session, force)
+            if refreshed:
+                session.commit()
+        except Exception as e:
+            print(f"❌ Error refreshing daily targets: {e}")
+            session.rollback()
+            return
+        finally:
+            session.close()
+        if refreshed:
+            event_bus.publish(GOAL_PROGRESS, goal_ids=[])
+
+    def get_goal_progress(self, include_completed: bool = False) -> List[Dict]:
+        """Precomputed progress of every goal, open goals first"""
+        self.refresh_daily_targets()
+        return self._goal_progress(include_completed)
+
+    @cached_query('goal_progress', GOAL_DATA)
+    def _goal_progress(self, include_completed: bool) -> List[Dict]:
+        session = db_manager.get_session()
+        try:
+            query = session.query(Goal)
+            if not include_completed:
+                query = query.filter(Goal.is_completed == False)
+            goals = query.order_by(Goal.is_completed, Goal.target_date, Goal.created_at).all()
+            return [
+                {
+                    'goal_id': goal.id,
+                    'goal_type': goal.goal_type,
+                    'topic_id': goal.topic_id,
+                    'document_id': goal.document_id,
+                    'target_value': goal.target_value,
+                    'current_value': round(goal.current_value or 0.0, 1),
+                    'progress_percent': round(min(100.0, (goal.current_value or 0.0) / goal.target_value * 100), 1)
+                    if goal.target_value else 0.0,
+                    'daily_target': round(goal.daily_target, 1) if goal.daily_target else None,
+                    'target_date': goal.target_date.date().isoformat() if goal.target_date else None,
+                    'is_completed': bool(goal.is_completed),
+                    'completion_date': goal.completion_date.isoformat() if goal.completion_date else None
+                }
+                for goal in goals
+            ]
+        except Exception as e:
+            print(f"❌ Error getting goal progress: {e}")
+            return []
+        finally:
+            session.close()
+
+    def get_daily_minutes_target(self) -> Optional[float]:
+        """Minutes to read today across open time goals with a daily target"""
+        targets = [goal['daily_target'] for goal in self.get_goal_progress()
+                   if goal['goal_type'] in TIME_GOAL_TYPES and goal['daily_target']]
+        return sum(targets) if targets else None
+
+    def close(self):
+        """Stop following session commits"""
+        for unsubscribe in self.unsubscribers:
+            unsubscribe()
+        self.unsubscribers = []
+
+    def _on_session_committed(self, document_id=None, duration=None, pages_read=None, **_):
+        if document_id is None:
+            return
+        session = db_manager.get_session()
+        try:
+            topic_id = session.execute(
+                select(Document.topic_id).where(Document.id == document_id)
+            ).scalar()
+        finally:
+            session.close()
+        self.apply_session(duration, pages_read, document_id, topic_id)
+
+    def _on_focus_session_committed(self, document_id=None, topic_id=None, duration=None,
+                                    pages_read=None, **_):
+        # Focus time on a document is already counted by that document's reading session
+        if document_id is None and topic_id is not None:
+            self.apply_session(duration, pages_read, topic_id=topic_id)
+
+    def _refresh_daily_targets(self, session, force: bool = False) -> bool:
+        """Spread what is left of each deadline goal over its remaining days, once per day"""
+        today = date.today()
+        state = session.query(StatsAccumulator).filter_by(scope=GOAL_SCOPE).first()
+        if not force and state is not None and (state.data or {}).get('targets_day') == today.isoformat():
+            return False
+
+        adaptive = session.query(Settings.value).filter_by(key='adaptive_goal_adjustment').scalar()
+        if adaptive is None or adaptive.lower() == 'true':
+            goals = session.execute(
+                select(Goal.id, Goal.target_value, Goal.current_value, Goal.target_date)
+                .where(Goal.is_completed == False, Goal.target_date.isnot(None))
+            ).all()
+            targets = []
+            for goal_id, target_value, current_value, target_date in goals:
+                remaining = max(0.0, target_value - (current_value or 0.0))
+                days_left = max(1, (target_date.date() - today).days + 1)  # Including today
+                targets.append({'id': goal_id, 'daily_target': remaining / days_left})
+            if targets:
+                # Bulk UPDATE by primary key
+                session.execute(update(Goal), targets)
+
+        if state is None:
+            state = StatsAccumulator(scope=GOAL_SCOPE, data={})
+            session.add(state)
+        state.data = {'targets_day': today.isoformat()}
+        return True
@@ -3,8 +3,7 @@ SprintReader Notes Module
 Obsidian-style note-taking with highlight-to-note functionality
 """
 
-from .note_manager import NoteManager, Note, Topic
-from .highlight_selector import HighlightableLabel, HighlightDialog, NotesPanel
+from importlib import import_module
 
 __all__ = [
     'NoteManager', 
@@ -15,5 +14,21 @@ __all__ = [
     'NotesPanel'
 ]
 
+# Spawned vault loader workers import this package too; exports load on first
+# use so they never pull in Qt or PyMuPDF
+_EXPORTS = {
+    'NoteManager': '.note_manager',
+    'Note': '.note_manager',
+    'Topic': '.note_manager',
+    'HighlightableLabel': '.highlight_selector',
+    'HighlightDialog': '.highlight_selector',
+    'NotesPanel': '.highlight_selector',
+}
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_EXPORTS[name], __name__), name)
+
 __version__ = "4.0.0"
 __description__ = "Local-first note-taking system with PDF highlighting integration"
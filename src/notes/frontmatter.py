@@ -0,0 +1,168 @@
+"""
+Frontmatter - Strict parser and writer for the note metadata header
+Understands exactly what SprintReader writes: scalars and flow lists, never evaluates input
+"""
+
+import json
+from typing import Any, Dict, List, Tuple
+
+DELIMITER = '---'
+
+class FrontmatterError(ValueError):
+    """Raised when a frontmatter block cannot be parsed"""
+
+def split_frontmatter(text: str) -> Tuple[Dict[str, Any], str]:
+    """Split a markdown document into its frontmatter fields and body"""
+    if not text.startswith(DELIMITER + '\n') and text.rstrip('\r\n') != DELIMITER:
+        raise FrontmatterError("document has no frontmatter")
+
+    end = text.find('\n' + DELIMITER, len(DELIMITER))
+    while end != -1:
+        close = end + 1 + len(DELIMITER)
+        # The closing delimiter must be a whole line
+        if close == len(text) or text[close] in '\r\n':
+            break
+        end = text.find('\n' + DELIMITER, close)
+
+    if end == -1:
+        raise FrontmatterError("frontmatter is not closed")
+
+    header = text[len(DELIMITER) + 1:end]
+    body = text[end + 1 + len(DELIMITER):]
+    if body.startswith('\r\n'):
+        body = body[2:]
+    elif body.startswith('\n'):
+        body = body[1:]
+
+    return parse_frontmatter(header), body
+
+def parse_frontmatter(header: str) -> Dict[str, Any]:
+    """Parse `key: value` lines into a dict of strings and lists"""
+    fields = {}
+    for line_number, line in enumerate(header.splitlines(), 1):
+        key, sep, value = line.partition(':')
+        key = key.strip()
+        if not sep:
+            if not key or key.startswith('#'):
+                continue
+            raise FrontmatterError(f"line {line_number}: expected 'key: value'")
+        if not key.isidentifier():
+            if key.startswith('#'):
+                continue
+            raise FrontmatterError(f"line {line_number}: invalid key {key!r}")
+
+        value = value.strip()
+        # Plain scalars stay strings; callers convert ids and page numbers themselves
+        fields[key] = _parse_value(value, line_number) if value[:1] in ('[', '"') else value
+    return fields
+
+def dump_frontmatter(fields: Dict[str, Any]) -> str:
+    """Render fields as a frontmatter block that parse_frontmatter reads back unchanged"""
+    lines = [DELIMITER]
+    for key, value in fields.items():
+        if not key.isidentifier():
+            raise FrontmatterError(f"invalid key {key!r}")
+        lines.append(f"{key}: {_dump_value(value)}")
+    lines.append(DELIMITER)
+    return '\n'.join(lines) + '\n'
+
+def _parse_value(value: str, line_number: int) -> Any:
+    """Parse a flow list or a quoted scalar"""
+    if value.startswith('['):
+        items, end = _parse_list(value, 0, line_number)
+        if value[end:].strip():
+            raise FrontmatterError(f"line {line_number}: unexpected text after list")
+        return items
+
+    if value.startswith('"'):
+        try:
+            return json.loads(value)
+        except ValueError:
+            raise FrontmatterError(f"line {line_number}: bad quoted string") from None
+
+    return value
+
+def _parse_list(text: str, pos: int, line_number: int) -> Tuple[List[Any], int]:
+    """Parse `[a, "b", [1, 2]]` starting at text[pos] == '['"""
+    items = []
+    pos += 1
+    expect_item = True
+
+    while True:
+        while pos < len(text) and text[pos] == ' ':
+            pos += 1
+        if pos >= len(text):
+            raise FrontmatterError(f"line {line_number}: list is not closed")
+
+        char = text[pos]
+        if char == ']':
+            if expect_item and items:
+                raise FrontmatterError(f"line {line_number}: trailing comma in list")
+            return items, pos + 1
+
+        if not expect_item:
+            if char != ',':
+                raise FrontmatterError(f"line {line_number}: expected ',' in list")
+            pos += 1
+            expect_item = True
+            continue
+
+        if char == '[':
+            item, pos = _parse_list(text, pos, line_number)
+        elif char in '"\'':
+            item, pos = _parse_quoted(text, pos, line_number)
+        else:
+            end = pos
+            while end < len(text) and text[end] not in ',]':
+                end += 1
+            # Bare items stay strings: legacy tags like 007 must survive a rewrite;
+            # callers convert numeric fields such as quads themselves
+            item = text[pos:end].strip()
+            pos = end
+
+        items.append(item)
+        expect_item = False
+
+def _parse_quoted(text: str, pos: int, line_number: int) -> Tuple[str, int]:
+    """Parse a double (JSON) or single quoted list item"""
+    quote = text[pos]
+    end = pos + 1
+    while end < len(text):
+        if text[end] == '\\' and quote == '"':
+            end += 2
+            continue
+        if text[end] == quote:
+            break
+        end += 1
+    else:
+        raise FrontmatterError(f"line {line_number}: unterminated string in list")
+
+    raw = text[pos:end + 1]
+    if quote == "'":
+        # Tags written by older versions were Python reprs
+        return raw[1:-1].replace("\\'", "'"), end + 1
+    try:
+        return json.loads(raw), end + 1
+    except ValueError:
+        raise FrontmatterError(f"line {line_number}: bad quoted string in list") from None
+
+def _dump_value(value: Any) -> str:
+    """Render a scalar or (nested) list"""
+    if isinstance(value, (list, tuple)):
+        return '[' + ', '.join(_dump_item(item) for item in value) + ']'
+
+    text = str(value)
+    # Quote anything the plain form would not read back verbatim
+    if text != text.strip() or text.startswith(('[', '"')) or '\n' in text or '\r' in text:
+        return json.dumps(text, ensure_ascii=False)
+    return text
+
+def _dump_item(item: Any) -> str:
+    """Render a list item, always quoting strings"""
+    if isinstance(item, (list, tuple)):
+        return _dump_value(item)
+    if isinstance(item, bool):
+        raise FrontmatterError("booleans are not supported in lists")
+    if isinstance(item, (int, float)):
+        return repr(item)
+    return json.dumps(str(item), ensure_ascii=False)
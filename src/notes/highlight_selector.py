@@ -4,21 +4,56 @@ Highlight Selector - Interactive PDF text selection and highlighting
 
 from PyQt6.QtWidgets import (
     QWidget, QLabel, QVBoxLayout, QHBoxLayout, QPushButton, 
-    QTextEdit, QComboBox, QLineEdit, QDialog, QScrollArea
+    QTextEdit, QComboBox, QLineEdit, QDialog, QScrollArea, QStyle
 )
-from PyQt6.QtCore import Qt, QRect, pyqtSignal, QPoint
+from PyQt6.QtCore import Qt, QRect, QRectF, pyqtSignal, QPoint
 from PyQt6.QtGui import QPainter, QPen, QColor, QFont, QPixmap, QMouseEvent
-from typing import List, Tuple, Optional
-import fitz  # PyMuPDF
+from collections import OrderedDict
+from typing import Dict, List, Tuple, Optional
 
-class TextSelection:
-    """Represents a text selection on a PDF page"""
+Quad = List[float]  # [x0, y0, x1, y1] in PDF points
+
+# Rendered overlays kept per (page, zoom); a page is recomposited only on zoom or edits
+OVERLAY_CACHE_SIZE = 8
+
+def selection_quads(text_blocks: List, pdf_rect: List[float]) -> Tuple[str, List[Quad]]:
+    """Collect text and one PDF-space box per line for spans inside a selection"""
+    texts = []
+    quads = []
+    
+    for block in text_blocks:
+        if not _rects_intersect(pdf_rect, block.get('bbox', [0, 0, 0, 0])):
+            continue
+        for line in block.get('lines', []):
+            if not _rects_intersect(pdf_rect, line.get('bbox', [0, 0, 0, 0])):
+                continue
+            
+            # Merge the selected spans of a line into a single box
+            line_box = None
+            for span in line.get('spans', []):
+                span_bbox = span.get('bbox', [0, 0, 0, 0])
+                if not _rects_intersect(pdf_rect, span_bbox):
+                    continue
+                texts.append(span.get('text', ''))
+                if line_box is None:
+                    line_box = list(span_bbox)
+                else:
+                    line_box = [
+                        min(line_box[0], span_bbox[0]), min(line_box[1], span_bbox[1]),
+                        max(line_box[2], span_bbox[2]), max(line_box[3], span_bbox[3])
+                    ]
+            
+            if line_box:
+                quads.append([round(value, 2) for value in line_box])
     
-    def __init__(self, page_num: int, rect: QRect, text: str):
-        self.page_num = page_num
-        self.rect = rect  # Selection rectangle
-        self.text = text  # Selected text
-        self.color = QColor(255, 255, 0, 100)  # Yellow highlight with transparency
+    return " ".join(texts).strip(), quads
+
+def _rects_intersect(rect1: List[float], rect2: List[float]) -> bool:
+    """Check if two rectangles intersect"""
+    x0_1, y0_1, x1_1, y1_1 = rect1
+    x0_2, y0_2, x1_2, y1_2 = rect2
+    
+    return not (x1_1 < x0_2 or x1_2 < x0_1 or y1_1 < y0_2 or y1_2 < y0_1)
 
 class HighlightableLabel(QLabel):
     """PDF display label that supports text selection and highlighting"""
@@ -41,8 +76,11 @@ class HighlightableLabel(QLabel):
         self.page_number = 0
         self.zoom_factor = 1.0
         
-        # Highlights
-        self.highlights = []  # List of TextSelection objects
+        # Highlights stored as PDF-space boxes, one list per note on this page
+        self.page_highlights: List[List[Quad]] = []
+        self.overlay_cache: Dict[Tuple[int, float], QPixmap] = OrderedDict()
+        self.overlay_sources: Dict[int, List[List[Quad]]] = {}  # highlights each cached page was drawn from
+        self.last_selection_quads: List[Quad] = []
         
         # Styling
         self.selection_color = QColor(0, 120, 215, 100)  # Blue selection
@@ -50,22 +88,81 @@ class HighlightableLabel(QLabel):
     
     def set_pdf_page_data(self, page_number: int, text_blocks: List, zoom_factor: float = 1.0):
         """Set PDF page text data for selection"""
+        if page_number != self.page_number:
+            # Highlights of the previous page must not be composited onto this one
+            self.page_highlights = []
         self.page_number = page_number
         self.text_blocks = text_blocks
         self.zoom_factor = zoom_factor
         self.update()
     
-    def add_highlight(self, text: str, rect: QRect):
-        """Add a highlight to the page"""
-        highlight = TextSelection(self.page_number, rect, text)
-        self.highlights.append(highlight)
+    def set_page_highlights(self, page_number: int, highlights: List[List[Quad]]):
+        """Show stored highlights for a page, recompositing only if they changed"""
+        if self.overlay_sources.get(page_number) != highlights:
+            self._invalidate_overlay(page_number)
+        self.page_number = page_number
+        self.page_highlights = highlights
         self.update()
     
     def clear_highlights(self):
         """Clear all highlights from the page"""
-        self.highlights.clear()
+        self.page_highlights = []
+        self._invalidate_overlay(self.page_number)
         self.update()
     
+    def reset(self):
+        """Forget the page shown so the label can be reused for another one"""
+        self.clear()
+        self.text_blocks = []
+        self.page_highlights = []
+        self.last_selection_quads = []
+        self.overlay_cache.clear()
+        self.overlay_sources.clear()
+    
+    def _invalidate_overlay(self, page_number: int):
+        """Drop cached overlays of a page at every zoom level"""
+        for key in [key for key in self.overlay_cache if key[0] == page_number]:
+            del self.overlay_cache[key]
+        self.overlay_sources.pop(page_number, None)
+    
+    def _pixmap_rect(self) -> QRect:
+        """Where QLabel draws the page pixmap inside the widget"""
+        pixmap = self.pixmap()
+        if pixmap is None or pixmap.isNull():
+            return QRect()
+        return QStyle.alignedRect(
+            self.layoutDirection(), self.alignment(), pixmap.size(), self.contentsRect()
+        )
+    
+    def _highlight_overlay(self, size) -> QPixmap:
+        """Get the transparent highlight layer for the current page and zoom"""
+        key = (self.page_number, self.zoom_factor)
+        overlay = self.overlay_cache.get(key)
+        if overlay is not None and overlay.size() == size:
+            self.overlay_cache.move_to_end(key)
+            return overlay
+        
+        overlay = QPixmap(size)
+        overlay.fill(Qt.GlobalColor.transparent)
+        
+        painter = QPainter(overlay)
+        pen = QPen(QColor(200, 200, 0), 1)
+        painter.setPen(pen)
+        painter.setBrush(self.highlight_color)
+        zoom = self.zoom_factor
+        for quads in self.page_highlights:
+            for x0, y0, x1, y1 in quads:
+                painter.drawRect(QRectF(x0 * zoom, y0 * zoom, (x1 - x0) * zoom, (y1 - y0) * zoom))
+        painter.end()
+        
+        self.overlay_cache[key] = overlay
+        self.overlay_sources[self.page_number] = self.page_highlights
+        while len(self.overlay_cache) > OVERLAY_CACHE_SIZE:
+            (evicted_page, _), _ = self.overlay_cache.popitem(last=False)
+            if not any(page == evicted_page for page, _ in self.overlay_cache):
+                self.overlay_sources.pop(evicted_page, None)
+        return overlay
+    
     def mousePressEvent(self, event: QMouseEvent):
         """Start text selection"""
         if event.button() == Qt.MouseButton.LeftButton:
@@ -107,16 +204,12 @@ class HighlightableLabel(QLabel):
         super().paintEvent(event)
         
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
-        # Draw existing highlights
-        for highlight in self.highlights:
-            painter.fillRect(highlight.rect, highlight.color)
-            
-            # Draw highlight border
-            pen = QPen(QColor(200, 200, 0), 2)
-            painter.setPen(pen)
-            painter.drawRect(highlight.rect)
+        # Composite the cached highlight layer over the page
+        if self.page_highlights:
+            pixmap_rect = self._pixmap_rect()
+            if not pixmap_rect.isEmpty():
+                painter.drawPixmap(pixmap_rect.topLeft(), self._highlight_overlay(pixmap_rect.size()))
         
         # Draw current selection
         if self.selecting and not self.current_selection.isEmpty():
@@ -129,45 +222,27 @@ class HighlightableLabel(QLabel):
     def _extract_text_from_selection(self, selection_rect: QRect) -> str:
         """Extract text from the selection rectangle using PDF text blocks"""
         if not self.text_blocks:
+            self.last_selection_quads = []
             return ""
         
-        selected_text = ""
-        
         # Convert selection rect to PDF coordinates
         pdf_rect = self._qt_rect_to_pdf_rect(selection_rect)
         
-        # Find intersecting text blocks
-        for block in self.text_blocks:
-            if self._rects_intersect(pdf_rect, block.get('bbox', [0, 0, 0, 0])):
-                # Check individual lines and characters
-                for line in block.get('lines', []):
-                    line_bbox = line.get('bbox', [0, 0, 0, 0])
-                    if self._rects_intersect(pdf_rect, line_bbox):
-                        # Add line text
-                        for span in line.get('spans', []):
-                            span_bbox = span.get('bbox', [0, 0, 0, 0])
-                            if self._rects_intersect(pdf_rect, span_bbox):
-                                selected_text += span.get('text', '') + " "
-        
-        return selected_text.strip()
+        # Keep the span geometry so the highlight can be stored with the note
+        selected_text, self.last_selection_quads = selection_quads(self.text_blocks, pdf_rect)
+        return selected_text
     
     def _qt_rect_to_pdf_rect(self, qt_rect: QRect) -> List[float]:
         """Convert Qt rectangle to PDF coordinates"""
-        # Adjust for zoom and coordinate system differences
-        x0 = qt_rect.left() / self.zoom_factor
-        y0 = qt_rect.top() / self.zoom_factor
-        x1 = qt_rect.right() / self.zoom_factor
-        y1 = qt_rect.bottom() / self.zoom_factor
+        # Selections are in widget space; the page starts where the pixmap is drawn
+        origin = self._pixmap_rect().topLeft()
+        x0 = (qt_rect.left() - origin.x()) / self.zoom_factor
+        y0 = (qt_rect.top() - origin.y()) / self.zoom_factor
+        x1 = (qt_rect.right() - origin.x()) / self.zoom_factor
+        y1 = (qt_rect.bottom() - origin.y()) / self.zoom_factor
         
         return [x0, y0, x1, y1]
     
-    def _rects_intersect(self, rect1: List[float], rect2: List[float]) -> bool:
-        """Check if two rectangles intersect"""
-        x0_1, y0_1, x1_1, y1_1 = rect1
-        x0_2, y0_2, x1_2, y1_2 = rect2
-        
-        return not (x1_1 < x0_2 or x1_2 < x0_1 or y1_1 < y0_2 or y1_2 < y0_1)
-    
     def _show_highlight_tooltip(self, position: QPoint, text: str):
         """Show tooltip for adding highlight"""
         # Emit signal for parent to handle
@@ -3,14 +3,21 @@ Note Manager - Obsidian-style note-taking for SprintReader
 Handles highlight-to-note functionality and topic organization
 """
 
+import io
 import os
 import json
 import uuid
 from datetime import datetime
-from typing import Dict, List, Optional, Set
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from pathlib import Path
 from dataclasses import dataclass, asdict
 from qt_compat import QObject, pyqtSignal
+from events.event_bus import event_bus, NOTE_SAVED, NOTE_DELETED
+from .vault_writer import VaultWriter
+from .vault_watcher import VaultWatcher
+from .vault_exporter import VaultExporter, write_topic_markdown, write_note_markdown
+from .vault_loader import list_note_files, load_note_files, parse_note_text
+from .frontmatter import dump_frontmatter
 
 @dataclass
 class Note:
@@ -28,12 +35,15 @@ class Note:
     linked_notes: List[str] = None
     x_position: float = 0.0
     y_position: float = 0.0
+    quads: List[List[float]] = None  # Highlight boxes [x0, y0, x1, y1] in PDF points
     
     def __post_init__(self):
         if self.tags is None:
             self.tags = []
         if self.linked_notes is None:
             self.linked_notes = []
+        if self.quads is None:
+            self.quads = []
         if not self.created_at:
             self.created_at = datetime.now().isoformat()
         if not self.updated_at:
@@ -63,15 +73,26 @@ class NoteManager(QObject):
     topic_created = pyqtSignal(str)  # topic_id
     notes_imported = pyqtSignal(int)  # count
     
-    def __init__(self, base_path: str = "vaults"):
+    def __init__(self, base_path: str = "vaults", watch: bool = True):
         super().__init__()
         self.base_path = Path(base_path)
         self.base_path.mkdir(exist_ok=True)
         
+        # Debounced, atomic writes happen off the GUI thread
+        self.writer = VaultWriter()
+        
         # In-memory storage for performance
         self.notes: Dict[str, Note] = {}
         self.topics: Dict[str, Topic] = {}
         
+        # File location indexes for incremental sync
+        self.note_paths: Dict[str, Path] = {}  # note_id -> file
+        self.path_index: Dict[Path, str] = {}  # file -> note_id
+        
+        # (document_id, page_number) -> note ids, for drawing a page's highlights
+        self.page_index: Dict[Tuple[int, int], Set[str]] = {}
+        self.note_pages: Dict[str, Tuple[int, int]] = {}
+        
         # Load existing data
         self._load_topics()
         self._load_notes()
@@ -79,6 +100,11 @@ class NoteManager(QObject):
         # Create default topic if none exist
         if not self.topics:
             self.create_topic("General", "Default topic for uncategorized notes")
+        
+        # Pick up edits made in external editors
+        self.watcher = VaultWatcher(self)
+        if watch:
+            self.watcher.start()
     
     def create_note_from_highlight(self, 
                                  document_id: int,
@@ -86,7 +112,8 @@ class NoteManager(QObject):
                                  highlighted_text: str,
                                  topic_name: str,
                                  user_notes: str = "",
-                                 position: tuple = (0.0, 0.0)) -> str:
+                                 position: tuple = (0.0, 0.0),
+                                 quads: List[List[float]] = None) -> str:
         """Create a note from highlighted PDF text"""
         
         # Get or create topic
@@ -105,7 +132,8 @@ class NoteManager(QObject):
             page_number=page_number,
             excerpt=highlighted_text,
             x_position=position[0],
-            y_position=position[1]
+            y_position=position[1],
+            quads=quads
         )
         
         # Save note
@@ -118,6 +146,7 @@ class NoteManager(QObject):
             self._save_topic(self.topics[topic_id])
         
         self.note_created.emit(note.id)
+        event_bus.publish(NOTE_SAVED, note_id=note.id)
         return note.id
     
     def create_topic(self, name: str, description: str = "") -> str:
@@ -164,6 +193,7 @@ class NoteManager(QObject):
         
         self._save_note(note)
         self.note_updated.emit(note_id)
+        event_bus.publish(NOTE_SAVED, note_id=note_id)
         return True
     
     def delete_note(self, note_id: str) -> bool:
@@ -179,14 +209,18 @@ class NoteManager(QObject):
             self._save_topic(self.topics[note.topic_id])
         
         # Delete file
-        note_path = self._get_note_path(note)
-        if note_path.exists():
-            note_path.unlink()
+        note_path = self.note_paths.pop(note_id, None) or self._get_note_path(note)
+        self.path_index.pop(note_path, None)
+        self.writer.delete(note_path)
         
         # Remove from memory
         del self.notes[note_id]
+        page_key = self.note_pages.pop(note_id, None)
+        if page_key:
+            self._unindex_page(note_id, page_key)
         
         self.note_deleted.emit(note_id)
+        event_bus.publish(NOTE_DELETED, note_id=note_id)
         return True
     
     def search_notes(self, query: str, topic_id: str = None) -> List[Note]:
@@ -220,6 +254,23 @@ class NoteManager(QObject):
         """Get all notes for a specific document"""
         return [note for note in self.notes.values() if note.document_id == document_id]
     
+    def get_notes_for_page(self, document_id: int, page_number: int) -> List[Note]:
+        """Get all notes anchored to a page of a document"""
+        note_ids = self.page_index.get((document_id, page_number), ())
+        return [self.notes[note_id] for note_id in note_ids if note_id in self.notes]
+    
+    def set_note_quads(self, note_id: str, quads: List[List[float]]) -> bool:
+        """Store highlight geometry recovered for a note"""
+        if note_id not in self.notes:
+            return False
+        
+        note = self.notes[note_id]
+        note.quads = quads
+        if quads:
+            note.x_position, note.y_position = quads[0][0], quads[0][1]
+        self._save_note(note)
+        return True
+    
     def get_linked_notes(self, note_id: str) -> List[Note]:
         """Get notes linked to this note"""
         if note_id not in self.notes:
@@ -253,63 +304,137 @@ class NoteManager(QObject):
         if topic_id not in self.topics:
             return ""
         
-        topic = self.topics[topic_id]
-        topic_notes = self.get_notes_by_topic(topic_id)
-        
-        markdown = f"# {topic.name}\n\n"
-        if topic.description:
-            markdown += f"{topic.description}\n\n"
-        
-        markdown += f"*Generated on {datetime.now().strftime('%Y-%m-%d %H:%M')}*\n\n"
-        markdown += f"**{len(topic_notes)} notes in this topic**\n\n---\n\n"
-        
-        for note in sorted(topic_notes, key=lambda n: n.created_at):
-            markdown += f"## {note.title}\n\n"
-            
-            if note.excerpt:
-                markdown += f"> {note.excerpt}\n\n"
-            
-            if note.content:
-                markdown += f"{note.content}\n\n"
-            
-            # Add metadata
-            markdown += f"*Page {note.page_number} • Created {note.created_at[:10]}*"
-            
-            if note.tags:
-                markdown += f" • Tags: {', '.join(f'#{tag}' for tag in note.tags)}"
-            
-            markdown += "\n\n---\n\n"
-        
-        return markdown
+        buffer = io.StringIO()
+        write_topic_markdown(buffer, self.topics[topic_id], self.get_notes_by_topic(topic_id))
+        return buffer.getvalue()
     
-    def export_all_notes(self, export_path: str) -> int:
+    def export_all_notes(self, export_path: str, incremental: bool = False,
+                         progress_callback: Callable[[int, int], None] = None) -> int:
         """Export all notes as markdown files"""
-        export_dir = Path(export_path)
-        export_dir.mkdir(exist_ok=True)
+        exporter = VaultExporter(self)
+        return exporter.export_to_directory(export_path, incremental, progress_callback)
+    
+    def export_all_notes_to_zip(self, zip_path: str,
+                                progress_callback: Callable[[int, int], None] = None) -> int:
+        """Export all notes into a single zip archive"""
+        exporter = VaultExporter(self)
+        return exporter.export_to_zip(zip_path, progress_callback)
+    
+    def flush(self) -> bool:
+        """Write all pending note and topic changes to disk"""
+        return self.writer.flush()
+    
+    def close(self):
+        """Flush pending writes and stop the background writer"""
+        self.watcher.stop()
+        self.writer.close()
+    
+    def reload_note_file(self, note_path: Path) -> Optional[str]:
+        """Re-parse a single note file changed outside SprintReader"""
+        try:
+            content = note_path.read_text(encoding='utf-8')
+            note = self._parse_note_from_markdown(content, note_path.stem)
+        except Exception as e:
+            print(f"Error reloading note {note_path}: {e}")
+            return None
+        
+        if not note:
+            return None
+        
+        # The file now holds a different note than before
+        previous_id = self.path_index.get(note_path)
+        if previous_id and previous_id != note.id:
+            self._forget_note(previous_id)
+            self.note_deleted.emit(previous_id)
+        
+        existing = self.notes.get(note.id)
+        if existing and existing.topic_id != note.topic_id:
+            self._adjust_topic_count(existing.topic_id, -1)
+            self._adjust_topic_count(note.topic_id, 1)
+        elif not existing:
+            self._adjust_topic_count(note.topic_id, 1)
+        
+        self._index_note(note, note_path)
+        
+        if existing:
+            self.note_updated.emit(note.id)
+        else:
+            self.note_created.emit(note.id)
+        return note.id
+    
+    def remove_note_file(self, note_path: Path) -> Optional[str]:
+        """Drop the note stored in a file deleted outside SprintReader"""
+        note_id = self.path_index.get(note_path)
+        if not note_id or self.note_paths.get(note_id) != note_path:
+            return None
+        
+        self._forget_note(note_id)
+        self.note_deleted.emit(note_id)
+        return note_id
+    
+    def reload_topic_file(self, metadata_path: Path) -> Optional[str]:
+        """Re-read topic metadata changed outside SprintReader"""
+        try:
+            metadata = json.loads(metadata_path.read_text(encoding='utf-8'))
+            topic = Topic(**metadata)
+        except Exception as e:
+            print(f"Error reloading topic {metadata_path.parent.name}: {e}")
+            return None
+        
+        existing = self.topics.get(topic.id)
+        if existing:
+            topic.notes_count = existing.notes_count
+            self.topics[topic.id] = topic
+        else:
+            self.topics[topic.id] = topic
+            self.topic_created.emit(topic.id)
+        return topic.id
+    
+    def _index_note(self, note: Note, note_path: Path):
+        """Store a note in memory and record where it lives on disk"""
+        self.notes[note.id] = note
         
-        exported_count = 0
+        old_path = self.note_paths.get(note.id)
+        if old_path and old_path != note_path:
+            self.path_index.pop(old_path, None)
         
-        for topic_id, topic in self.topics.items():
-            # Create topic directory
-            topic_dir = export_dir / self._sanitize_filename(topic.name)
-            topic_dir.mkdir(exist_ok=True)
-            
-            # Export topic summary
-            topic_markdown = self.export_topic_as_markdown(topic_id)
-            summary_path = topic_dir / "README.md"
-            summary_path.write_text(topic_markdown, encoding='utf-8')
-            exported_count += 1
-            
-            # Export individual notes
-            topic_notes = self.get_notes_by_topic(topic_id)
-            for note in topic_notes:
-                note_markdown = self._note_to_markdown(note)
-                note_filename = f"{self._sanitize_filename(note.title)}.md"
-                note_path = topic_dir / note_filename
-                note_path.write_text(note_markdown, encoding='utf-8')
-                exported_count += 1
+        self.note_paths[note.id] = note_path
+        self.path_index[note_path] = note.id
         
-        return exported_count
+        page_key = (note.document_id, note.page_number)
+        old_key = self.note_pages.get(note.id)
+        if old_key != page_key:
+            if old_key:
+                self._unindex_page(note.id, old_key)
+            self.page_index.setdefault(page_key, set()).add(note.id)
+            self.note_pages[note.id] = page_key
+    
+    def _forget_note(self, note_id: str):
+        """Remove a note from memory and the path indexes without touching disk"""
+        note = self.notes.pop(note_id, None)
+        if note:
+            self._adjust_topic_count(note.topic_id, -1)
+        
+        note_path = self.note_paths.pop(note_id, None)
+        if note_path:
+            self.path_index.pop(note_path, None)
+        
+        page_key = self.note_pages.pop(note_id, None)
+        if page_key:
+            self._unindex_page(note_id, page_key)
+    
+    def _unindex_page(self, note_id: str, page_key: Tuple[int, int]):
+        """Remove a note from the per-page index"""
+        note_ids = self.page_index.get(page_key)
+        if note_ids:
+            note_ids.discard(note_id)
+            if not note_ids:
+                del self.page_index[page_key]
+    
+    def _adjust_topic_count(self, topic_id: str, delta: int):
+        """Update in-memory note count of a topic"""
+        if topic_id in self.topics:
+            self.topics[topic_id].notes_count = max(0, self.topics[topic_id].notes_count + delta)
     
     def _generate_note_title(self, excerpt: str) -> str:
         """Generate a note title from highlighted text"""
@@ -346,27 +471,9 @@ class NoteManager(QObject):
     
     def _note_to_markdown(self, note: Note) -> str:
         """Convert note to markdown format"""
-        markdown = f"# {note.title}\n\n"
-        
-        if note.excerpt:
-            markdown += f"## Excerpt\n\n> {note.excerpt}\n\n"
-        
-        if note.content:
-            markdown += f"## Notes\n\n{note.content}\n\n"
-        
-        # Add metadata
-        markdown += "## Metadata\n\n"
-        markdown += f"- **Page**: {note.page_number}\n"
-        markdown += f"- **Created**: {note.created_at[:10]}\n"
-        markdown += f"- **Updated**: {note.updated_at[:10]}\n"
-        
-        if note.tags:
-            markdown += f"- **Tags**: {', '.join(f'#{tag}' for tag in note.tags)}\n"
-        
-        if note.linked_notes:
-            markdown += f"- **Links**: {len(note.linked_notes)} connected notes\n"
-        
-        return markdown
+        buffer = io.StringIO()
+        write_note_markdown(buffer, note)
+        return buffer.getvalue()
     
     def _create_topic_directory(self, topic: Topic):
         """Create directory structure for topic"""
@@ -383,7 +490,7 @@ class NoteManager(QObject):
         }
         
         metadata_path = topic_dir / '.topic.json'
-        metadata_path.write_text(json.dumps(metadata, indent=2), encoding='utf-8')
+        self.writer.write_topic(metadata_path, json.dumps(metadata, indent=2))
     
     def _get_note_path(self, note: Note) -> Path:
         """Get file path for note"""
@@ -399,30 +506,39 @@ class NoteManager(QObject):
     def _save_note(self, note: Note):
         """Save note to markdown file"""
         note_path = self._get_note_path(note)
-        note_path.parent.mkdir(exist_ok=True)
+        
+        # Title or topic changes move the file
+        old_path = self.note_paths.get(note.id)
+        if old_path and old_path != note_path:
+            self.writer.delete(old_path)
+        self._index_note(note, note_path)
         
         # Add metadata header
-        markdown = f"---\n"
-        markdown += f"id: {note.id}\n"
-        markdown += f"topic_id: {note.topic_id}\n"
-        markdown += f"document_id: {note.document_id}\n"
-        markdown += f"page_number: {note.page_number}\n"
-        markdown += f"created_at: {note.created_at}\n"
-        markdown += f"updated_at: {note.updated_at}\n"
+        metadata = {
+            'id': note.id,
+            'topic_id': note.topic_id,
+            'document_id': note.document_id,
+            'page_number': note.page_number,
+            'created_at': note.created_at,
+            'updated_at': note.updated_at,
+        }
         if note.tags:
-            markdown += f"tags: [{', '.join(note.tags)}]\n"
-        markdown += f"---\n\n"
+            metadata['tags'] = note.tags
+        if note.quads:
+            metadata['quads'] = note.quads
+        markdown = dump_frontmatter(metadata) + "\n"
         
         # Add content
         markdown += f"# {note.title}\n\n"
         
         if note.excerpt:
-            markdown += f"## Excerpt\n\n> {note.excerpt}\n\n"
+            quoted = '\n'.join(f"> {line}".rstrip() for line in note.excerpt.split('\n'))
+            markdown += f"## Excerpt\n\n{quoted}\n\n"
         
         if note.content:
             markdown += f"## Notes\n\n{note.content}\n"
         
-        note_path.write_text(markdown, encoding='utf-8')
+        self.writer.write_note(note_path, markdown)
     
     def _save_topic(self, topic: Topic):
         """Save topic metadata"""
@@ -456,87 +572,17 @@ class NoteManager(QObject):
                 self._save_topic(topic)
     
     def _load_notes(self):
-        """Load notes from markdown files"""
-        for topic_dir in self.base_path.iterdir():
-            if not topic_dir.is_dir():
-                continue
-            
-            for note_file in topic_dir.glob("*.md"):
-                if note_file.name.startswith('.'):
-                    continue
-                
-                try:
-                    content = note_file.read_text(encoding='utf-8')
-                    note = self._parse_note_from_markdown(content, note_file.stem)
-                    if note:
-                        self.notes[note.id] = note
-                except Exception as e:
-                    print(f"Error loading note {note_file}: {e}")
+        """Load notes from markdown files, parsing large vaults in worker processes"""
+        for note_file, fields, error in load_note_files(list_note_files(self.base_path)):
+            if error:
+                print(f"Error loading note {note_file}: {error}")
+            elif fields:
+                self._index_note(Note(**fields), note_file)
     
     def _parse_note_from_markdown(self, content: str, filename: str) -> Optional[Note]:
         """Parse note from markdown content"""
-        lines = content.split('\n')
-        
-        # Parse frontmatter
-        if lines[0] == '---':
-            frontmatter_end = 1
-            while frontmatter_end < len(lines) and lines[frontmatter_end] != '---':
-                frontmatter_end += 1
-            
-            if frontmatter_end < len(lines):
-                frontmatter = {}
-                for line in lines[1:frontmatter_end]:
-                    if ':' in line:
-                        key, value = line.split(':', 1)
-                        frontmatter[key.strip()] = value.strip()
-                
-                # Extract content after frontmatter
-                content_lines = lines[frontmatter_end + 1:]
-                content_text = '\n'.join(content_lines)
-                
-                # Parse content sections
-                title, excerpt, notes = self._parse_note_content(content_text)
-                
-                return Note(
-                    id=frontmatter.get('id', str(uuid.uuid4())),
-                    title=title or filename,
-                    content=notes,
-                    topic_id=frontmatter.get('topic_id', ''),
-                    document_id=int(frontmatter.get('document_id', 0)),
-                    page_number=int(frontmatter.get('page_number', 1)),
-                    excerpt=excerpt,
-                    created_at=frontmatter.get('created_at', ''),
-                    updated_at=frontmatter.get('updated_at', ''),
-                    tags=eval(frontmatter.get('tags', '[]')) if frontmatter.get('tags') else []
-                )
-        
-        return None
-    
-    def _parse_note_content(self, content: str) -> tuple:
-        """Parse title, excerpt, and notes from content"""
-        lines = content.split('\n')
-        title = ""
-        excerpt = ""
-        notes = ""
-        
-        current_section = None
-        
-        for line in lines:
-            line = line.strip()
-            if line.startswith('# '):
-                title = line[2:]
-            elif line == '## Excerpt':
-                current_section = 'excerpt'
-            elif line == '## Notes':
-                current_section = 'notes'
-            elif line.startswith('## '):
-                current_section = None
-            elif current_section == 'excerpt' and line.startswith('> '):
-                excerpt += line[2:] + ' '
-            elif current_section == 'notes' and line:
-                notes += line + '\n'
-        
-        return title.strip(), excerpt.strip(), notes.strip()
+        fields = parse_note_text(content, filename)
+        return Note(**fields) if fields else None
     
     def _sanitize_filename(self, filename: str) -> str:
         """Sanitize filename for filesystem"""
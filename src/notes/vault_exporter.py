@@ -0,0 +1,323 @@
+"""
+Vault Exporter - Streaming, parallel export of notes to markdown folders or zip archives
+"""
+
+import io
+import json
+import copy
+import hashlib
+import zipfile
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, TextIO, Tuple
+from qt_compat import QThread, pyqtSignal
+
+MANIFEST_FILE = '.sprintreader-export.json'
+
+ProgressCallback = Callable[[int, int], None]  # done, total
+
+def write_topic_markdown(f: TextIO, topic, notes: List, generated_at: datetime = None):
+    """Stream a topic summary with all its notes to a file handle"""
+    generated_at = generated_at or datetime.now()
+
+    f.write(f"# {topic.name}\n\n")
+    if topic.description:
+        f.write(f"{topic.description}\n\n")
+
+    f.write(f"*Generated on {generated_at.strftime('%Y-%m-%d %H:%M')}*\n\n")
+    f.write(f"**{len(notes)} notes in this topic**\n\n---\n\n")
+
+    for note in sorted(notes, key=lambda n: n.created_at):
+        f.write(f"## {note.title}\n\n")
+
+        if note.excerpt:
+            f.write(f"> {note.excerpt}\n\n")
+
+        if note.content:
+            f.write(f"{note.content}\n\n")
+
+        # Add metadata
+        f.write(f"*Page {note.page_number} • Created {note.created_at[:10]}*")
+
+        if note.tags:
+            f.write(f" • Tags: {', '.join(f'#{tag}' for tag in note.tags)}")
+
+        f.write("\n\n---\n\n")
+
+def write_note_markdown(f: TextIO, note):
+    """Stream a single note as a standalone markdown document"""
+    f.write(f"# {note.title}\n\n")
+
+    if note.excerpt:
+        f.write(f"## Excerpt\n\n> {note.excerpt}\n\n")
+
+    if note.content:
+        f.write(f"## Notes\n\n{note.content}\n\n")
+
+    # Add metadata
+    f.write("## Metadata\n\n")
+    f.write(f"- **Page**: {note.page_number}\n")
+    f.write(f"- **Created**: {note.created_at[:10]}\n")
+    f.write(f"- **Updated**: {note.updated_at[:10]}\n")
+
+    if note.tags:
+        f.write(f"- **Tags**: {', '.join(f'#{tag}' for tag in note.tags)}\n")
+
+    if note.linked_notes:
+        f.write(f"- **Links**: {len(note.linked_notes)} connected notes\n")
+
+def write_document_notes_markdown(f: TextIO, document_title: str, notes: List,
+                                  topic_names: Dict[str, str], estimation: Dict = None) -> int:
+    """Stream all notes of one document grouped by topic, returns notes written"""
+    f.write(f"# Notes for {document_title}\n\n")
+    f.write(f"*Exported on {datetime.now().strftime('%Y-%m-%d %H:%M')}*\n\n")
+
+    # Add time estimation summary
+    if estimation:
+        f.write("## Reading Progress & Time Estimation\n\n")
+        f.write(f"- **Current Page**: {estimation.get('current_page', 0)} / {estimation.get('total_pages', 0)}\n")
+        f.write(f"- **Progress**: {estimation.get('progress_percent', 0):.1f}%\n")
+        f.write(f"- **Estimated time to finish**: {estimation.get('estimated_time_remaining_formatted', 'Unknown')}\n")
+        f.write(f"- **Reading speed**: {estimation.get('avg_time_per_page_seconds', 0):.1f} seconds per page\n\n")
+
+    # Group notes by topic
+    notes_by_topic = defaultdict(list)
+    for note in notes:
+        notes_by_topic[topic_names.get(note.topic_id, 'Unknown')].append(note)
+
+    exported_count = 0
+    for topic_name, topic_notes in notes_by_topic.items():
+        f.write(f"## {topic_name}\n\n")
+        for note in sorted(topic_notes, key=lambda n: n.page_number):
+            f.write(f"### {note.title}\n\n")
+            if note.excerpt:
+                f.write(f"**Highlight:** _{note.excerpt}_\n\n")
+            if note.content:
+                f.write(f"{note.content}\n\n")
+            f.write(f"*Page {note.page_number}*\n\n---\n\n")
+            exported_count += 1
+
+    return exported_count
+
+class VaultExporter:
+    """Exports a vault snapshot with a worker pool and progress reporting"""
+
+    def __init__(self, note_manager, max_workers: int = 4):
+        self.note_manager = note_manager
+        self.max_workers = max_workers
+        self._progress_lock = threading.Lock()
+
+    def export_to_directory(self, export_path: str, incremental: bool = False,
+                            progress_callback: Optional[ProgressCallback] = None) -> int:
+        """Export topics as folders of markdown files, returns files written"""
+        export_dir = Path(export_path)
+        export_dir.mkdir(parents=True, exist_ok=True)
+
+        snapshot = self._snapshot()
+        manifest_path = export_dir / MANIFEST_FILE
+        old_manifest = self._read_manifest(manifest_path) if incremental else {}
+
+        progress = self._progress_tracker(snapshot, progress_callback)
+        new_manifest = {'topics': {}, 'notes': {}}
+        written = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(self._export_topic_directory, export_dir, topic, notes, old_manifest, progress)
+                for topic, notes in snapshot
+            ]
+            for future in as_completed(futures):
+                count, topic_entry, note_entries = future.result()
+                written += count
+                new_manifest['topics'].update(topic_entry)
+                new_manifest['notes'].update(note_entries)
+
+        # Remove files of notes that were deleted, renamed or moved, unless another note now uses the path
+        if incremental:
+            live_paths = {entry['path'] for entry in new_manifest['notes'].values()}
+            for entry in old_manifest.get('notes', {}).values():
+                if entry['path'] not in live_paths:
+                    stale = export_dir / entry['path']
+                    if stale.exists():
+                        stale.unlink()
+
+        manifest_path.write_text(json.dumps(new_manifest, indent=2), encoding='utf-8')
+        return written
+
+    def export_to_zip(self, zip_path: str, progress_callback: Optional[ProgressCallback] = None) -> int:
+        """Export the whole vault into a single zip archive, returns files written"""
+        snapshot = self._snapshot()
+        progress = self._progress_tracker(snapshot, progress_callback)
+        written = 0
+
+        with zipfile.ZipFile(zip_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [
+                    executor.submit(self._render_topic_entries, topic, notes)
+                    for topic, notes in snapshot
+                ]
+                # Only the calling thread touches the archive
+                for future in as_completed(futures):
+                    for arcname, data in future.result():
+                        archive.writestr(arcname, data)
+                        written += 1
+                        progress(1)
+
+        return written
+
+    def _export_topic_directory(self, export_dir: Path, topic, notes: List, old_manifest: Dict,
+                                progress: Callable[[int], None]) -> Tuple[int, Dict, Dict]:
+        """Write one topic folder, skipping notes unchanged since the last export"""
+        topic_dir_name = self.note_manager._sanitize_filename(topic.name)
+        topic_dir = export_dir / topic_dir_name
+        topic_dir.mkdir(exist_ok=True)
+
+        written = 0
+        note_entries = {}
+        old_notes = old_manifest.get('notes', {})
+
+        for note in notes:
+            relative_path = f"{topic_dir_name}/{self.note_manager._sanitize_filename(note.title)}.md"
+            previous = old_notes.get(note.id)
+
+            unchanged = (
+                previous is not None and
+                previous.get('updated_at') == note.updated_at and
+                previous.get('path') == relative_path and
+                (export_dir / relative_path).exists()
+            )
+
+            if not unchanged:
+                # A file left behind by a title or topic change is removed after all topics are written
+                with open(export_dir / relative_path, 'w', encoding='utf-8') as f:
+                    write_note_markdown(f, note)
+                written += 1
+
+            note_entries[note.id] = {'path': relative_path, 'updated_at': note.updated_at}
+            progress(1)
+
+        # Summary only needs rewriting when something in the topic changed
+        signature = self._topic_signature(topic, notes)
+        summary_path = topic_dir / "README.md"
+        if old_manifest.get('topics', {}).get(topic.id) != signature or not summary_path.exists():
+            with open(summary_path, 'w', encoding='utf-8') as f:
+                write_topic_markdown(f, topic, notes)
+            written += 1
+        progress(1)
+
+        return written, {topic.id: signature}, note_entries
+
+    def _render_topic_entries(self, topic, notes: List) -> List[Tuple[str, bytes]]:
+        """Render a topic's archive entries as encoded bytes"""
+        topic_dir_name = self.note_manager._sanitize_filename(topic.name)
+        entries = []
+
+        buffer = io.StringIO()
+        write_topic_markdown(buffer, topic, notes)
+        entries.append((f"{topic_dir_name}/README.md", buffer.getvalue().encode('utf-8')))
+
+        for note in notes:
+            buffer = io.StringIO()
+            write_note_markdown(buffer, note)
+            note_filename = f"{self.note_manager._sanitize_filename(note.title)}.md"
+            entries.append((f"{topic_dir_name}/{note_filename}", buffer.getvalue().encode('utf-8')))
+
+        return entries
+
+    def _snapshot(self) -> List[Tuple[object, List]]:
+        """Copy topics and their notes so workers never see concurrent edits"""
+        notes_by_topic = defaultdict(list)
+        for note in list(self.note_manager.notes.values()):
+            notes_by_topic[note.topic_id].append(copy.copy(note))
+
+        return [
+            (copy.copy(topic), notes_by_topic.get(topic_id, []))
+            for topic_id, topic in list(self.note_manager.topics.items())
+        ]
+
+    def _progress_tracker(self, snapshot: List, progress_callback: Optional[ProgressCallback]) -> Callable[[int], None]:
+        """Build a thread-safe progress counter over all files of a snapshot"""
+        total = sum(len(notes) + 1 for _, notes in snapshot)
+        state = {'done': 0}
+
+        def advance(count: int):
+            with self._progress_lock:
+                state['done'] += count
+                done = state['done']
+            if progress_callback:
+                progress_callback(done, total)
+
+        return advance
+
+    def _topic_signature(self, topic, notes: List) -> str:
+        """Fingerprint of everything that goes into a topic summary"""
+        digest = hashlib.sha1()
+        digest.update(f"{topic.name}\0{topic.description}".encode('utf-8'))
+        for note in sorted(notes, key=lambda n: n.id):
+            digest.update(f"\0{note.id}\0{note.updated_at}\0{note.title}".encode('utf-8'))
+        return digest.hexdigest()
+
+    def _read_manifest(self, manifest_path: Path) -> Dict:
+        """Load the manifest of a previous export"""
+        if not manifest_path.exists():
+            return {}
+        try:
+            return json.loads(manifest_path.read_text(encoding='utf-8'))
+        except Exception as e:
+            print(f"Error reading export manifest, doing a full export: {e}")
+            return {}
+
+class DocumentNotesExportWorker(QThread):
+    """Writes one document's notes to a markdown file off the GUI thread"""
+
+    export_finished = pyqtSignal(int, str)  # exported_count, export_path
+    export_failed = pyqtSignal(str)  # error message
+
+    def __init__(self, export_path: str, document_title: str, notes: List,
+                 topic_names: Dict[str, str], estimation: Dict = None, parent=None):
+        super().__init__(parent)
+        self.export_path = export_path
+        self.document_title = document_title
+        self.notes = [copy.copy(note) for note in notes]
+        self.topic_names = dict(topic_names)
+        self.estimation = dict(estimation) if estimation else {}
+
+    def run(self):
+        """Stream the export to disk"""
+        try:
+            with open(self.export_path, 'w', encoding='utf-8') as f:
+                count = write_document_notes_markdown(
+                    f, self.document_title, self.notes, self.topic_names, self.estimation
+                )
+            self.export_finished.emit(count, self.export_path)
+        except Exception as e:
+            self.export_failed.emit(str(e))
+
+class VaultExportWorker(QThread):
+    """Exports the whole vault on a worker thread with progress signals"""
+
+    progress = pyqtSignal(int, int)  # done, total
+    export_finished = pyqtSignal(int, str)  # files_written, export_path
+    export_failed = pyqtSignal(str)  # error message
+
+    def __init__(self, note_manager, export_path: str, incremental: bool = True, parent=None):
+        super().__init__(parent)
+        self.exporter = VaultExporter(note_manager)
+        self.export_path = export_path
+        self.incremental = incremental
+
+    def run(self):
+        """Export to a zip archive or an (incrementally updated) folder"""
+        try:
+            if self.export_path.lower().endswith('.zip'):
+                count = self.exporter.export_to_zip(self.export_path, self.progress.emit)
+            else:
+                count = self.exporter.export_to_directory(
+                    self.export_path, self.incremental, self.progress.emit
+                )
+            self.export_finished.emit(count, self.export_path)
+        except Exception as e:
+            self.export_failed.emit(str(e))
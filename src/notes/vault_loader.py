@@ -0,0 +1,130 @@
+"""
+Vault Loader - Cold-start parsing of note files, in parallel for large vaults
+Works on plain dicts so batches can be parsed in worker processes
+"""
+
+import os
+import uuid
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from .frontmatter import FrontmatterError, split_frontmatter
+
+# Below this many files the process pool costs more than it saves
+PARALLEL_THRESHOLD = 2000
+BATCH_SIZE = 500
+
+NoteFields = Dict[str, Any]
+LoadResult = Tuple[Path, Optional[NoteFields], Optional[str]]  # path, fields, error
+
+def parse_note_text(text: str, filename: str) -> Optional[NoteFields]:
+    """Parse a note file into Note constructor arguments, None if it has no frontmatter"""
+    try:
+        frontmatter, body = split_frontmatter(text)
+    except FrontmatterError:
+        if text.startswith('---'):
+            raise
+        return None
+
+    title, excerpt, notes = parse_note_body(body)
+    tags = frontmatter.get('tags') or []
+    if not isinstance(tags, list):
+        raise FrontmatterError("tags must be a list")
+    quads = _parse_quads(frontmatter.get('quads') or [])
+
+    fields = {
+        'id': frontmatter.get('id') or str(uuid.uuid4()),
+        'title': title or filename,
+        'content': notes,
+        'topic_id': frontmatter.get('topic_id', ''),
+        'document_id': int(frontmatter.get('document_id', 0)),
+        'page_number': int(frontmatter.get('page_number', 1)),
+        'excerpt': excerpt,
+        'created_at': frontmatter.get('created_at', ''),
+        'updated_at': frontmatter.get('updated_at', ''),
+        'tags': [str(tag) for tag in tags],
+        'quads': quads,
+    }
+    if quads:
+        fields['x_position'], fields['y_position'] = quads[0][0], quads[0][1]
+    return fields
+
+def _parse_quads(quads: Any) -> List[List[float]]:
+    """Validate stored highlight boxes"""
+    if not isinstance(quads, list):
+        raise FrontmatterError("quads must be a list")
+    try:
+        parsed = [[float(value) for value in quad] for quad in quads]
+    except (TypeError, ValueError):
+        raise FrontmatterError("quads must be lists of numbers") from None
+    if any(len(quad) != 4 for quad in parsed):
+        raise FrontmatterError("each quad needs four coordinates")
+    return parsed
+
+def parse_note_body(body: str) -> Tuple[str, str, str]:
+    """Parse title, excerpt and notes from the markdown body"""
+    title = ""
+    excerpt_lines = []
+    section = None
+    lines = body.split('\n')
+
+    for index, line in enumerate(lines):
+        stripped = line.strip()
+        if section is None and not title and stripped.startswith('# '):
+            title = stripped[2:]
+        elif stripped == '## Excerpt':
+            section = 'excerpt'
+        elif stripped == '## Notes':
+            # Notes are the last section and kept verbatim
+            return title.strip(), '\n'.join(excerpt_lines).strip(), '\n'.join(lines[index + 1:]).strip()
+        elif stripped.startswith('## '):
+            section = None
+        elif section == 'excerpt' and stripped.startswith('>'):
+            excerpt_lines.append(stripped[2:] if stripped.startswith('> ') else stripped[1:])
+
+    return title.strip(), '\n'.join(excerpt_lines).strip(), ""
+
+def list_note_files(base_path: Path) -> List[Path]:
+    """List every note file in the vault's topic directories"""
+    paths = []
+    with os.scandir(base_path) as topics:
+        for topic in topics:
+            if not topic.is_dir() or topic.name.startswith('.'):
+                continue
+            with os.scandir(topic.path) as entries:
+                paths.extend(
+                    Path(entry.path) for entry in entries
+                    if entry.name.endswith('.md') and not entry.name.startswith('.') and entry.is_file()
+                )
+    return paths
+
+def load_note_files(paths: List[Path], max_workers: Optional[int] = None,
+                    batch_size: int = BATCH_SIZE) -> Iterator[LoadResult]:
+    """Read and parse note files, fanning out to worker processes for large vaults"""
+    workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+
+    if workers <= 1 or len(paths) < PARALLEL_THRESHOLD:
+        yield from _load_batch(paths)
+        return
+
+    batches = [paths[i:i + batch_size] for i in range(0, len(paths), batch_size)]
+
+    # Spawned workers never inherit GUI or writer threads from the parent
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=min(workers, len(batches)), mp_context=context) as executor:
+        for results in executor.map(_load_batch, batches):
+            yield from results
+
+def _load_batch(paths: List[Path]) -> List[LoadResult]:
+    """Load one batch of note files"""
+    results = []
+    for path in paths:
+        try:
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+            stem = os.path.splitext(os.path.basename(path))[0]
+            results.append((path, parse_note_text(text, stem), None))
+        except Exception as e:
+            results.append((path, None, str(e)))
+    return results
@@ -0,0 +1,219 @@
+"""
+Vault Watcher - Incremental sync of vault edits made outside SprintReader
+Combines directory notifications with an mtime index so only touched files are re-parsed
+"""
+
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+from qt_compat import QObject, QThread, QTimer, QFileSystemWatcher, pyqtSignal
+
+TOPIC_METADATA_FILE = '.topic.json'
+
+DirectoryIndex = Dict[Path, Tuple[int, int]]  # path -> (mtime_ns, size)
+
+def scan_directory(topic_dir: Path) -> DirectoryIndex:
+    """Stat note files and topic metadata in a directory without reading them"""
+    index = {}
+    try:
+        with os.scandir(topic_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                is_note = name.endswith('.md') and not name.startswith('.')
+                if not (is_note or name == TOPIC_METADATA_FILE) or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                index[Path(entry.path)] = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        pass
+    return index
+
+class DirectoryScanWorker(QThread):
+    """Stats every tracked directory off the GUI thread for the periodic poll"""
+
+    scanned = pyqtSignal(object)  # {topic_dir: DirectoryIndex}
+
+    def __init__(self, topic_dirs: List[Path], parent=None):
+        super().__init__(parent)
+        self.topic_dirs = topic_dirs
+
+    def run(self):
+        self.scanned.emit({topic_dir: scan_directory(topic_dir) for topic_dir in self.topic_dirs})
+
+class VaultWatcher(QObject):
+    """Watches the vault directory tree and feeds external changes to a NoteManager"""
+
+    # Signals
+    vault_synced = pyqtSignal(int)  # number of files re-parsed or removed
+
+    def __init__(self, note_manager, debounce_ms: int = 300, poll_interval_ms: int = 5000):
+        super().__init__(note_manager)
+        self.note_manager = note_manager
+        self.base_path = Path(note_manager.base_path)
+
+        # topic_dir -> {path: (mtime_ns, size)} for every tracked file
+        self.dir_index: Dict[Path, DirectoryIndex] = {}
+        self.dirty_dirs: Set[Path] = set()
+
+        # Poll scans run on a worker; directories synced meanwhile ignore its older snapshot
+        self.scan_worker: Optional[DirectoryScanWorker] = None
+        self.synced_during_scan: Set[Path] = set()
+
+        self.fs_watcher = QFileSystemWatcher(self)
+        self.fs_watcher.directoryChanged.connect(self._on_directory_changed)
+
+        # Bursts of events (e.g. git checkout, editor save dance) collapse into one sync
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(debounce_ms)
+        self.debounce_timer.timeout.connect(self._sync)
+
+        # In-place writes do not touch the directory, so stat the index periodically
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(poll_interval_ms)
+        self.poll_timer.timeout.connect(self._poll)
+
+    def start(self):
+        """Snapshot the vault and begin watching it"""
+        if not self.base_path.exists():
+            return
+
+        self.fs_watcher.addPath(str(self.base_path))
+        for topic_dir in self._list_topic_dirs():
+            self._track_directory(topic_dir)
+
+        self.poll_timer.start()
+
+    def stop(self):
+        """Stop watching the vault"""
+        self.poll_timer.stop()
+        self.debounce_timer.stop()
+
+        if self.scan_worker is not None:
+            self.scan_worker.scanned.disconnect(self._on_poll_scanned)
+            self.scan_worker.wait()
+            self.scan_worker = None
+
+        paths = self.fs_watcher.directories()
+        if paths:
+            self.fs_watcher.removePaths(paths)
+        self.dirty_dirs.clear()
+
+    def _on_directory_changed(self, path: str):
+        """Queue a directory for rescanning"""
+        self.dirty_dirs.add(Path(path))
+        self.debounce_timer.start()
+
+    def _poll(self):
+        """Rescan every tracked directory for in-place modifications, off the GUI thread"""
+        if self.scan_worker is not None or not self.dir_index:
+            return  # The previous poll is still scanning
+
+        self.synced_during_scan = set()
+        self.scan_worker = DirectoryScanWorker(list(self.dir_index.keys()), self)
+        self.scan_worker.scanned.connect(self._on_poll_scanned)
+        self.scan_worker.finished.connect(self._on_scan_finished)
+        self.scan_worker.start()
+
+    def _on_poll_scanned(self, snapshots: Dict[Path, DirectoryIndex]):
+        """Apply a poll's snapshots, except for directories synced while it ran"""
+        for topic_dir in self.synced_during_scan:
+            snapshots.pop(topic_dir, None)
+        self._sync(snapshots)
+
+    def _on_scan_finished(self):
+        worker = self.sender()
+        if worker is self.scan_worker:
+            self.scan_worker = None
+        worker.deleteLater()
+
+    def _sync(self, snapshots: Optional[Dict[Path, DirectoryIndex]] = None):
+        """Apply changes in all dirty (or freshly polled) directories to the note manager"""
+        snapshots = snapshots or {}
+        dirty = self.dirty_dirs | set(snapshots)
+        self.dirty_dirs = set()
+
+        if self.base_path in dirty:
+            dirty.discard(self.base_path)
+            dirty.update(self._sync_topic_dirs())
+
+        changed: List[Path] = []
+        removed: List[Path] = []
+
+        for topic_dir in dirty:
+            if topic_dir not in self.dir_index:
+                continue
+
+            previous = self.dir_index[topic_dir]
+            current = snapshots[topic_dir] if topic_dir in snapshots else scan_directory(topic_dir)
+            if self.scan_worker is not None:
+                self.synced_during_scan.add(topic_dir)
+
+            for path, signature in current.items():
+                if previous.get(path) == signature:
+                    continue
+                if self.note_manager.writer.is_own_write(path, *signature):
+                    continue
+                changed.append(path)
+
+            removed.extend(path for path in previous if path not in current)
+
+            if topic_dir.is_dir():
+                self.dir_index[topic_dir] = current
+            else:
+                del self.dir_index[topic_dir]
+
+        if not changed and not removed:
+            return
+
+        synced = 0
+
+        # Topic metadata first so re-parsed notes find their topic
+        changed.sort(key=lambda p: p.name != TOPIC_METADATA_FILE)
+        for path in changed:
+            if path.name == TOPIC_METADATA_FILE:
+                if self.note_manager.reload_topic_file(path):
+                    synced += 1
+            elif self.note_manager.reload_note_file(path):
+                synced += 1
+
+        # Removals last: a rename shows up as add + remove of the same note id
+        for path in removed:
+            if path.suffix == '.md' and self.note_manager.remove_note_file(path):
+                synced += 1
+
+        if synced:
+            print(f"🔄 Vault synced: {synced} external change(s)")
+            self.vault_synced.emit(synced)
+
+    def _sync_topic_dirs(self) -> Set[Path]:
+        """Track added topic directories and drop removed ones"""
+        current = set(self._list_topic_dirs())
+        known = set(self.dir_index.keys())
+
+        for topic_dir in current - known:
+            self.fs_watcher.addPath(str(topic_dir))
+            self.dir_index[topic_dir] = {}
+
+        # Removed directories stay indexed until rescanned as empty, so their notes get removed
+        for topic_dir in known - current:
+            if str(topic_dir) in self.fs_watcher.directories():
+                self.fs_watcher.removePath(str(topic_dir))
+
+        return current ^ known
+
+    def _track_directory(self, topic_dir: Path):
+        """Start watching a topic directory with a fresh index snapshot"""
+        self.fs_watcher.addPath(str(topic_dir))
+        self.dir_index[topic_dir] = scan_directory(topic_dir)
+
+    def _list_topic_dirs(self) -> List[Path]:
+        """List topic directories directly under the vault"""
+        try:
+            with os.scandir(self.base_path) as entries:
+                return [
+                    Path(entry.path) for entry in entries
+                    if entry.is_dir() and not entry.name.startswith('.')
+                ]
+        except OSError:
+            return []
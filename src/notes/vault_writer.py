@@ -0,0 +1,187 @@
+"""
+Vault Writer - Debounced, atomic background writes for the note vault
+Keeps markdown and topic metadata writes off the GUI thread
+"""
+
+import os
+import atexit
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+class VaultWriter:
+    """Debounces and atomically writes vault files on a background thread"""
+
+    def __init__(self, note_delay: float = 0.3, topic_delay: float = 1.0, max_delay: float = 2.0):
+        self.note_delay = note_delay    # Quiet period before a note is written
+        self.topic_delay = topic_delay  # Topic metadata is batched over a longer window
+        self.max_delay = max_delay      # Upper bound so constant edits still reach disk
+
+        # path -> (text or None for delete, due time, first scheduled time)
+        self._pending: Dict[Path, Tuple[Optional[str], float, float]] = {}
+        self._in_flight = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+        # Signatures of files written by us, so watchers can skip our own writes
+        self._own_writes: Dict[Path, Tuple[int, int]] = {}
+
+        self._thread = threading.Thread(target=self._run, name="VaultWriter", daemon=True)
+        self._thread.start()
+
+        # Guarantee pending writes reach disk even if close() is never called
+        atexit.register(self.close)
+
+    def write_note(self, path: Path, text: str):
+        """Schedule a debounced write of a note file"""
+        self._schedule(Path(path), text, self.note_delay)
+
+    def write_topic(self, path: Path, text: str):
+        """Schedule a batched write of topic metadata"""
+        self._schedule(Path(path), text, self.topic_delay)
+
+    def delete(self, path: Path):
+        """Schedule deletion of a file, cancelling any pending write to it"""
+        self._schedule(Path(path), None, 0.0)
+
+    def pending_text(self, path: Path) -> Optional[str]:
+        """Get text queued for a path that has not been written yet"""
+        with self._condition:
+            entry = self._pending.get(Path(path))
+            return entry[0] if entry else None
+
+    def is_own_write(self, path: Path, mtime_ns: int, size: int) -> bool:
+        """Check whether a file on disk is exactly what we last wrote there"""
+        with self._condition:
+            return self._own_writes.get(Path(path)) == (mtime_ns, size)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Write everything pending now and wait until it is on disk"""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            if self._closed:
+                return not self._pending
+
+            now = time.monotonic()
+            self._pending = {
+                path: (text, now, first)
+                for path, (text, _, first) in self._pending.items()
+            }
+            self._condition.notify_all()
+
+            while self._pending or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def close(self):
+        """Stop the writer thread and flush anything still pending"""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+
+        self._thread.join(timeout=10.0)
+
+        # Drain whatever the thread did not get to in the calling thread
+        with self._condition:
+            leftovers = list(self._pending.items())
+            self._pending.clear()
+
+        for path, (text, _, _) in leftovers:
+            self._apply(path, text)
+
+        atexit.unregister(self.close)
+
+    def _schedule(self, path: Path, text: Optional[str], delay: float):
+        """Queue an operation, pushing back the deadline for repeated saves"""
+        with self._condition:
+            if self._closed:
+                # Late writes after shutdown go straight to disk
+                self._apply(path, text)
+                return
+
+            now = time.monotonic()
+            first = self._pending[path][2] if path in self._pending else now
+            due = min(now + delay, first + self.max_delay)
+            self._pending[path] = (text, due, first)
+            self._condition.notify_all()
+
+    def _run(self):
+        """Background loop writing operations once their quiet period ends"""
+        while True:
+            with self._condition:
+                while not self._closed:
+                    now = time.monotonic()
+                    ready = [path for path, entry in self._pending.items() if entry[1] <= now]
+                    if ready:
+                        break
+
+                    timeout = None
+                    if self._pending:
+                        timeout = min(entry[1] for entry in self._pending.values()) - now
+                    self._condition.wait(timeout)
+
+                if self._closed:
+                    return
+
+                batch = [(path, self._pending.pop(path)[0]) for path in ready]
+                self._in_flight += len(batch)
+
+            for path, text in batch:
+                self._apply(path, text)
+                with self._condition:
+                    self._in_flight -= 1
+                    self._condition.notify_all()
+
+    def _apply(self, path: Path, text: Optional[str]):
+        """Perform a single write or delete"""
+        try:
+            if text is None:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                with self._condition:
+                    self._own_writes.pop(path, None)
+            else:
+                _atomic_write_text(path, text)
+                stat = path.stat()
+                with self._condition:
+                    self._own_writes[path] = (stat.st_mtime_ns, stat.st_size)
+        except Exception as e:
+            print(f"❌ Error writing vault file {path}: {e}")
+
+def _atomic_write_text(path: Path, text: str):
+    """Write text to a temp file, fsync it and rename it over the target"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+    # Persist the rename itself where the platform allows it
+    if hasattr(os, 'O_DIRECTORY'):
+        try:
+            dir_fd = os.open(str(path.parent), os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
@@ -3,6 +3,19 @@ SprintReader PDF Handler Module
 Handles PDF operations and time tracking
 """
 
-from .pdf_handler import PDFHandler
+from importlib import import_module
 
-__all__ = ['PDFHandler']
+__all__ = ['PDFHandler', 'PDFEngine', 'PDFEngineError']
+
+# Spawned engine workers import this package too; exports load on first use so
+# they never pull in the database, Qt or numpy
+_EXPORTS = {
+    'PDFHandler': '.pdf_handler',
+    'PDFEngine': '.pdf_engine',
+    'PDFEngineError': '.pdf_engine',
+}
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_EXPORTS[name], __name__), name)
@@ -0,0 +1,277 @@
+"""
+Disk Cache - Persistent caches of rendered PDF images, keyed by document content
+"""
+
+import io
+import os
+import json
+import zlib
+import struct
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple, Optional
+import numpy as np
+
+SAMPLE_BLOCK_SIZE = 64 * 1024  # Bytes hashed from the start, middle and end of a file
+
+DEFAULT_PAGE_CACHE_MB = 256
+FRAME_MAGIC = b'SRPF'
+FRAME_HEADER = struct.Struct('<4sIIIB')  # magic, width, height, stride, alpha
+
+class Frame(NamedTuple):
+    """Raw rendered page pixels"""
+    width: int
+    height: int
+    stride: int
+    alpha: bool
+    samples: bytes
+
+def cache_root() -> Path:
+    """Directory holding all SprintReader caches"""
+    return Path(os.getenv('CACHE_DIR', 'cache'))
+
+def compute_content_hash(filepath: str) -> str:
+    """Hash a file by its size and sampled blocks, so large PDFs hash in constant time"""
+    size = os.path.getsize(filepath)
+    digest = hashlib.sha1(str(size).encode())
+
+    with open(filepath, 'rb') as f:
+        for offset in sorted({0, max(0, size // 2 - SAMPLE_BLOCK_SIZE // 2), max(0, size - SAMPLE_BLOCK_SIZE)}):
+            f.seek(offset)
+            digest.update(f.read(SAMPLE_BLOCK_SIZE))
+
+    return digest.hexdigest()
+
+def write_cache_file(path: Path, data: bytes):
+    """Write a cache entry so readers never see a partial file"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+class ThumbnailCache:
+    """PNG thumbnails of one document, shared across sessions"""
+
+    def __init__(self, content_hash: str, dpi: int, root: Path = None):
+        self.directory = (root or cache_root()) / 'thumbnails' / f"{content_hash}-{dpi}"
+
+    def get(self, page_num: int) -> Optional[bytes]:
+        """Get cached PNG data for a page"""
+        try:
+            return self._path(page_num).read_bytes()
+        except OSError:
+            return None
+
+    def put(self, page_num: int, png_data: bytes):
+        """Store PNG data for a page"""
+        try:
+            write_cache_file(self._path(page_num), png_data)
+        except OSError as e:
+            print(f"⚠️ Could not cache thumbnail for page {page_num + 1}: {e}")
+
+    def _path(self, page_num: int) -> Path:
+        return self.directory / f"{page_num}.png"
+
+class OutlineCache:
+    """Table of contents of each document, extracted once"""
+
+    def __init__(self, root: Path = None):
+        self.directory = (root or cache_root()) / 'outlines'
+
+    def get(self, content_hash: str) -> Optional[list]:
+        """Get cached [level, title, page] rows, None if the document was never read"""
+        try:
+            return json.loads(self._path(content_hash).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+
+    def put(self, content_hash: str, outline: list):
+        """Store outline rows"""
+        try:
+            write_cache_file(self._path(content_hash), json.dumps(outline, ensure_ascii=False).encode('utf-8'))
+        except OSError as e:
+            print(f"⚠️ Could not cache outline: {e}")
+
+    def _path(self, content_hash: str) -> Path:
+        return self.directory / f"{content_hash}.json"
+
+class PageFeatureCache:
+    """Per-page content features of each document as a float32 array, extracted once"""
+
+    def __init__(self, root: Path = None):
+        self.directory = (root or cache_root()) / 'features'
+
+    def get(self, content_hash: str) -> Optional[np.ndarray]:
+        """Get the (pages, features) array, None if the document was never analysed"""
+        try:
+            return np.load(self._path(content_hash), allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, content_hash: str, features: np.ndarray):
+        """Store a document's feature array"""
+        buffer = io.BytesIO()
+        np.save(buffer, features.astype(np.float32, copy=False), allow_pickle=False)
+        try:
+            write_cache_file(self._path(content_hash), buffer.getvalue())
+        except OSError as e:
+            print(f"⚠️ Could not cache page features: {e}")
+
+    def _path(self, content_hash: str) -> Path:
+        return self.directory / f"{content_hash}.npy"
+
+def encode_frame(frame: Frame) -> bytes:
+    """Pack raw pixels with a fast zlib pass; decoding is far cheaper than PNG"""
+    header = FRAME_HEADER.pack(FRAME_MAGIC, frame.width, frame.height, frame.stride, int(frame.alpha))
+    return header + zlib.compress(frame.samples, 1)
+
+def decode_frame(data: bytes) -> Optional[Frame]:
+    """Unpack a frame written by encode_frame, None if it is damaged"""
+    try:
+        magic, width, height, stride, alpha = FRAME_HEADER.unpack_from(data)
+        if magic != FRAME_MAGIC:
+            return None
+        samples = zlib.decompress(data[FRAME_HEADER.size:])
+    except (struct.error, zlib.error):
+        return None
+    if len(samples) != stride * height:
+        return None
+    return Frame(width, height, stride, bool(alpha), samples)
+
+class PageCache:
+    """Size-bounded LRU cache of rendered pages shared by all documents"""
+
+    def __init__(self, budget_bytes: int = DEFAULT_PAGE_CACHE_MB * 1024 * 1024, root: Path = None):
+        self.directory = (root or cache_root()) / 'pages'
+        self.budget_bytes = budget_bytes
+
+        # Entry path -> size, least recently used first
+        self._entries: Optional[OrderedDict] = None
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        # Compression and disk writes stay off the render path
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="PageCache")
+
+    def get(self, content_hash: str, page_num: int, zoom: float, profile: str) -> Optional[Frame]:
+        """Get a cached render, marking it recently used"""
+        path = self._path(content_hash, page_num, zoom, profile)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+
+        frame = decode_frame(data)
+        if frame is None:
+            # Corrupt entry: drop it on the writer thread, which owns the index
+            try:
+                self._writer.submit(self._remove, path)
+            except RuntimeError:
+                pass  # Closed during shutdown
+            return None
+
+        with self._lock:
+            # The index is built lazily on the writer thread; never scan on the read path
+            if self._entries is not None:
+                self._total_bytes += len(data) - self._entries.get(path, 0)
+                self._entries[path] = len(data)
+                self._entries.move_to_end(path)
+        try:
+            os.utime(path)  # Persist recency for the next session
+        except OSError:
+            pass
+        return frame
+
+    def contains(self, content_hash: str, page_num: int, zoom: float, profile: str) -> bool:
+        """Whether a render is cached, without reading it"""
+        return self._path(content_hash, page_num, zoom, profile).is_file()
+
+    def put(self, content_hash: str, page_num: int, zoom: float, profile: str, frame: Frame):
+        """Store a render in the background and evict old entries past the budget"""
+        path = self._path(content_hash, page_num, zoom, profile)
+        try:
+            self._writer.submit(self._store, path, frame)
+        except RuntimeError:
+            pass  # Closed during shutdown
+
+    def set_budget(self, budget_bytes: int):
+        """Change the byte budget, evicting immediately if it shrank"""
+        self.budget_bytes = budget_bytes
+        try:
+            self._writer.submit(self._evict)
+        except RuntimeError:
+            pass
+
+    def close(self):
+        """Finish pending writes"""
+        self._writer.shutdown(wait=True)
+
+    def _store(self, path: Path, frame: Frame):
+        try:
+            data = encode_frame(frame)
+            write_cache_file(path, data)
+        except OSError as e:
+            print(f"⚠️ Could not cache rendered page: {e}")
+            return
+
+        with self._lock:
+            entries = self._load_index()
+            self._total_bytes += len(data) - entries.get(path, 0)
+            entries[path] = len(data)
+            entries.move_to_end(path)
+        self._evict()
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits its budget"""
+        while True:
+            with self._lock:
+                entries = self._load_index()
+                if self._total_bytes <= self.budget_bytes or not entries:
+                    return
+                path, size = entries.popitem(last=False)
+                self._total_bytes -= size
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _remove(self, path: Path):
+        with self._lock:
+            entries = self._load_index()
+            self._total_bytes -= entries.pop(path, 0)
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def _load_index(self) -> OrderedDict:
+        """Scan the cache directory once, ordering entries by last use (caller holds the lock)"""
+        if self._entries is None:
+            found = []
+            if self.directory.exists():
+                for document_dir in os.scandir(self.directory):
+                    if not document_dir.is_dir():
+                        continue
+                    for entry in os.scandir(document_dir.path):
+                        if entry.name.endswith('.frame') and entry.is_file():
+                            stat = entry.stat()
+                            found.append((stat.st_mtime, Path(entry.path), stat.st_size))
+            found.sort(key=lambda item: item[0])
+            self._entries = OrderedDict((path, size) for _, path, size in found)
+            self._total_bytes = sum(self._entries.values())
+        return self._entries
+
+    def _path(self, content_hash: str, page_num: int, zoom: float, profile: str) -> Path:
+        return self.directory / content_hash / f"{page_num}-{zoom:g}-{profile}.frame"
@@ -0,0 +1,178 @@
+"""
+Engine Worker - The code PDF engine worker processes run
+Spawned workers import only this module and PyMuPDF, never the reader's Qt,
+database or analytics code.
+"""
+
+import os
+from collections import OrderedDict
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+DOCUMENTS_PER_WORKER = 2      # Open handles each worker keeps, most recent first
+DISPLAY_LISTS_PER_DOCUMENT = 32  # Interpreted pages each worker keeps per document
+
+# Columns of page_features rows
+PAGE_FEATURES = ('words', 'image_share', 'formula_chars')
+# Font name fragments of TeX and Unicode math fonts
+MATH_FONT_MARKERS = ('cmmi', 'cmsy', 'cmex', 'msam', 'msbm', 'math', 'symbol', 'stix', 'esint', 'rsfs')
+
+def frame_block_name(pid: int, request_id: int) -> str:
+    """Shared memory name of a rendered page, known to the GUI before the worker answers"""
+    return f"srpdf_{pid}_{request_id}"
+
+class _OpenDocument:
+    """A worker's handle on a document plus display lists of recently rendered pages"""
+
+    def __init__(self, doc):
+        self.doc = doc
+        # Page -> fitz.DisplayList, least recently used first
+        self.display_lists: OrderedDict = OrderedDict()
+
+    def display_list(self, page_num: int):
+        """Interpret a page's content stream once; zooms, clips and thumbnails replay the result"""
+        display_list = self.display_lists.get(page_num)
+        if display_list is None:
+            display_list = self.doc[page_num].get_displaylist()
+            self.display_lists[page_num] = display_list
+            while len(self.display_lists) > DISPLAY_LISTS_PER_DOCUMENT:
+                self.display_lists.popitem(last=False)
+        self.display_lists.move_to_end(page_num)
+        return display_list
+
+    def close(self):
+        self.display_lists.clear()
+        self.doc.close()
+
+def worker_main(requests, results):
+    """Serve requests until told to stop; every worker holds its own document handles
+
+    Answers go down results, this worker's own pipe, so a worker dying mid-message
+    cannot block the others.
+    """
+    import fitz  # Imported here so the GUI process never needs it
+
+    documents: OrderedDict = OrderedDict()
+
+    def get_document(path: str) -> _OpenDocument:
+        document = documents.get(path)
+        if document is None:
+            document = _OpenDocument(fitz.open(path))
+            documents[path] = document
+            while len(documents) > DOCUMENTS_PER_WORKER:
+                documents.popitem(last=False)[1].close()
+        documents.move_to_end(path)
+        return document
+
+    while True:
+        message = requests.get()
+        if message is None:
+            break
+
+        request_id, op, args = message
+        try:
+            if op == 'close':
+                document = documents.pop(args[0], None)
+                if document is not None:
+                    document.close()
+                result = None
+            elif op == 'render':
+                block_name = frame_block_name(os.getpid(), request_id)
+                result = _op_render(fitz, get_document(args[0]), block_name, *args[1:])
+            else:
+                result = _OPERATIONS[op](fitz, get_document(args[0]), *args[1:])
+            results.send((request_id, True, result))
+        except Exception as e:
+            results.send((request_id, False, f"{type(e).__name__}: {e}"))
+
+    for document in documents.values():
+        document.close()
+
+def _op_open(fitz, document: _OpenDocument) -> Dict[str, Any]:
+    """Page count, metadata and page sizes, read once per document"""
+    sizes = []
+    for page in document.doc:
+        rect = page.rect  # Accounts for page rotation
+        sizes.append((rect.width, rect.height))
+    # The trailer /ID array survives renames and copies; absent in some generated PDFs
+    id_type, pdf_id = document.doc.xref_get_key(-1, "ID")
+    return {
+        'page_count': len(document.doc),
+        'metadata': dict(document.doc.metadata or {}),
+        'page_sizes': sizes,
+        'pdf_id': pdf_id if id_type == 'array' else '',
+    }
+
+def _rasterise(fitz, document: _OpenDocument, page_num: int, zoom: float, clip: Optional[Tuple] = None):
+    """Replay a page's display list at a zoom, optionally clipped to a rect in page points"""
+    display_list = document.display_list(page_num)
+    return display_list.get_pixmap(
+        matrix=fitz.Matrix(zoom, zoom), alpha=False, clip=fitz.Rect(clip) if clip else None
+    )
+
+def _op_render(fitz, document: _OpenDocument, block_name: str, page_num: int, zoom: float,
+               clip: Optional[Tuple] = None):
+    """Rasterise a page into a new shared memory block the GUI process takes over"""
+    pixmap = _rasterise(fitz, document, page_num, zoom, clip)
+    samples = pixmap.samples_mv
+    size = len(samples)
+
+    block = shared_memory.SharedMemory(name=block_name, create=True, size=max(1, size))
+    try:
+        block.buf[:size] = samples
+        name = block.name
+    finally:
+        block.close()
+    return name, size, pixmap.width, pixmap.height, pixmap.stride, bool(pixmap.alpha)
+
+def _op_png(fitz, document: _OpenDocument, page_num: int, zoom: float) -> bytes:
+    """Rasterise a page straight to PNG; small renders are cheaper to pickle than to share"""
+    return _rasterise(fitz, document, page_num, zoom).tobytes("png")
+
+def _op_text(fitz, document: _OpenDocument, page_num: int, mode: str):
+    """Page text in one of PyMuPDF's get_text modes"""
+    if mode == 'dict':
+        # Image blocks carry raw image bytes the GUI never uses
+        return document.doc[page_num].get_text('dict', flags=fitz.TEXTFLAGS_TEXT)
+    return document.doc[page_num].get_text(mode)
+
+def _op_search(fitz, document: _OpenDocument, page_nums: Optional[List[int]], text: str) -> List[Tuple[int, Tuple]]:
+    """Search pages for text, returning (page, (x0, y0, x1, y1)) hits"""
+    hits = []
+    for page_num in (page_nums if page_nums is not None else range(len(document.doc))):
+        for rect in document.doc[page_num].search_for(text):
+            hits.append((page_num, (rect.x0, rect.y0, rect.x1, rect.y1)))
+    return hits
+
+def _op_outline(fitz, document: _OpenDocument) -> List[List]:
+    """Table of contents as [level, title, 1-based page] rows"""
+    return document.doc.get_toc(simple=True)
+
+def _op_page_features(fitz, document: _OpenDocument, start: int, stop: int) -> List[Tuple[float, float, float]]:
+    """(words, share of the page under raster images, characters in math fonts) per page"""
+    rows = []
+    for page_num in range(start, min(stop, len(document.doc))):
+        page = document.doc[page_num]
+        words = 0
+        formula_chars = 0
+        for block in page.get_text('dict', flags=fitz.TEXTFLAGS_TEXT)['blocks']:
+            for line in block.get('lines', ()):
+                words += len(''.join(span['text'] for span in line['spans']).split())
+                for span in line['spans']:
+                    font = span['font'].lower()
+                    if any(marker in font for marker in MATH_FONT_MARKERS):
+                        formula_chars += len(span['text'].strip())
+
+        page_area = abs(page.rect) or 1.0
+        image_area = sum(abs(fitz.Rect(info['bbox']) & page.rect) for info in page.get_image_info())
+        rows.append((float(words), min(1.0, image_area / page_area), float(formula_chars)))
+    return rows
+
+_OPERATIONS = {
+    'open': _op_open,
+    'png': _op_png,
+    'text': _op_text,
+    'search': _op_search,
+    'outline': _op_outline,
+    'page_features': _op_page_features,
+}
@@ -0,0 +1,247 @@
+"""
+PDF Engine - PyMuPDF runs in a pool of worker processes
+A crash in a damaged PDF takes down one worker, not the reader, and pages render on several cores
+"""
+
+import os
+import threading
+import itertools
+import multiprocessing
+from concurrent.futures import Future, InvalidStateError
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait
+from typing import Dict, List, Optional, Tuple
+from .disk_cache import Frame
+from .engine_worker import PAGE_FEATURES, frame_block_name, worker_main
+
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+AFFINITY_SLACK = 2            # Extra queued requests tolerated to reach the worker holding a page
+REQUEST_TIMEOUT = 60          # Seconds a blocking call waits for its worker
+HEALTH_CHECK_INTERVAL = 0.5   # Seconds between checks for crashed workers
+
+class PDFEngineError(Exception):
+    """Raised when a worker fails a request or dies while serving it"""
+
+class EngineDocument:
+    """What the GUI process knows about a document opened by the engine"""
+
+    def __init__(self, path: str, page_count: int, metadata: Dict, page_sizes: List[Tuple[float, float]],
+                 pdf_id: str = ''):
+        self.name = path
+        self.page_count = page_count
+        self.metadata = metadata
+        self.page_sizes = page_sizes
+        self.pdf_id = pdf_id
+
+    def __len__(self) -> int:
+        return self.page_count
+
+    def __bool__(self) -> bool:
+        # An empty document is still an open document
+        return True
+
+def _take_frame(name: str, size: int, width: int, height: int, stride: int, alpha: bool) -> Frame:
+    """Copy a rendered page out of shared memory and free the block"""
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        samples = bytes(block.buf[:size])
+    finally:
+        block.close()
+        block.unlink()
+    return Frame(width, height, stride, alpha, samples)
+
+def _free_block(name: str):
+    """Unlink a shared memory block nobody will take"""
+    try:
+        block = shared_memory.SharedMemory(name=name)
+    except (FileNotFoundError, OSError):
+        return
+    block.close()
+    block.unlink()
+
+def _resolve(future: Future, result=None, error: Optional[Exception] = None):
+    """Complete a future unless the caller already cancelled it"""
+    try:
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    except InvalidStateError:
+        pass  # Cancelled from the GUI thread meanwhile
+
+class _Worker:
+    """One worker process, its result pipe and the requests it has not answered yet"""
+
+    def __init__(self, context):
+        self.requests = context.Queue()
+        self.results, results_writer = context.Pipe(duplex=False)
+        self.in_flight: Dict[int, Tuple[Future, str]] = {}
+        self.process = context.Process(
+            target=worker_main, args=(self.requests, results_writer), name="PDFEngineWorker", daemon=True
+        )
+        self.process.start()
+        # Only the worker writes; the pipe reports EOF once it exits
+        results_writer.close()
+
+    def free_unclaimed_frames(self):
+        """Unlink shared memory of renders the worker may have started before it died"""
+        for request_id, (_, op) in self.in_flight.items():
+            if op == 'render':
+                _free_block(frame_block_name(self.process.pid, request_id))
+
+class PDFEngine:
+    """Pool of PyMuPDF worker processes answering open, render, text, search and outline requests"""
+
+    def __init__(self, workers: Optional[int] = None):
+        if workers is None:
+            workers = int(os.getenv('PDF_ENGINE_WORKERS', DEFAULT_WORKERS))
+        self.worker_count = max(1, workers)
+
+        # Spawn keeps workers independent of the GUI process's Qt and database state
+        self._context = multiprocessing.get_context('spawn')
+        self._workers: List[_Worker] = [_Worker(self._context) for _ in range(self.worker_count)]
+        self._request_ids = itertools.count()
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # Resolves futures and restarts crashed workers
+        self._listener = threading.Thread(target=self._listen, name="PDFEngineListener", daemon=True)
+        self._listener.start()
+
+    def open(self, path: str) -> EngineDocument:
+        """Open a document and read its page count, metadata and page sizes"""
+        info = self.call('open', path)
+        return EngineDocument(path, info['page_count'], info['metadata'], info['page_sizes'], info['pdf_id'])
+
+    def close_document(self, path: str):
+        """Let every worker drop its handle on a document"""
+        with self._lock:
+            for worker in self._workers:
+                self._send(worker, 'close', (path,))
+
+    def render(self, path: str, page_num: int, zoom: float, clip: Optional[Tuple] = None) -> Future:
+        """Render a page, or a clip of it in page points; the future resolves to a Frame"""
+        return self.submit('render', path, page_num, zoom, clip, page=page_num)
+
+    def render_png(self, path: str, page_num: int, zoom: float) -> Future:
+        """Render a page to PNG bytes"""
+        return self.submit('png', path, page_num, zoom, page=page_num)
+
+    def text(self, path: str, page_num: int, mode: str = 'text') -> Future:
+        """Extract page text ('text', 'dict', ...)"""
+        return self.submit('text', path, page_num, mode)
+
+    def search(self, path: str, text: str, page_nums: Optional[List[int]] = None) -> Future:
+        """Search some or all pages for text"""
+        return self.submit('search', path, page_nums, text)
+
+    def outline(self, path: str) -> Future:
+        """Read the table of contents"""
+        return self.submit('outline', path)
+
+    def page_features(self, path: str, start: int, stop: int) -> Future:
+        """Content features of pages start..stop-1, see PAGE_FEATURES"""
+        return self.submit('page_features', path, start, stop, page=start)
+
+    def call(self, op: str, *args, timeout: float = REQUEST_TIMEOUT):
+        """Run a request and wait for its result"""
+        return self.submit(op, *args).result(timeout)
+
+    def submit(self, op: str, *args, page: Optional[int] = None) -> Future:
+        """Queue a request on the least busy worker
+
+        Page renders prefer a fixed worker per page, which already holds that page's display list.
+        """
+        with self._lock:
+            if self._closed:
+                raise PDFEngineError("PDF engine is shut down")
+            worker = min(self._workers, key=lambda w: len(w.in_flight))
+            if page is not None:
+                home = self._workers[page % len(self._workers)]
+                if len(home.in_flight) <= len(worker.in_flight) + AFFINITY_SLACK:
+                    worker = home
+            return self._send(worker, op, args)
+
+    def shutdown(self):
+        """Stop all workers"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = self._workers
+
+        for worker in workers:
+            worker.requests.put(None)
+        for worker in workers:
+            worker.process.join(timeout=2)
+            if worker.process.is_alive():
+                worker.process.terminate()
+                worker.process.join(timeout=2)
+            worker.free_unclaimed_frames()
+            self._fail_in_flight(worker, "PDF engine is shut down")
+
+    def _send(self, worker: _Worker, op: str, args: tuple) -> Future:
+        """Hand a request to a worker (caller holds the lock)"""
+        future = Future()
+        request_id = next(self._request_ids)
+        worker.in_flight[request_id] = (future, op)
+        worker.requests.put((request_id, op, args))
+        return future
+
+    def _listen(self):
+        """Deliver results and replace workers that died"""
+        while not self._closed:
+            with self._lock:
+                pipes = {worker.results: worker for worker in self._workers if not worker.results.closed}
+            for pipe in wait(list(pipes), timeout=HEALTH_CHECK_INTERVAL):
+                worker = pipes[pipe]
+                try:
+                    request_id, ok, result = pipe.recv()
+                except Exception:
+                    # Worker exited, possibly mid-message; _check_workers replaces it
+                    pipe.close()
+                    continue
+                self._deliver(worker, request_id, ok, result)
+            self._check_workers()
+
+    def _deliver(self, worker: _Worker, request_id: int, ok: bool, result):
+        with self._lock:
+            entry = worker.in_flight.pop(request_id, None)
+
+        if entry is None:
+            # Its worker was replaced; a rendered frame still has to be freed
+            if ok and isinstance(result, tuple) and len(result) == 6:
+                _free_block(result[0])
+            return
+
+        future, op = entry
+        try:
+            if not ok:
+                raise PDFEngineError(result)
+            if op == 'render':
+                result = _take_frame(*result)
+        except Exception as e:
+            _resolve(future, error=e if isinstance(e, PDFEngineError) else PDFEngineError(str(e)))
+            return
+
+        _resolve(future, result)
+
+    def _check_workers(self):
+        """Fail the requests of crashed workers and start replacements"""
+        with self._lock:
+            if self._closed:
+                return
+            for index, worker in enumerate(self._workers):
+                if worker.process.is_alive():
+                    continue
+                print(f"❌ PDF worker crashed (exit code {worker.process.exitcode}), restarting it")
+                worker.free_unclaimed_frames()
+                self._fail_in_flight(worker, f"PDF worker crashed with exit code {worker.process.exitcode}")
+                worker.results.close()
+                self._workers[index] = _Worker(self._context)
+
+    @staticmethod
+    def _fail_in_flight(worker: _Worker, message: str):
+        for future, _ in worker.in_flight.values():
+            _resolve(future, error=PDFEngineError(message))
+        worker.in_flight.clear()
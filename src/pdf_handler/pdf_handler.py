@@ -1,42 +1,95 @@
 """
 SprintReader PDF Handler
-Core PDF operations using PyMuPDF (fitz)
+Core PDF operations; PyMuPDF (fitz) runs in the PDF engine's worker processes
 """
 
-import fitz  # PyMuPDF
 import os
-from typing import Optional, Dict, List, Tuple
+import hashlib
+import numpy as np
+from concurrent.futures import Future
+from typing import NamedTuple, Optional, Dict, List, Tuple
 from datetime import datetime
-from database.models import db_manager, Document, ReadingSession
+from database.models import db_manager, Document, ReadingSession, PageDwell
+from events.event_bus import (
+    event_bus, PAGE_CHANGED, DOCUMENT_OPENED, DOCUMENT_CLOSED, PROGRESS_SAVED, SESSION_COMMITTED
+)
+from estimation.online_stats import record_reading_session
+from analytics.streaks import record_streak_session
+from .disk_cache import Frame, OutlineCache, PageFeatureCache, compute_content_hash
+from .pdf_engine import PDFEngine, EngineDocument, PAGE_FEATURES, REQUEST_TIMEOUT
+
+# Identifies how pages are rasterised; part of every rendered-page cache key
+RENDER_PROFILE = 'rgb-v1'
+FEATURE_CHUNK_PAGES = 64  # Pages per feature request, so workers share a long document
+
+def document_fingerprint(content_hash: str, page_count: int, pdf_id: str = '') -> str:
+    """Identity of a PDF's content, independent of where the file lives"""
+    return hashlib.sha1(f"{content_hash}|{page_count}|{pdf_id}".encode()).hexdigest()
+
+class PreparedDocument(NamedTuple):
+    """A parsed document and its saved page, ready for open_document"""
+    doc: EngineDocument
+    content_hash: str
+    fingerprint: str
+    saved_page: int  # 0-based
 
 class PDFHandler:
     """Handles PDF operations and metadata"""
     
-    def __init__(self):
-        self.current_doc: Optional[fitz.Document] = None
+    def __init__(self, engine: Optional[PDFEngine] = None):
+        # PyMuPDF itself only runs in the engine's worker processes
+        self.engine = engine or PDFEngine()
+        self.current_doc: Optional[EngineDocument] = None
         self.current_page: int = 0
         self.total_pages: int = 0
         self.document_id: Optional[int] = None
         self.session_start_time: Optional[datetime] = None
         self.page_start_time: Optional[datetime] = None
-        self.page_times: Dict[int, float] = {}  # page_number -> seconds spent
+        self.page_times: Dict[int, float] = {}  # page_number -> seconds spent, summed over revisits
+        self.content_hash: Optional[str] = None  # Keys on-disk render caches
+        self.fingerprint: Optional[str] = None  # Identifies the document in the database
+        self.outline_cache = OutlineCache()
+        self.feature_cache = PageFeatureCache()
         
     def open_pdf(self, filepath: str) -> bool:
         """Open a PDF file and initialize tracking"""
+        if not self.open_document(filepath):
+            return False
+        
+        # Get or create database entry
+        self.attach_document_record(self.find_or_create_document(*self.document_record_fields()))
+        return True
+    
+    def prepare_document(self, filepath: str, content_hash: Optional[str] = None) -> PreparedDocument:
+        """Parse a PDF and look up its saved page; safe to call off the GUI thread"""
+        doc = self.engine.open(filepath)
+        if content_hash is None:
+            content_hash = compute_content_hash(filepath)
+        fingerprint = document_fingerprint(content_hash, len(doc), doc.pdf_id)
+        return PreparedDocument(doc, content_hash, fingerprint, self.peek_saved_position(filepath, fingerprint))
+    
+    def open_document(self, filepath: str, prepared: Optional[PreparedDocument] = None) -> bool:
+        """Open a PDF and restore its saved page; the database record is attached later"""
+        if prepared is None:
+            try:
+                prepared = self.prepare_document(filepath)
+            except Exception as e:
+                print(f"❌ Error opening PDF: {e}")
+                return False  # Whatever was open stays open
+        
         try:
             # Close existing document if open
             if self.current_doc:
                 self.close_pdf()
             
             # Open new document
-            self.current_doc = fitz.open(filepath)
+            self.current_doc = prepared.doc
             self.total_pages = len(self.current_doc)
-            
-            # Get or create database entry
-            self.document_id = self._get_or_create_document(filepath)
+            self.content_hash = prepared.content_hash
+            self.fingerprint = prepared.fingerprint
             
             # Load saved position
-            self.current_page = self._get_saved_position()
+            self.current_page = min(prepared.saved_page, max(0, self.total_pages - 1))
             
             # Start session tracking
             self._start_session()
@@ -45,12 +98,24 @@ class PDFHandler:
             print(f"📄 Pages: {self.total_pages}")
             print(f"📍 Starting at page: {self.current_page + 1}")
             
+            event_bus.publish(DOCUMENT_OPENED, filepath=filepath)
             return True
             
         except Exception as e:
             print(f"❌ Error opening PDF: {e}")
+            self.current_doc = None
             return False
     
+    def document_record_fields(self) -> Tuple[str, str, int, str]:
+        """(filepath, title, total_pages, fingerprint) for find_or_create_document"""
+        filepath = self.current_doc.name
+        title = self.get_document_info().get('title') or os.path.basename(filepath)
+        return filepath, title, self.total_pages, self.fingerprint
+    
+    def attach_document_record(self, document_id: Optional[int]):
+        """Link the open document to its database record"""
+        self.document_id = document_id
+    
     def close_pdf(self):
         """Close current PDF and save progress"""
         if self.current_doc:
@@ -58,6 +123,10 @@ class PDFHandler:
             if self.page_start_time:
                 self._end_page_timing()
             
+            # The background record stage may not have attached the document yet
+            if self.document_id is None and self.session_start_time:
+                self.attach_document_record(self.find_or_create_document(*self.document_record_fields()))
+            
             # End session
             self._end_session()
             
@@ -65,26 +134,125 @@ class PDFHandler:
             self._save_progress()
             
             # Close document
-            self.current_doc.close()
+            filepath = self.current_doc.name
+            self.engine.close_document(filepath)
             self.current_doc = None
             self.document_id = None
+            self.content_hash = None
+            self.fingerprint = None
             
             print("📚 PDF closed and progress saved")
+            event_bus.publish(DOCUMENT_CLOSED, filepath=filepath)
     
-    def get_page_pixmap(self, page_num: int, zoom: float = 1.0) -> Optional[fitz.Pixmap]:
-        """Get page as pixmap for rendering"""
+    def get_page_pixmap(self, page_num: int, zoom: float = 1.0, clip: Optional[Tuple] = None) -> Optional[Frame]:
+        """Get page pixels for rendering, optionally only a clip (x0, y0, x1, y1) in page points"""
         if not self.current_doc or page_num >= self.total_pages:
             return None
         
         try:
-            page = self.current_doc[page_num]
-            mat = fitz.Matrix(zoom, zoom)  # Create zoom matrix
-            pixmap = page.get_pixmap(matrix=mat)
-            return pixmap
+            return self.engine.render(self.current_doc.name, page_num, zoom, clip).result(REQUEST_TIMEOUT)
         except Exception as e:
             print(f"❌ Error rendering page {page_num}: {e}")
             return None
     
+    def request_page_pixmap(self, page_num: int, zoom: float = 1.0, clip: Optional[Tuple] = None) -> Optional[Future]:
+        """Start rendering a page (or a clip of it) in the background; the future resolves to a Frame"""
+        if not self.current_doc or page_num >= self.total_pages:
+            return None
+        return self.engine.render(self.current_doc.name, page_num, zoom, clip)
+    
+    def request_page_png(self, page_num: int, zoom: float = 1.0) -> Optional[Future]:
+        """Start rendering a page to PNG bytes in the background"""
+        if not self.current_doc or page_num >= self.total_pages:
+            return None
+        return self.engine.render_png(self.current_doc.name, page_num, zoom)
+    
+    def request_page_text_dict(self, page_num: int) -> Optional[Future]:
+        """Start extracting a page's text blocks in the background"""
+        if not self.current_doc or page_num >= self.total_pages:
+            return None
+        return self.engine.text(self.current_doc.name, page_num, 'dict')
+    
+    def get_page_text_dict(self, page_num: int) -> Dict:
+        """Get a page's text blocks, lines and spans with their boxes"""
+        future = self.request_page_text_dict(page_num)
+        if future is None:
+            return {}
+        
+        try:
+            return future.result(REQUEST_TIMEOUT)
+        except Exception as e:
+            print(f"❌ Error extracting text from page {page_num}: {e}")
+            return {}
+    
+    def search_page(self, page_num: int, text: str) -> List[Tuple[float, float, float, float]]:
+        """Boxes of every occurrence of text on a page"""
+        if not self.current_doc or page_num >= self.total_pages:
+            return []
+        
+        try:
+            hits = self.engine.search(self.current_doc.name, text, [page_num]).result(REQUEST_TIMEOUT)
+            return [bbox for _, bbox in hits]
+        except Exception as e:
+            print(f"❌ Error searching page {page_num}: {e}")
+            return []
+    
+    def get_outline(self) -> List[List]:
+        """Table of contents as [level, title, 1-based page] rows, read from the PDF only once"""
+        if not self.current_doc:
+            return []
+        
+        # Runs off the GUI thread: read path and hash together in case another document opens
+        path, content_hash = self.current_doc.name, self.content_hash
+        outline = self.outline_cache.get(content_hash)
+        if outline is not None:
+            return outline
+        
+        try:
+            outline = self.engine.outline(path).result(REQUEST_TIMEOUT)
+        except Exception as e:
+            print(f"❌ Error reading outline: {e}")
+            return []
+        
+        self.outline_cache.put(content_hash, outline)
+        return outline
+    
+    def get_page_features(self) -> Optional[np.ndarray]:
+        """(pages, len(PAGE_FEATURES)) array describing each page's content, extracted only once"""
+        if not self.current_doc:
+            return None
+        
+        path, content_hash, total_pages = self.current_doc.name, self.content_hash, self.total_pages
+        features = self.feature_cache.get(content_hash)
+        if features is not None and features.shape == (total_pages, len(PAGE_FEATURES)):
+            return features
+        
+        futures = [
+            self.engine.page_features(path, start, min(start + FEATURE_CHUNK_PAGES, total_pages))
+            for start in range(0, total_pages, FEATURE_CHUNK_PAGES)
+        ]
+        try:
+            rows = [row for future in futures for row in future.result(REQUEST_TIMEOUT)]
+        except Exception as e:
+            print(f"❌ Error extracting page features: {e}")
+            return None
+        
+        features = np.asarray(rows, dtype=np.float32).reshape(-1, len(PAGE_FEATURES))
+        self.feature_cache.put(content_hash, features)
+        print(f"📐 Page features extracted for {len(features)} pages")
+        return features
+    
+    def get_page_sizes(self) -> List[Tuple[float, float]]:
+        """Get (width, height) in points of every page, without rendering"""
+        if not self.current_doc:
+            return []
+        return self.current_doc.page_sizes
+    
+    def shutdown(self):
+        """Close the document and stop the engine's worker processes"""
+        self.close_pdf()
+        self.engine.shutdown()
+    
     def go_to_page(self, page_num: int) -> bool:
         """Navigate to specific page"""
         if not self.current_doc or page_num < 0 or page_num >= self.total_pages:
@@ -102,6 +270,7 @@ class PDFHandler:
         self._start_page_timing()
         
         print(f"📖 Navigated from page {old_page + 1} to {self.current_page + 1}")
+        event_bus.publish(PAGE_CHANGED, document_id=self.document_id, page=self.current_page)
         return True
     
     def next_page(self) -> bool:
@@ -157,24 +326,14 @@ class PDFHandler:
         if not self.current_doc:
             return []
         
-        results = []
-        pages_to_search = [page_num] if page_num is not None else range(self.total_pages)
-        
-        for page_idx in pages_to_search:
-            try:
-                page = self.current_doc[page_idx]
-                text_instances = page.search_for(query)
-                
-                for inst in text_instances:
-                    results.append({
-                        'page': page_idx + 1,
-                        'bbox': inst,
-                        'text': query
-                    })
-            except Exception as e:
-                print(f"❌ Error searching page {page_idx}: {e}")
+        pages_to_search = [page_num] if page_num is not None else None
+        try:
+            hits = self.engine.search(self.current_doc.name, query, pages_to_search).result(REQUEST_TIMEOUT)
+        except Exception as e:
+            print(f"❌ Error searching document: {e}")
+            return []
         
-        return results
+        return [{'page': page_idx + 1, 'bbox': bbox, 'text': query} for page_idx, bbox in hits]
     
     def extract_page_text(self, page_num: int) -> str:
         """Extract text from specific page"""
@@ -182,36 +341,62 @@ class PDFHandler:
             return ""
         
         try:
-            page = self.current_doc[page_num]
-            return page.get_text()
+            return self.engine.text(self.current_doc.name, page_num).result(REQUEST_TIMEOUT)
         except Exception as e:
             print(f"❌ Error extracting text from page {page_num}: {e}")
             return ""
     
-    def _get_or_create_document(self, filepath: str) -> int:
-        """Get existing document or create new one in database"""
+    @staticmethod
+    def find_or_create_document(filepath: str, title: str, total_pages: int,
+                                fingerprint: Optional[str] = None) -> Optional[int]:
+        """Get existing document or create new one in database; safe to call off the GUI thread
+        
+        Documents are matched by content fingerprint, so a moved or renamed file is re-linked
+        to its record. Records from before fingerprints existed are matched by path once.
+        """
         session = db_manager.get_session()
         try:
             filename = os.path.basename(filepath)
             
-            # Try to find existing document
-            doc = session.query(Document).filter_by(filepath=filepath).first()
+            doc = None
+            if fingerprint:
+                doc = (session.query(Document)
+                       .filter_by(fingerprint=fingerprint)
+                       .order_by(Document.updated_at.desc())
+                       .first())
+            
+            if doc is None:
+                # Same path only for a record from before fingerprints; a fingerprinted
+                # record there belongs to whatever PDF used to live at this path
+                query = session.query(Document).filter_by(filepath=filepath)
+                if fingerprint:
+                    query = query.filter(Document.fingerprint.is_(None))
+                doc = query.first()
             
             if not doc:
                 # Create new document
-                info = self.get_document_info()
                 doc = Document(
                     filename=filename,
                     filepath=filepath,
-                    title=info.get('title', filename),
-                    total_pages=self.total_pages,
+                    fingerprint=fingerprint,
+                    title=title,
+                    total_pages=total_pages,
                     current_page=1
                 )
                 session.add(doc)
                 session.commit()
                 print(f"📝 New document created in database: {filename}")
-            else:
-                print(f"📖 Existing document loaded: {filename}")
+                return doc.id
+            
+            if doc.filepath != filepath:
+                print(f"🔗 Re-linked moved document: {doc.filepath} -> {filepath}")
+                doc.filepath = filepath
+                doc.filename = filename
+            if fingerprint and doc.fingerprint != fingerprint:
+                doc.fingerprint = fingerprint
+            if session.dirty:
+                session.commit()
+            print(f"📖 Existing document loaded: {filename}")
             
             return doc.id
             
@@ -222,16 +407,24 @@ class PDFHandler:
         finally:
             session.close()
     
-    def _get_saved_position(self) -> int:
-        """Get saved reading position from database"""
-        if not self.document_id:
-            return 0
-        
+    @staticmethod
+    def peek_saved_position(filepath: str, fingerprint: Optional[str] = None) -> int:
+        """Saved 0-based page of a document, looked up without opening it"""
         session = db_manager.get_session()
         try:
-            doc = session.query(Document).filter_by(id=self.document_id).first()
+            doc = None
+            if fingerprint:
+                doc = (session.query(Document.current_page)
+                       .filter_by(fingerprint=fingerprint)
+                       .order_by(Document.updated_at.desc())
+                       .first())
+            if doc is None:
+                query = session.query(Document.current_page).filter_by(filepath=filepath)
+                if fingerprint:
+                    query = query.filter(Document.fingerprint.is_(None))
+                doc = query.first()
             if doc and doc.current_page:
-                return doc.current_page - 1  # Convert to 0-based indexing
+                return doc.current_page - 1
             return 0
         except Exception as e:
             print(f"❌ Error loading saved position: {e}")
@@ -258,6 +451,7 @@ class PDFHandler:
                 
                 session.commit()
                 print(f"💾 Progress saved: Page {self.current_page + 1}")
+                event_bus.publish(PROGRESS_SAVED, document_id=self.document_id, page=self.current_page)
         except Exception as e:
             print(f"❌ Error saving progress: {e}")
             session.rollback()
@@ -273,7 +467,11 @@ class PDFHandler:
     
     def _end_session(self):
         """End current reading session and save to database"""
-        if not self.session_start_time or not self.document_id:
+        if not self.session_start_time:
+            return
+        if not self.document_id:
+            print("⚠️ Reading session not saved: document has no database record")
+            self.session_start_time = None
             return
         
         # Calculate session stats
@@ -284,6 +482,10 @@ class PDFHandler:
         # Save session to database
         session = db_manager.get_session()
         try:
+            # Running speed and consistency stats commit together with the session
+            record_reading_session(session, self.document_id, self.session_start_time, duration, pages_read)
+            record_streak_session(session, self.session_start_time, duration, pages_read)
+            
             reading_session = ReadingSession(
                 document_id=self.document_id,
                 start_time=self.session_start_time,
@@ -295,9 +497,24 @@ class PDFHandler:
                 session_type='regular'
             )
             session.add(reading_session)
+            session.flush()
+            
+            # Per-page dwell times train the page content model
+            session.add_all(
+                PageDwell(
+                    document_id=self.document_id,
+                    session_id=reading_session.id,
+                    page_number=page + 1,  # 1-based
+                    seconds=seconds
+                )
+                for page, seconds in self.page_times.items()
+            )
             session.commit()
             
             print(f"📊 Session saved: {duration:.1f} min, {pages_read} pages")
+            event_bus.publish(SESSION_COMMITTED, session_id=reading_session.id, document_id=self.document_id,
+                              start_time=reading_session.start_time, duration=duration, pages_read=pages_read,
+                              session_type=reading_session.session_type, focus=False)
             
         except Exception as e:
             print(f"❌ Error saving session: {e}")
@@ -315,7 +532,8 @@ class PDFHandler:
         """End timing for current page and record time"""
         if self.page_start_time:
             page_duration = (datetime.now() - self.page_start_time).total_seconds()
-            self.page_times[self.current_page] = page_duration
+            # Coming back to a page adds to its dwell instead of replacing it
+            self.page_times[self.current_page] = self.page_times.get(self.current_page, 0.0) + page_duration
             print(f"⏱️  Page {self.current_page + 1} read in {page_duration:.1f}s")
             self.page_start_time = None
     
@@ -0,0 +1,324 @@
+"""
+Continuous View - Vertical scrolling through a whole document with virtualised pages
+Only pages near the viewport hold rendered pixmaps; their widgets are recycled while scrolling
+"""
+
+from bisect import bisect_right
+from concurrent.futures import Future
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from PyQt6.QtWidgets import QScrollArea, QWidget
+from PyQt6.QtCore import Qt, QTimer, QRect, pyqtSignal
+from PyQt6.QtGui import QPainter, QColor, QPixmap
+from notes.highlight_selector import HighlightableLabel
+from ui.page_rendering import cached_page_pixmap, frame_to_qpixmap, is_page_cached, store_frame
+
+PAGE_SPACING = 12     # Gap between pages in pixels
+RENDER_MARGIN = 1.0   # Viewport heights kept rendered above and below the visible area
+RENDER_POLL_MS = 8    # How often finished engine renders are collected
+
+class PendingPage(NamedTuple):
+    """A live page waiting for its pixels and text"""
+    pixmap: Optional[QPixmap]   # From the disk cache
+    frame: Optional[Future]     # Engine render when the cache missed
+    text: Optional[Future]
+
+class PageCanvas(QWidget):
+    """Scrollable surface that paints placeholders for pages without a live widget"""
+
+    def __init__(self, view: 'ContinuousPageView'):
+        super().__init__()
+        self.view = view
+        self.setAutoFillBackground(True)
+        palette = self.palette()
+        palette.setColor(self.backgroundRole(), QColor(224, 224, 224))
+        self.setPalette(palette)
+
+    def paintEvent(self, event):
+        """Paint blank page rectangles in the exposed area"""
+        if not self.view.page_offsets:
+            return
+
+        painter = QPainter(self)
+        painter.setPen(QColor(200, 200, 200))
+        painter.setBrush(QColor(255, 255, 255))
+
+        exposed = event.rect()
+        first = self.view.page_at(exposed.top())
+        last = self.view.page_at(exposed.bottom())
+        for page in range(first, last + 1):
+            painter.drawRect(self.view.page_rect(page))
+
+class ContinuousPageView(QScrollArea):
+    """Continuous-scroll page view with a bounded pool of page widgets"""
+
+    # Signals
+    current_page_changed = pyqtSignal(int)  # 0-based page under the reading line
+    highlight_requested = pyqtSignal(object, str)  # page label, selected text
+
+    def __init__(self, pdf_handler, page_cache=None, parent=None):
+        super().__init__(parent)
+        self.pdf_handler = pdf_handler
+        self.page_cache = page_cache
+        self.zoom = 1.0
+
+        # Layout of every page at the current zoom
+        self.page_sizes: List[Tuple[float, float]] = []  # points
+        self.page_offsets: List[int] = []  # top edge in canvas pixels
+        self.canvas_width = 0
+
+        # Live page widgets and the recycled pool
+        self.active_pages: Dict[int, HighlightableLabel] = {}
+        self.rendered_pages = set()
+        self.pending_pages: Dict[int, PendingPage] = {}
+        self.label_pool: List[HighlightableLabel] = []
+
+        self.current_page = 0
+        # Programmatic scroll target (page, scroll bar value), kept until the user scrolls away
+        self._requested_scroll: Optional[Tuple[int, int]] = None
+        self._requested_scroll_applied = False
+
+        # Supplies stored highlight boxes for a page
+        self.highlight_provider: Optional[Callable[[int], List]] = None
+
+        self.canvas = PageCanvas(self)
+        self.setWidget(self.canvas)
+        self.setWidgetResizable(False)
+        self.setAlignment(Qt.AlignmentFlag.AlignHCenter)
+
+        # Scroll events collapse into one layout pass per event loop turn
+        self.layout_timer = QTimer(self)
+        self.layout_timer.setSingleShot(True)
+        self.layout_timer.setInterval(0)
+        self.layout_timer.timeout.connect(self._update_visible_pages)
+
+        # Live pages render in parallel in the PDF engine; results are collected between events
+        self.render_timer = QTimer(self)
+        self.render_timer.setSingleShot(True)
+        self.render_timer.setInterval(0)
+        self.render_timer.timeout.connect(self._render_next_page)
+
+        self.verticalScrollBar().valueChanged.connect(self.layout_timer.start)
+
+    def set_document(self, page_sizes: List[Tuple[float, float]], zoom: float, page: int = 0):
+        """Lay out a document and scroll to a page"""
+        self.page_sizes = list(page_sizes)
+        self.zoom = zoom
+        self._relayout()
+        self.scroll_to_page(page)
+
+    def clear_document(self):
+        """Drop all pages"""
+        self.page_sizes = []
+        self._relayout()
+
+    def set_zoom(self, zoom: float):
+        """Change zoom, keeping the same spot of the current page in view"""
+        if not self.page_offsets or zoom == self.zoom:
+            self.zoom = zoom
+            return
+
+        page = self.current_page
+        top = self.verticalScrollBar().value()
+        fraction = (top - self.page_offsets[page]) / max(1, self.page_rect(page).height())
+
+        self.zoom = zoom
+        self._relayout()
+
+        self._request_scroll(page, self.page_offsets[page] + int(fraction * self.page_rect(page).height()))
+
+    def scroll_to_page(self, page: int):
+        """Bring the top of a page into view"""
+        if not self.page_offsets:
+            return
+
+        page = max(0, min(page, len(self.page_offsets) - 1))
+        self._request_scroll(page, max(0, self.page_offsets[page] - PAGE_SPACING // 2))
+
+    def refresh_highlights(self):
+        """Re-read stored highlights for every live page"""
+        if not self.highlight_provider:
+            return
+        for page, label in self.active_pages.items():
+            label.set_page_highlights(page, self.highlight_provider(page))
+
+    def page_at(self, y: int) -> int:
+        """Index of the page covering a canvas y coordinate"""
+        if not self.page_offsets:
+            return 0
+        index = bisect_right(self.page_offsets, y) - 1
+        return max(0, min(index, len(self.page_offsets) - 1))
+
+    def page_rect(self, page: int) -> QRect:
+        """Canvas rectangle of a page at the current zoom"""
+        width, height = self.page_sizes[page]
+        width, height = int(width * self.zoom), int(height * self.zoom)
+        return QRect((self.canvas_width - width) // 2, self.page_offsets[page], width, height)
+
+    def resizeEvent(self, event):
+        """More or fewer pages may now be visible"""
+        super().resizeEvent(event)
+        self.layout_timer.start()
+
+    def _request_scroll(self, page: int, value: int):
+        """Scroll programmatically, making `page` the current page"""
+        self._requested_scroll = (page, value)
+        self._requested_scroll_applied = False
+        self.verticalScrollBar().setValue(value)
+        self.layout_timer.start()
+
+    def _relayout(self):
+        """Recompute page positions and drop every live page"""
+        for page in list(self.active_pages):
+            self._release_page(page)
+
+        offsets = []
+        y = PAGE_SPACING
+        max_width = 0
+        for width, height in self.page_sizes:
+            offsets.append(y)
+            y += int(height * self.zoom) + PAGE_SPACING
+            max_width = max(max_width, int(width * self.zoom))
+
+        self.page_offsets = offsets
+        self.canvas_width = max_width + 2 * PAGE_SPACING
+        self.canvas.resize(self.canvas_width, y if offsets else 0)
+        self.canvas.update()
+
+    def _update_visible_pages(self):
+        """Attach widgets to pages near the viewport and recycle the rest"""
+        if not self.page_offsets:
+            return
+
+        scroll_bar = self.verticalScrollBar()
+        requested_page = None
+        if self._requested_scroll is not None:
+            requested_page, value = self._requested_scroll
+            target = min(value, scroll_bar.maximum())
+            if not self._requested_scroll_applied:
+                # The scroll range may have been stale when the scroll was requested
+                self._requested_scroll_applied = True
+                if scroll_bar.value() != target:
+                    scroll_bar.setValue(target)
+            elif scroll_bar.value() != target:
+                # The user scrolled; follow the reading line again
+                self._requested_scroll = None
+                requested_page = None
+
+        top = scroll_bar.value()
+        height = self.viewport().height()
+        margin = int(height * RENDER_MARGIN)
+
+        first = self.page_at(top - margin)
+        last = self.page_at(top + height + margin)
+
+        for page in list(self.active_pages):
+            if page < first or page > last:
+                self._release_page(page)
+
+        for page in range(first, last + 1):
+            if page not in self.active_pages:
+                self._attach_page(page)
+
+        # The reading line sits a third of the way down the viewport
+        current = self.page_at(top + height // 3)
+        if requested_page is not None and first <= requested_page <= last:
+            current = requested_page
+
+        if current != self.current_page:
+            self.current_page = current
+            self.current_page_changed.emit(current)
+
+        if len(self.rendered_pages) < len(self.active_pages):
+            self.render_timer.start(0)
+
+    def _attach_page(self, page: int):
+        """Give a page a (recycled) widget; it is rendered later"""
+        label = self.label_pool.pop() if self.label_pool else self._create_label()
+        label.setGeometry(self.page_rect(page))
+        label.show()
+        self.active_pages[page] = label
+
+    def _release_page(self, page: int):
+        """Return a page widget to the pool and free its pixmap"""
+        label = self.active_pages.pop(page)
+        self.rendered_pages.discard(page)
+        pending = self.pending_pages.pop(page, None)
+        if pending:
+            for future in (pending.frame, pending.text):
+                if future:
+                    future.cancel()
+        label.hide()
+        label.reset()
+        self.label_pool.append(label)
+
+    def _create_label(self) -> HighlightableLabel:
+        """Create a page widget for the pool"""
+        label = HighlightableLabel(self.canvas)
+        label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
+        label.highlight_requested.connect(
+            lambda text, _rect, label=label: self.highlight_requested.emit(label, text)
+        )
+        return label
+
+    def _render_next_page(self):
+        """Request renders for live pages and show the ones that have arrived"""
+        self._request_pages()
+
+        for page, pending in list(self.pending_pages.items()):
+            if any(future and not future.done() for future in (pending.frame, pending.text)):
+                continue
+            del self.pending_pages[page]
+            self._show_page(page, pending)
+
+        if self.pending_pages:
+            self.render_timer.start(RENDER_POLL_MS)
+        elif len(self.rendered_pages) < len(self.active_pages):
+            self.render_timer.start(0)
+
+    def _request_pages(self):
+        """Send unrendered live pages to the engine, nearest first; decode one cached page per tick"""
+        decoded = False
+        for page in sorted(self.active_pages, key=lambda p: abs(p - self.current_page)):
+            if page in self.rendered_pages or page in self.pending_pages:
+                continue
+
+            pixmap = None
+            if is_page_cached(self.pdf_handler, page, self.zoom, self.page_cache):
+                if decoded:
+                    continue
+                decoded = True
+                pixmap = cached_page_pixmap(self.pdf_handler, page, self.zoom, self.page_cache)
+
+            frame = None if pixmap else self.pdf_handler.request_page_pixmap(page, self.zoom)
+            self.pending_pages[page] = PendingPage(pixmap, frame, self.pdf_handler.request_page_text_dict(page))
+
+    def _show_page(self, page: int, pending: PendingPage):
+        """Put a finished render and its text data on the page widget"""
+        label = self.active_pages[page]
+        self.rendered_pages.add(page)
+
+        pixmap = pending.pixmap
+        if pixmap is None:
+            frame = self._future_result(pending.frame, page)
+            if not frame:
+                return
+            store_frame(self.pdf_handler, page, self.zoom, frame, self.page_cache)
+            pixmap = frame_to_qpixmap(frame)
+
+        label.setPixmap(pixmap)
+        text_dict = self._future_result(pending.text, page) or {}
+        label.set_pdf_page_data(page, text_dict.get("blocks", []), self.zoom)
+
+        if self.highlight_provider:
+            label.set_page_highlights(page, self.highlight_provider(page))
+
+    @staticmethod
+    def _future_result(future: Optional[Future], page: int):
+        """Result of an engine request, None if it failed"""
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception as e:
+            print(f"❌ Error rendering page {page + 1}: {e}")
+            return None
@@ -0,0 +1,133 @@
+"""
+Heatmap Widget - Weekday by hour grid of reading activity
+The grid is painted once into a pixmap and reused until the data, metric or size changes
+"""
+
+from typing import Optional, Tuple
+import numpy as np
+from PyQt6.QtWidgets import QWidget, QToolTip
+from PyQt6.QtCore import Qt, QRect, QSize
+from PyQt6.QtGui import QPainter, QPixmap, QColor, QFont
+from analytics.heatmap import HeatmapData, WEEKDAYS, HOURS
+
+LABEL_WIDTH = 36
+LABEL_HEIGHT = 18
+EMPTY_COLOR = QColor(240, 240, 240)
+LOW_COLOR = QColor(233, 213, 255)   # Light purple
+HIGH_COLOR = QColor(126, 34, 206)   # App purple (#7E22CE)
+METRIC_TITLES = {
+    'minutes': 'minutes read',
+    'pages_per_minute': 'pages per minute',
+    'productivity': 'focus productivity',
+}
+
+class HeatmapWidget(QWidget):
+    """7x24 heatmap of one metric"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.data: Optional[HeatmapData] = None
+        self.metric = 'minutes'
+        self.values: Optional[np.ndarray] = None
+        self.values_metric: Optional[str] = None
+        self.pixmap: Optional[QPixmap] = None
+        self.pixmap_key: Optional[Tuple] = None
+        self.setMouseTracking(True)
+        self.setMinimumHeight(LABEL_HEIGHT + 7 * 14)
+
+    def sizeHint(self) -> QSize:
+        return QSize(LABEL_WIDTH + HOURS * 24, LABEL_HEIGHT + 7 * 22)
+
+    def set_data(self, data: HeatmapData, metric: Optional[str] = None):
+        """Show new totals; repaints only when something visible changed"""
+        if metric:
+            self.metric = metric
+        if self.data is not None and data.version == self.data.version and self.values_metric == self.metric:
+            return
+        self.data = data
+        self.values_metric = self.metric
+        if self.metric == 'productivity':
+            self.values = data.productivity
+        elif self.metric == 'pages_per_minute':
+            self.values = data.pages_per_minute()
+        else:
+            self.values = data.minutes
+        self.update()
+
+    def set_metric(self, metric: str):
+        """Switch the metric shown"""
+        if self.data is not None and metric != self.metric:
+            self.set_data(self.data, metric)
+
+    def paintEvent(self, event):
+        key = (self.data.version if self.data else None, self.metric, self.size().width(), self.size().height())
+        if self.pixmap is None or key != self.pixmap_key:
+            self.pixmap = self._render()
+            self.pixmap_key = key
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.pixmap)
+        painter.end()
+
+    def mouseMoveEvent(self, event):
+        cell = self._cell_at(event.position().toPoint())
+        if cell is None or self.values is None or self.data is None:
+            QToolTip.hideText()
+            return
+        weekday, hour = cell
+        value = self.values[weekday, hour]
+        text = "no data" if np.isnan(value) else f"{value:.1f} {METRIC_TITLES.get(self.metric, self.metric)}"
+        sessions = int(self.data.sessions[weekday, hour])
+        QToolTip.showText(event.globalPosition().toPoint(),
+                          f"{WEEKDAYS[weekday]} {hour:02d}:00 - {text} ({sessions} sessions)", self)
+
+    def _cell_size(self) -> Tuple[float, float]:
+        return ((self.width() - LABEL_WIDTH) / HOURS, (self.height() - LABEL_HEIGHT) / 7)
+
+    def _cell_at(self, point) -> Optional[Tuple[int, int]]:
+        cell_width, cell_height = self._cell_size()
+        if cell_width <= 0 or cell_height <= 0:
+            return None
+        hour = int((point.x() - LABEL_WIDTH) // cell_width)
+        weekday = int((point.y() - LABEL_HEIGHT) // cell_height)
+        if 0 <= hour < HOURS and 0 <= weekday < 7:
+            return weekday, hour
+        return None
+
+    def _render(self) -> QPixmap:
+        pixmap = QPixmap(self.size())
+        pixmap.fill(self.palette().color(self.backgroundRole()))
+        painter = QPainter(pixmap)
+        font = QFont()
+        font.setPointSize(8)
+        painter.setFont(font)
+
+        cell_width, cell_height = self._cell_size()
+        for hour in range(0, HOURS, 3):
+            painter.drawText(QRect(int(LABEL_WIDTH + hour * cell_width), 0, int(cell_width * 3), LABEL_HEIGHT),
+                             Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, f"{hour:02d}")
+        for weekday, name in enumerate(WEEKDAYS):
+            painter.drawText(QRect(0, int(LABEL_HEIGHT + weekday * cell_height), LABEL_WIDTH - 4, int(cell_height)),
+                             Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, name)
+
+        values = self.values if self.values is not None else np.full((7, HOURS), np.nan)
+        finite = values[np.isfinite(values) & (values > 0)]
+        peak = finite.max() if len(finite) else 0.0
+        painter.setPen(Qt.PenStyle.NoPen)
+        for weekday in range(7):
+            for hour in range(HOURS):
+                value = values[weekday, hour]
+                painter.setBrush(self._color(value / peak if peak and np.isfinite(value) and value > 0 else 0.0))
+                painter.drawRect(QRect(int(LABEL_WIDTH + hour * cell_width) + 1,
+                                       int(LABEL_HEIGHT + weekday * cell_height) + 1,
+                                       max(1, int(cell_width) - 2), max(1, int(cell_height) - 2)))
+        painter.end()
+        return pixmap
+
+    def _color(self, share: float) -> QColor:
+        if share <= 0:
+            return EMPTY_COLOR
+        return QColor(
+            int(LOW_COLOR.red() + (HIGH_COLOR.red() - LOW_COLOR.red()) * share),
+            int(LOW_COLOR.green() + (HIGH_COLOR.green() - LOW_COLOR.green()) * share),
+            int(LOW_COLOR.blue() + (HIGH_COLOR.blue() - LOW_COLOR.blue()) * share)
+        )
@@ -0,0 +1,122 @@
+"""
+Open Pipeline - Loads everything behind a document's first page in ordered stages
+Slow work runs on a worker thread; its result is applied on the GUI thread
+"""
+
+import time
+from typing import Any, Callable, List, NamedTuple, Optional
+from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal
+
+class OpenStage(NamedTuple):
+    """One step of opening a document"""
+    name: str                                  # Shown in the status bar
+    background: Optional[Callable[[], Any]]    # Runs on a worker thread, must not touch widgets
+    apply: Optional[Callable[[Any], None]]     # Runs on the GUI thread with the background result
+
+class StageWorker(QThread):
+    """Runs a stage's background function"""
+
+    stage_done = pyqtSignal(int, object)  # generation, result
+    stage_failed = pyqtSignal(int, str)  # generation, error message
+
+    def __init__(self, generation: int, work: Callable[[], Any], parent=None):
+        super().__init__(parent)
+        self.generation = generation
+        self.work = work
+
+    def run(self):
+        try:
+            self.stage_done.emit(self.generation, self.work())
+        except Exception as e:
+            self.stage_failed.emit(self.generation, str(e))
+
+class OpenPipeline(QObject):
+    """Runs open stages one after another; starting a new open abandons the old one"""
+
+    # Signals
+    stage_started = pyqtSignal(str, int, int)  # stage name, stage index, stage count
+    pipeline_finished = pyqtSignal(float)  # milliseconds since the open started
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.generation = 0
+        self.stages: List[OpenStage] = []
+        self.index = 0
+        self.started_at = 0.0
+        self.workers = set()  # Kept alive until their thread finishes
+
+    def start(self, stages: List[OpenStage], started_at: Optional[float] = None):
+        """Run stages in order, each after the event loop had a chance to paint"""
+        self.cancel()
+        self.stages = list(stages)
+        self.index = 0
+        self.started_at = started_at if started_at is not None else time.perf_counter()
+        generation = self.generation
+        QTimer.singleShot(0, lambda: self._run_stage(generation))
+
+    def cancel(self):
+        """Drop the remaining stages; results still in flight are ignored"""
+        self.generation += 1
+        self.stages = []
+        # Running workers finish on their own but no longer report back
+        for worker in self.workers:
+            try:
+                worker.stage_done.disconnect(self._apply)
+                worker.stage_failed.disconnect(self._on_stage_failed)
+            except TypeError:
+                pass  # Already disconnected by an earlier cancel
+
+    def is_running(self) -> bool:
+        return self.index < len(self.stages)
+
+    def _run_stage(self, generation: int):
+        if generation != self.generation:
+            return
+        if not self.is_running():
+            self.pipeline_finished.emit((time.perf_counter() - self.started_at) * 1000)
+            return
+
+        stage = self.stages[self.index]
+        self.stage_started.emit(stage.name, self.index, len(self.stages))
+
+        if stage.background is None:
+            self._apply(generation, None)
+            return
+
+        worker = StageWorker(generation, stage.background)
+        worker.stage_done.connect(self._apply)
+        worker.stage_failed.connect(self._on_stage_failed)
+        worker.finished.connect(self._on_worker_finished)
+        self.workers.add(worker)
+        worker.start()
+
+    def _on_worker_finished(self):
+        """Release a worker once its thread has really stopped"""
+        worker = self.sender()
+        worker.wait()  # finished is emitted just before run() returns
+        self.workers.discard(worker)
+
+    def _apply(self, generation: int, result):
+        """Finish the current stage on the GUI thread and schedule the next one"""
+        if generation != self.generation:
+            return
+
+        stage = self.stages[self.index]
+        if stage.apply is not None:
+            try:
+                stage.apply(result)
+            except Exception as e:
+                print(f"❌ Error in open stage '{stage.name}': {e}")
+            if generation != self.generation:
+                return  # The stage started or cancelled a pipeline itself
+
+        self.index += 1
+        QTimer.singleShot(0, lambda: self._run_stage(generation))
+
+    def _on_stage_failed(self, generation: int, error: str):
+        if generation != self.generation:
+            return
+        print(f"❌ Error in open stage '{self.stages[self.index].name}': {error}")
+        # Later stages may still work, e.g. notes without an estimate
+        self.index += 1
+        QTimer.singleShot(0, lambda: self._run_stage(generation))
@@ -0,0 +1,144 @@
+"""
+Outline View - Navigable table of contents with time left per chapter
+"""
+
+from bisect import bisect_right
+from typing import List, Optional
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QTreeWidget, QTreeWidgetItem, QHeaderView
+from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QFont
+from estimation.time_estimator import Chapter, chapter_remaining_minutes, format_time_estimate
+
+class OutlineView(QWidget):
+    """Chapter tree; clicking an entry jumps to its first page"""
+
+    # Signals
+    page_selected = pyqtSignal(int)  # 0-based page
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.chapters: List[Chapter] = []
+        self.items: List[QTreeWidgetItem] = []
+        self.chapter_starts: List[int] = []
+        self.starts_sorted = True
+        self.current_index: Optional[int] = None
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.chapter_label = QLabel("No outline")
+        self.chapter_label.setWordWrap(True)
+        self.chapter_label.setStyleSheet("color: #4169e1; font-weight: bold; padding: 4px;")
+        layout.addWidget(self.chapter_label)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Chapter", "Page", "Left"])
+        self.tree.setUniformRowHeights(True)
+        header = self.tree.header()
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        header.setSectionResizeMode(1, QHeaderView.ResizeMode.ResizeToContents)
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.ResizeToContents)
+        header.setStretchLastSection(False)
+        self.tree.itemClicked.connect(self._on_item_clicked)
+        layout.addWidget(self.tree)
+
+    def set_chapters(self, chapters: List[Chapter]):
+        """Build the tree for a document's chapters"""
+        self.tree.clear()
+        self.chapters = list(chapters)
+        self.items = []
+        self.current_index = None
+        # Outlines usually come in page order; appendices and hand-made outlines can jump back
+        self.chapter_starts = [chapter.start_page for chapter in self.chapters]
+        self.starts_sorted = all(a <= b for a, b in zip(self.chapter_starts, self.chapter_starts[1:]))
+
+        parents: List[QTreeWidgetItem] = []
+        levels: List[int] = []
+        for index, chapter in enumerate(self.chapters):
+            while levels and levels[-1] >= chapter.level:
+                levels.pop()
+                parents.pop()
+
+            item = QTreeWidgetItem([chapter.title, str(chapter.start_page), ""])
+            item.setData(0, Qt.ItemDataRole.UserRole, index)
+            item.setTextAlignment(1, Qt.AlignmentFlag.AlignRight)
+            item.setTextAlignment(2, Qt.AlignmentFlag.AlignRight)
+            if parents:
+                parents[-1].addChild(item)
+            else:
+                self.tree.addTopLevelItem(item)
+
+            parents.append(item)
+            levels.append(chapter.level)
+            self.items.append(item)
+
+        self.tree.expandToDepth(0)
+        self.chapter_label.setText("No outline" if not self.chapters else "")
+
+    def clear_chapters(self):
+        """Forget the outline"""
+        self.set_chapters([])
+
+    def update_progress(self, current_page: int, seconds_per_page: Optional[float]):
+        """Mark the current chapter and refresh time left; cheap enough for every page turn"""
+        if not self.chapters:
+            return
+
+        index = self._chapter_at(current_page)
+        if index != self.current_index:
+            self._set_current(index)
+
+        if seconds_per_page:
+            remaining = chapter_remaining_minutes(self.chapters, current_page, seconds_per_page)
+            for item, minutes in zip(self.items, remaining):
+                text = format_time_estimate(minutes) if minutes > 0 else "✓"
+                if item.text(2) != text:
+                    item.setText(2, text)
+
+        if index is None:
+            self.chapter_label.setText("")
+        elif seconds_per_page:
+            chapter = self.chapters[index]
+            minutes = max(0, chapter.end_page - current_page + 1) * seconds_per_page / 60
+            self.chapter_label.setText(f"📖 {chapter.title}: {format_time_estimate(minutes)} left")
+        else:
+            self.chapter_label.setText(f"📖 {self.chapters[index].title}")
+
+    def _chapter_at(self, page: int) -> Optional[int]:
+        """Deepest chapter containing a 1-based page"""
+        if not self.starts_sorted:
+            # Scan instead of bisecting; prefer the deepest, then the latest-starting entry
+            best = None
+            for index, chapter in enumerate(self.chapters):
+                if chapter.start_page <= page <= chapter.end_page:
+                    key = (chapter.level, chapter.start_page)
+                    if best is None or key >= best[0]:
+                        best = (key, index)
+            return best[1] if best else None
+
+        index = bisect_right(self.chapter_starts, page) - 1
+        # Walk back past siblings' subtrees that ended before this page
+        while index >= 0 and self.chapters[index].end_page < page:
+            index -= 1
+        return index if index >= 0 else None
+
+    def _set_current(self, index: Optional[int]):
+        """Bold the current chapter and keep it in view"""
+        if self.current_index is not None:
+            self._set_bold(self.items[self.current_index], False)
+        self.current_index = index
+        if index is not None:
+            item = self.items[index]
+            self._set_bold(item, True)
+            self.tree.scrollToItem(item)
+
+    @staticmethod
+    def _set_bold(item: QTreeWidgetItem, bold: bool):
+        font = QFont(item.font(0))
+        font.setBold(bold)
+        item.setFont(0, font)
+
+    def _on_item_clicked(self, item: QTreeWidgetItem, _column: int):
+        index = item.data(0, Qt.ItemDataRole.UserRole)
+        if index is not None:
+            self.page_selected.emit(self.chapters[index].start_page - 1)
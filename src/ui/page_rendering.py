@@ -0,0 +1,49 @@
+"""
+Page Rendering - Helpers for turning rendered PDF pages into Qt images
+"""
+
+from typing import Optional
+from PyQt6.QtGui import QImage, QPixmap
+from pdf_handler.disk_cache import Frame, PageCache
+from pdf_handler.pdf_handler import RENDER_PROFILE
+
+def frame_to_qpixmap(frame: Frame) -> QPixmap:
+    """Convert raw page pixels to a QPixmap"""
+    image_format = QImage.Format.Format_RGBA8888 if frame.alpha else QImage.Format.Format_RGB888
+    image = QImage(frame.samples, frame.width, frame.height, frame.stride, image_format)
+    return QPixmap.fromImage(image.copy())
+
+def render_page_pixmap(pdf_handler, page_num: int, zoom: float,
+                       page_cache: Optional[PageCache] = None) -> Optional[QPixmap]:
+    """Get a page as a QPixmap, from the disk cache when it was rendered before"""
+    pixmap = cached_page_pixmap(pdf_handler, page_num, zoom, page_cache)
+    if pixmap:
+        return pixmap
+
+    frame = pdf_handler.get_page_pixmap(page_num, zoom)
+    if not frame:
+        return None
+
+    store_frame(pdf_handler, page_num, zoom, frame, page_cache)
+    return frame_to_qpixmap(frame)
+
+def is_page_cached(pdf_handler, page_num: int, zoom: float,
+                   page_cache: Optional[PageCache] = None) -> bool:
+    """Whether a page can be shown from the disk cache"""
+    if not page_cache or not pdf_handler.content_hash:
+        return False
+    return page_cache.contains(pdf_handler.content_hash, page_num, zoom, RENDER_PROFILE)
+
+def cached_page_pixmap(pdf_handler, page_num: int, zoom: float,
+                       page_cache: Optional[PageCache] = None) -> Optional[QPixmap]:
+    """Get a page from the disk cache only"""
+    if not page_cache or not pdf_handler.content_hash:
+        return None
+    frame = page_cache.get(pdf_handler.content_hash, page_num, zoom, RENDER_PROFILE)
+    return frame_to_qpixmap(frame) if frame else None
+
+def store_frame(pdf_handler, page_num: int, zoom: float, frame: Frame,
+                page_cache: Optional[PageCache] = None):
+    """Keep a fresh render in the disk cache"""
+    if page_cache and pdf_handler.content_hash:
+        page_cache.put(pdf_handler.content_hash, page_num, zoom, RENDER_PROFILE, frame)
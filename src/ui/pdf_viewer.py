@@ -8,15 +8,28 @@ from PyQt6.QtWidgets import (
     QPushButton, QSpinBox, QFileDialog, QSplitter, QTextEdit, 
     QGroupBox, QProgressBar, QTabWidget, QMessageBox
 )
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal
-from PyQt6.QtGui import QPixmap, QFont
-import fitz  # PyMuPDF
+from PyQt6.QtCore import Qt, QTimer, QSettings, pyqtSignal
+from PyQt6.QtGui import QFont
 import os
-from typing import Optional, List
+import time
+from typing import Optional, List, Dict, Tuple
 from datetime import datetime
-from pdf_handler.pdf_handler import PDFHandler
+from pdf_handler.pdf_handler import PDFHandler, RENDER_PROFILE
+from pdf_handler.disk_cache import PageCache, DEFAULT_PAGE_CACHE_MB, compute_content_hash
 from notes.note_manager import NoteManager
 from notes.highlight_selector import HighlightableLabel, HighlightDialog, NotesPanel
+from notes.vault_exporter import DocumentNotesExportWorker
+from ui.continuous_view import ContinuousPageView
+from ui.open_pipeline import OpenPipeline, OpenStage
+from ui.outline_view import OutlineView
+from estimation.time_estimator import build_chapters
+from ui.page_rendering import frame_to_qpixmap, render_page_pixmap
+from ui.refresh_scheduler import RefreshScheduler
+from ui.thumbnail_strip import ThumbnailStrip
+from events.event_bus import (
+    event_bus, PAGE_CHANGED, DOCUMENT_OPENED, DOCUMENT_CLOSED, PROGRESS_SAVED,
+    SESSION_COMMITTED, ESTIMATE_UPDATED
+)
 
 class PDFViewerWidget(QWidget):
     """Enhanced PDF viewer widget with note-taking and WORKING time estimation"""
@@ -25,43 +38,56 @@ class PDFViewerWidget(QWidget):
     page_changed = pyqtSignal(int)
     document_opened = pyqtSignal(str)
     note_created = pyqtSignal(str)  # note_id
+    outline_loaded = pyqtSignal(list)  # [level, title, page] rows
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, note_manager: NoteManager = None):
         super().__init__(parent)
         self.pdf_handler = PDFHandler()
-        self.note_manager = NoteManager()
+        # Shared with the main window: one writer, so one record of our own vault writes
+        self.owns_note_manager = note_manager is None
+        self.note_manager = note_manager if note_manager is not None else NoteManager()
+        
+        # Rendered pages persist across sessions within a byte budget
+        cache_mb = QSettings('SprintReader', 'Main').value('page_cache_mb', DEFAULT_PAGE_CACHE_MB, type=int)
+        self.page_cache = PageCache(cache_mb * 1024 * 1024)
         
         # Display settings
         self.zoom_level = 1.0
         self.zoom_levels = [0.5, 0.75, 1.0, 1.25, 1.5, 2.0, 2.5, 3.0]
         self.current_zoom_index = 2  # Start at 1.0x
+        self.continuous_mode = False
         
         # Current document notes
         self.current_document_notes = []
         self.current_page_highlights = []
+        self._highlight_source = None  # Page label the pending highlight was selected on
+        self._excerpt_misses = set()  # (note id, page) whose excerpt is not in the open document's text
         
         # Time estimation tracking - ENHANCED
         self.time_estimator = None
         self.reading_predictor = None
         self.last_estimation_update = None
         self.current_estimation = {}
+        self._export_worker = None
+        
+        # Everything behind the first page loads in stages
+        self.open_pipeline = OpenPipeline(self)
+        self.document_outline = []
+        self.document_chapters = []
+        self.seconds_per_page = None  # Reading speed behind the latest estimate
+        self.page_features = None  # Per-page content, lets estimates tell slides from proofs
         
         # Timers
         self.autosave_timer = QTimer()
         self.autosave_timer.timeout.connect(self._autosave_progress)
         self.autosave_timer.start(30000)  # Auto-save every 30 seconds
         
-        self.stats_timer = QTimer()
-        self.stats_timer.timeout.connect(self._update_stats_display)
-        self.stats_timer.start(1000)  # Update every second
-        
-        # Time estimation update timer - NEW
-        self.estimation_timer = QTimer()
-        self.estimation_timer.timeout.connect(self._update_time_estimation)
-        self.estimation_timer.start(10000)  # Update estimates every 10 seconds
+        # Sections refresh when the models report a change, not on a clock
+        self.refresh = RefreshScheduler(self)
         
         self.init_ui()
         self.connect_signals()
+        self._setup_refresh_sections()
     
     def init_ui(self):
         """Initialize the user interface with note-taking features"""
@@ -139,6 +165,11 @@ class PDFViewerWidget(QWidget):
         self.zoom_in_btn.clicked.connect(self.zoom_in)
         toolbar_layout.addWidget(self.zoom_in_btn)
         
+        self.continuous_btn = QPushButton("📜 Continuous")
+        self.continuous_btn.setCheckable(True)
+        self.continuous_btn.toggled.connect(self.toggle_continuous_mode)
+        toolbar_layout.addWidget(self.continuous_btn)
+        
         toolbar_layout.addWidget(QLabel(" | "))
         
         # Note-taking controls
@@ -225,6 +256,14 @@ class PDFViewerWidget(QWidget):
         
         sidebar_tabs.addTab(doc_tab, "📄 Document")
         
+        # Outline Tab
+        self.outline_view = OutlineView()
+        sidebar_tabs.addTab(self.outline_view, "📑 Outline")
+        
+        # Page thumbnails Tab
+        self.thumbnail_strip = ThumbnailStrip(self.pdf_handler)
+        sidebar_tabs.addTab(self.thumbnail_strip, "🖼️ Pages")
+        
         # Stats Tab
         stats_tab = QWidget()
         stats_layout = QVBoxLayout(stats_tab)
@@ -299,6 +338,12 @@ class PDFViewerWidget(QWidget):
         self.scroll_area.setWidget(self.pdf_label)
         pdf_layout.addWidget(self.scroll_area)
         
+        # Continuous-scroll alternative to the single page view
+        self.continuous_view = ContinuousPageView(self.pdf_handler, self.page_cache)
+        self.continuous_view.highlight_provider = self._page_highlight_quads
+        self.continuous_view.setVisible(False)
+        pdf_layout.addWidget(self.continuous_view)
+        
         splitter.addWidget(pdf_widget)
     
     def create_notes_panel(self, splitter):
@@ -336,6 +381,12 @@ class PDFViewerWidget(QWidget):
         # PDF highlighting signals
         self.pdf_label.text_selected.connect(self.on_text_selected)
         self.pdf_label.highlight_requested.connect(self.on_highlight_requested)
+        self.continuous_view.highlight_requested.connect(self.on_page_highlight_requested)
+        self.continuous_view.current_page_changed.connect(self._on_continuous_page_changed)
+        self.thumbnail_strip.page_selected.connect(lambda page: self.go_to_page(page + 1))
+        self.outline_view.page_selected.connect(lambda page: self.go_to_page(page + 1))
+        self.open_pipeline.stage_started.connect(self._on_open_stage_started)
+        self.open_pipeline.pipeline_finished.connect(self._on_open_finished)
         
         # Notes panel signals
         self.notes_panel.note_selected.connect(self.on_note_selected)
@@ -344,6 +395,7 @@ class PDFViewerWidget(QWidget):
         # Note manager signals
         self.note_manager.note_created.connect(self.on_note_created)
         self.note_manager.note_updated.connect(self.on_note_updated)
+        self.note_manager.note_deleted.connect(self.on_note_updated)
     
     def open_file(self):
         """Open file dialog and load PDF"""
@@ -358,37 +410,163 @@ class PDFViewerWidget(QWidget):
             self.load_pdf(file_path)
     
     def load_pdf(self, file_path: str):
-        """Load a PDF file and initialize note-taking"""
-        if self.pdf_handler.open_pdf(file_path):
-            # Initialize time estimation - ENHANCED
-            self._initialize_time_estimation()
-            
-            # Update UI
-            self._update_document_info()
-            self._update_navigation_state()
-            self._render_current_page()
-            
-            # Load notes for this document
-            self._load_document_notes()
-            
-            # Initial time estimation
-            self._update_time_estimation()
-            
-            # Emit signal
-            self.document_opened.emit(file_path)
-            
-            # Update status
-            filename = os.path.basename(file_path)
-            self.status_label.setText(f"Loaded: {filename}")
-            self.session_label.setText(f"📚 {filename}")
-            self.note_mode_label.setText("📝 Notes: Active")
-            
-            print(f"✅ PDF loaded with time estimation: {filename}")
-        else:
+        """Load a PDF: paint the saved page first, then load the rest in background stages"""
+        started_at = time.perf_counter()
+        opening = {}  # Content hash from the first stage, reused by the second
+        
+        # Parsing, hashing and database lookups all run on stage workers
+        self.open_pipeline.start([
+            OpenStage("saved page",
+                      lambda: self._resume_position(file_path),
+                      lambda resume: self._on_resume_position(resume, opening)),
+            OpenStage("document",
+                      lambda: self._prepare_document(file_path, opening.get('content_hash')),
+                      lambda prepared: self._on_document_prepared(file_path, prepared, started_at)),
+        ], started_at)
+    
+    def _resume_position(self, file_path: str) -> Optional[Tuple[str, int]]:
+        """(content hash, saved page) of a file, without parsing it"""
+        try:
+            content_hash = compute_content_hash(file_path)
+        except OSError:
+            return None
+        return content_hash, PDFHandler.peek_saved_position(file_path)
+    
+    def _on_resume_position(self, resume: Optional[Tuple[str, int]], opening: Dict):
+        """Show where the reader left off while the PDF is parsed"""
+        if resume is None:
+            return
+        content_hash, page = resume
+        opening['content_hash'] = content_hash
+        if not self.continuous_mode:
+            self._paint_cached_page(content_hash, page)
+    
+    def _prepare_document(self, file_path: str, content_hash: Optional[str]):
+        """Parse the PDF off the GUI thread; None if it cannot be opened"""
+        try:
+            return self.pdf_handler.prepare_document(file_path, content_hash)
+        except Exception as e:
+            print(f"❌ Error opening PDF: {e}")
+            return None
+    
+    def _on_document_prepared(self, file_path: str, prepared, started_at: float):
+        """Switch to the parsed document, paint its saved page and queue everything else"""
+        if prepared is None or not self.pdf_handler.open_document(file_path, prepared):
+            self.open_pipeline.cancel()
             self.status_label.setText("❌ Failed to load PDF")
+            return
+        
+        # First paint: the saved page, without text data or database work
+        self._excerpt_misses.clear()
+        self.document_outline = []
+        self.document_chapters = []
+        self.seconds_per_page = None
+        self.page_features = None
+        self.outline_view.clear_chapters()
+        self._update_document_info()
+        self._update_navigation_state()
+        if self.continuous_mode:
+            self.continuous_view.set_document(
+                self.pdf_handler.get_page_sizes(), self.zoom_level, self.pdf_handler.current_page
+            )
+            self.page_changed.emit(self.pdf_handler.current_page + 1)
+        else:
+            self._render_current_page(extract_text=False)
+        
+        first_page_ms = (time.perf_counter() - started_at) * 1000
+        print(f"⚡ First page shown in {first_page_ms:.0f} ms")
+        
+        # Page overview fills in from the thumbnail cache in the background
+        self.thumbnail_strip.load_document()
+        
+        filename = os.path.basename(file_path)
+        self.session_label.setText(f"📚 {filename}")
+        self.open_pipeline.start(self._open_stages(file_path), started_at)
+    
+    def _open_stages(self, file_path: str) -> List[OpenStage]:
+        """Everything loaded after the first page, in order"""
+        record_fields = self.pdf_handler.document_record_fields()
+        page = self.pdf_handler.current_page
+        
+        return [
+            OpenStage("document record",
+                      lambda: PDFHandler.find_or_create_document(*record_fields),
+                      lambda document_id: self._on_document_record(file_path, document_id)),
+            OpenStage("notes", None, lambda _: self._on_notes_stage()),
+            OpenStage("estimation",
+                      lambda: self._compute_time_estimation(self.pdf_handler.document_id),
+                      self._on_estimation_stage),
+            OpenStage("outline", self.pdf_handler.get_outline, self._on_outline_stage),
+            OpenStage("text",
+                      lambda: self.pdf_handler.get_page_text_dict(page),
+                      lambda text_dict: self._on_text_stage(page, text_dict)),
+            OpenStage("page features", self.pdf_handler.get_page_features, self._on_page_features_stage),
+        ]
+    
+    def _on_open_stage_started(self, name: str, index: int, count: int):
+        """Show open progress in the status bar"""
+        self.status_label.setText(f"Loading {name}... ({index + 1}/{count})")
+    
+    def _on_open_finished(self, elapsed_ms: float):
+        """All open stages are done"""
+        filename = os.path.basename(self.pdf_handler.current_doc.name) if self.pdf_handler.current_doc else ""
+        self.status_label.setText(f"Loaded: {filename}")
+        print(f"✅ PDF loaded in {elapsed_ms:.0f} ms: {filename}")
+    
+    def _on_document_record(self, file_path: str, document_id: Optional[int]):
+        """Attach the database record and announce the document"""
+        self.pdf_handler.attach_document_record(document_id)
+        self.note_mode_label.setText("📝 Notes: Active")
+        self.document_opened.emit(file_path)
+    
+    def _on_notes_stage(self):
+        """Load notes and the current page's highlights"""
+        self._load_document_notes()
+        self._load_page_highlights()
+    
+    def _on_page_features_stage(self, features):
+        """Re-estimate with per-page reading times"""
+        self.page_features = features
+        if features is not None:
+            self.refresh.mark_dirty('estimation')
+    
+    def _on_estimation_stage(self, estimate: Optional[Dict]):
+        """Show the estimate computed in the background"""
+        self._initialize_time_estimation()
+        self._show_time_estimation(estimate)
+    
+    def _on_outline_stage(self, outline: list):
+        """Show the table of contents as a chapter tree"""
+        self.document_outline = outline or []
+        self.document_chapters = build_chapters(self.document_outline, self.pdf_handler.total_pages)
+        self.outline_view.set_chapters(self.document_chapters)
+        self._update_chapter_progress()
+        self.outline_loaded.emit(self.document_outline)
+    
+    def _update_chapter_progress(self):
+        """Refresh the current chapter and time left per chapter"""
+        if self.document_chapters:
+            self.outline_view.update_progress(self.pdf_handler.current_page + 1, self.seconds_per_page)
+    
+    def _on_text_stage(self, page: int, text_dict: Dict):
+        """Make the first page selectable for highlighting"""
+        if self.continuous_mode or page != self.pdf_handler.current_page:
+            return  # The page was re-rendered meanwhile and has its own text data
+        self.pdf_label.set_pdf_page_data(page, text_dict.get("blocks", []), self.zoom_level)
+    
+    def _paint_cached_page(self, content_hash: str, page: int):
+        """Paint a page from the render cache, if it is there"""
+        frame = self.page_cache.get(content_hash, page, self.zoom_level, RENDER_PROFILE)
+        if frame:
+            qpixmap = frame_to_qpixmap(frame)
+            self.pdf_label.setPixmap(qpixmap)
+            self.pdf_label.resize(qpixmap.size())
     
     def _initialize_time_estimation(self):
-        """Initialize time estimation system - NEW"""
+        """Create the time estimation objects once; they serve every document"""
+        if self.time_estimator and self.reading_predictor:
+            return
+        
         try:
             from estimation.time_estimator import TimeEstimator
             from estimation.reading_predictor import ReadingPredictor
@@ -402,6 +580,19 @@ class PDFViewerWidget(QWidget):
             self.time_estimator = None
             self.reading_predictor = None
     
+    @staticmethod
+    def _compute_time_estimation(document_id: Optional[int]) -> Optional[Dict]:
+        """Estimate completion with a short-lived estimator, so it can run off the GUI thread"""
+        if not document_id:
+            return None
+        
+        from estimation.time_estimator import TimeEstimator
+        estimator = TimeEstimator()
+        try:
+            return estimator.estimate_document_completion(document_id)
+        finally:
+            estimator.close()
+    
     def _update_time_estimation(self):
         """Update time estimation display - NEW"""
         if not self.pdf_handler.document_id or not self.time_estimator:
@@ -412,14 +603,28 @@ class PDFViewerWidget(QWidget):
         try:
             # Get document completion estimate
             estimate = self.time_estimator.estimate_document_completion(
-                self.pdf_handler.document_id
+                self.pdf_handler.document_id, self.page_features
             )
+            self._show_time_estimation(estimate)
+        except Exception as e:
+            print(f"❌ Error updating time estimation: {e}")
+            self.estimation_display.setText("⚠️ Estimation temporarily unavailable")
+            self.estimation_status_label.setText("⏱️ Estimation error")
+    
+    def _show_time_estimation(self, estimate: Optional[Dict]):
+        """Display a document completion estimate"""
+        if not self.pdf_handler.document_id:
+            self.estimation_display.setText("No document loaded or estimation unavailable")
+            self.estimation_status_label.setText("⏱️ No estimation")
+            return
+        
+        if estimate:
+            self.current_estimation = estimate
+            self.seconds_per_page = estimate.get('avg_time_per_page_seconds')
+            self._update_chapter_progress()
             
-            if estimate:
-                self.current_estimation = estimate
-                
-                # Format estimation display
-                estimation_text = f"""
+            # Format estimation display
+            estimation_text = f"""
 📖 Document: {estimate.get('document_title', 'Unknown')[:30]}...
 
 📊 Progress:
@@ -431,30 +636,28 @@ class PDFViewerWidget(QWidget):
 • Per page: {estimate.get('avg_time_per_page_seconds', 0):.1f}s
 • To finish: {estimate.get('estimated_time_remaining_formatted', 'Unknown')}
 • Confidence: {estimate.get('confidence_level', 'Unknown')}
+• Based on: {estimate.get('estimation_model', 'average speed')}
 
 📅 Completion:
-• At current pace: {self._format_completion_date(estimate.get('estimated_completion_date'))}
+• Likely finish: {self._format_completion_date(estimate.get('estimated_completion_date'))}
+• 80% chance between: {self._format_completion_range(estimate.get('completion_forecast'))}
 
 💡 Tip: {estimate.get('recommendation', 'Keep reading!')}
-                """.strip()
-                
-                self.estimation_display.setText(estimation_text)
-                
-                # Update status bar
-                remaining_time = estimate.get('estimated_time_remaining_formatted', 'Unknown')
-                confidence = estimate.get('confidence_level', 'Unknown')
-                self.estimation_status_label.setText(f"⏱️ {remaining_time} left ({confidence} confidence)")
-                
-                self.last_estimation_update = datetime.now()
-                print(f"📊 Time estimation updated: {remaining_time} remaining")
-            else:
-                self.estimation_display.setText("⏱️ Building estimate...\nRead a few more pages for accurate predictions.")
-                self.estimation_status_label.setText("⏱️ Building estimate...")
-                
-        except Exception as e:
-            print(f"❌ Error updating time estimation: {e}")
-            self.estimation_display.setText("⚠️ Estimation temporarily unavailable")
-            self.estimation_status_label.setText("⏱️ Estimation error")
+            """.strip()
+            
+            self.estimation_display.setText(estimation_text)
+            
+            # Update status bar
+            remaining_time = estimate.get('estimated_time_remaining_formatted', 'Unknown')
+            confidence = estimate.get('confidence_level', 'Unknown')
+            self.estimation_status_label.setText(f"⏱️ {remaining_time} left ({confidence} confidence)")
+            
+            self.last_estimation_update = datetime.now()
+            print(f"📊 Time estimation updated: {remaining_time} remaining")
+            event_bus.publish(ESTIMATE_UPDATED, document_id=self.pdf_handler.document_id)
+        else:
+            self.estimation_display.setText("⏱️ Building estimate...\nRead a few more pages for accurate predictions.")
+            self.estimation_status_label.setText("⏱️ Building estimate...")
     
     def _format_completion_date(self, date_str: str) -> str:
         """Format completion date for display"""
@@ -466,42 +669,46 @@ class PDFViewerWidget(QWidget):
         except:
             return "Unknown"
     
+    def _format_completion_range(self, forecast: Optional[Dict]) -> str:
+        """Format the P10-P90 completion dates for display"""
+        if not forecast or not forecast.get('p10_date'):
+            return "Unknown"
+        return f"{forecast['p10_date']} and {forecast.get('p90_date') or 'later'}"
+    
     def previous_page(self):
         """Go to previous page"""
-        if self.pdf_handler.previous_page():
+        if self.continuous_mode:
+            self.continuous_view.scroll_to_page(self.pdf_handler.current_page - 1)
+        elif self.pdf_handler.previous_page():
             self._render_current_page()
             self._update_ui_state()
             self._load_page_highlights()
-            self._trigger_estimation_update()
     
     def next_page(self):
         """Go to next page"""
-        if self.pdf_handler.next_page():
+        if self.continuous_mode:
+            self.continuous_view.scroll_to_page(self.pdf_handler.current_page + 1)
+        elif self.pdf_handler.next_page():
             self._render_current_page()
             self._update_ui_state()
             self._load_page_highlights()
-            self._trigger_estimation_update()
     
     def go_to_page(self, page_num: int):
         """Go to specific page (1-based)"""
-        if self.pdf_handler.go_to_page(page_num - 1):  # Convert to 0-based
+        if self.continuous_mode:
+            if page_num - 1 != self.continuous_view.current_page:
+                self.continuous_view.scroll_to_page(page_num - 1)
+        elif self.pdf_handler.go_to_page(page_num - 1):  # Convert to 0-based
             self._render_current_page()
             self._update_ui_state()
             self._load_page_highlights()
-            self._trigger_estimation_update()
-    
-    def _trigger_estimation_update(self):
-        """Trigger immediate estimation update after page change"""
-        if self.time_estimator and self.pdf_handler.document_id:
-            # Use QTimer.singleShot to update estimation after a short delay
-            QTimer.singleShot(1000, self._update_time_estimation)
     
     def zoom_in(self):
         """Increase zoom level"""
         if self.current_zoom_index < len(self.zoom_levels) - 1:
             self.current_zoom_index += 1
             self.zoom_level = self.zoom_levels[self.current_zoom_index]
-            self._render_current_page()
+            self._apply_zoom()
             self._update_zoom_display()
     
     def zoom_out(self):
@@ -509,9 +716,40 @@ class PDFViewerWidget(QWidget):
         if self.current_zoom_index > 0:
             self.current_zoom_index -= 1
             self.zoom_level = self.zoom_levels[self.current_zoom_index]
-            self._render_current_page()
+            self._apply_zoom()
             self._update_zoom_display()
     
+    def _apply_zoom(self):
+        """Re-render at the current zoom level"""
+        if self.continuous_mode:
+            self.continuous_view.set_zoom(self.zoom_level)
+        else:
+            self._render_current_page()
+    
+    def toggle_continuous_mode(self, enabled: bool):
+        """Switch between single page and continuous scrolling"""
+        self.continuous_mode = enabled
+        self.scroll_area.setVisible(not enabled)
+        self.continuous_view.setVisible(enabled)
+        
+        if not self.pdf_handler.current_doc:
+            return
+        
+        if enabled:
+            self.continuous_view.set_document(
+                self.pdf_handler.get_page_sizes(), self.zoom_level, self.pdf_handler.current_page
+            )
+        else:
+            self.continuous_view.clear_document()
+            self._render_current_page()
+            self._load_page_highlights()
+    
+    def _on_continuous_page_changed(self, page: int):
+        """Track the page under the reading line as the current page"""
+        if page != self.pdf_handler.current_page and self.pdf_handler.go_to_page(page):
+            self._update_ui_state()
+            self.page_changed.emit(page + 1)
+    
     def toggle_highlight_mode(self, enabled: bool):
         """Toggle highlight selection mode"""
         if enabled:
@@ -562,34 +800,47 @@ class PDFViewerWidget(QWidget):
         if not self.pdf_handler.document_id:
             return
         
+        self._highlight_source = None
         dialog = HighlightDialog(text, self.pdf_handler.current_page + 1, self)
         dialog.note_created.connect(self.create_note_from_highlight)
         dialog.exec()
     
+    def on_page_highlight_requested(self, label, text: str):
+        """Handle a highlight selected on a page of the continuous view"""
+        if not self.pdf_handler.document_id:
+            return
+        
+        self._highlight_source = label
+        dialog = HighlightDialog(text, label.page_number + 1, self)
+        dialog.note_created.connect(self.create_note_from_highlight)
+        dialog.exec()
+        self._highlight_source = None
+    
     def create_note_from_highlight(self, topic: str, title: str, content: str, highlighted_text: str):
         """Create note from highlight dialog"""
         if not self.pdf_handler.document_id:
             return
         
+        # Store the selection's span boxes so the highlight can be redrawn exactly
+        source = self._highlight_source or self.pdf_label
+        page_number = source.page_number if self._highlight_source else self.pdf_handler.current_page
+        quads = list(source.last_selection_quads) if highlighted_text else []
+        position = (quads[0][0], quads[0][1]) if quads else (0.0, 0.0)
+        
         # Create note using note manager
         note_id = self.note_manager.create_note_from_highlight(
             document_id=self.pdf_handler.document_id,
-            page_number=self.pdf_handler.current_page + 1,
+            page_number=page_number + 1,
             highlighted_text=highlighted_text,
             topic_name=topic,
             user_notes=content,
-            position=(0, 0)  # Position from PDF coordinates
+            position=position,
+            quads=quads
         )
         
-        # Add visual highlight to PDF
-        if highlighted_text:
-            # This would need proper coordinates from the text selection
-            highlight_rect = self.pdf_label.current_selection
-            self.pdf_label.add_highlight(highlighted_text, highlight_rect)
-            self.clear_highlights_btn.setEnabled(True)
-        
         # Update notes display
         self._load_document_notes()
+        self._load_page_highlights()
         self._update_notes_stats()
         
         self.highlight_status_label.setText(f"✅ Note created: {title}")
@@ -642,35 +893,38 @@ class PDFViewerWidget(QWidget):
     
     def on_note_created(self, note_id: str):
         """Handle note creation signal"""
+        # Notes added by an external editor are not in the list yet
+        if not any(note.id == note_id for note in self.current_document_notes):
+            self._load_document_notes()
+            self._load_page_highlights()
         self._update_notes_stats()
     
     def on_note_updated(self, note_id: str):
         """Handle note update signal"""
         self._load_document_notes()
+        self._load_page_highlights()
     
-    def _render_current_page(self):
+    def _render_current_page(self, extract_text: bool = True):
         """Render the current page with text data for highlighting"""
         if not self.pdf_handler.current_doc:
             return
         
-        # Get page pixmap
-        pixmap = self.pdf_handler.get_page_pixmap(
+        # Get page pixmap, from the disk cache when rendered before
+        qpixmap = render_page_pixmap(
+            self.pdf_handler,
             self.pdf_handler.current_page,
-            self.zoom_level
+            self.zoom_level,
+            self.page_cache
         )
         
-        if pixmap:
-            # Convert to QPixmap
-            img_data = pixmap.tobytes("ppm")
-            qpixmap = QPixmap()
-            qpixmap.loadFromData(img_data)
-            
+        if qpixmap:
             # Display in label
             self.pdf_label.setPixmap(qpixmap)
             self.pdf_label.resize(qpixmap.size())
             
-            # Extract text data for highlighting
-            self._extract_page_text_data()
+            # Extract text data for highlighting (deferred while a document opens)
+            if extract_text:
+                self._extract_page_text_data()
             
             # Update page change signal
             self.page_changed.emit(self.pdf_handler.current_page + 1)
@@ -680,18 +934,14 @@ class PDFViewerWidget(QWidget):
         if not self.pdf_handler.current_doc:
             return
         
-        try:
-            page = self.pdf_handler.current_doc[self.pdf_handler.current_page]
-            text_dict = page.get_text("dict")
-            
-            # Set text data in highlightable label
-            self.pdf_label.set_pdf_page_data(
-                self.pdf_handler.current_page,
-                text_dict.get("blocks", []),
-                self.zoom_level
-            )
-        except Exception as e:
-            print(f"Error extracting text data: {e}")
+        text_dict = self.pdf_handler.get_page_text_dict(self.pdf_handler.current_page)
+        
+        # Set text data in highlightable label
+        self.pdf_label.set_pdf_page_data(
+            self.pdf_handler.current_page,
+            text_dict.get("blocks", []),
+            self.zoom_level
+        )
     
     def _load_document_notes(self):
         """Load notes for current document"""
@@ -719,23 +969,44 @@ class PDFViewerWidget(QWidget):
             return
         
         current_page = self.pdf_handler.current_page + 1
-        page_notes = [
-            note for note in self.current_document_notes 
-            if note.page_number == current_page and note.excerpt
-        ]
-        
-        # Clear existing highlights
-        self.pdf_label.clear_highlights()
+        page_notes = self.note_manager.get_notes_for_page(self.pdf_handler.document_id, current_page)
         
-        # Add highlights for page notes
+        # Notes saved before geometry was stored get it recovered from the page text once
         for note in page_notes:
-            if note.excerpt:
-                # This is a simplified version - in practice, you'd need
-                # to store and restore the exact highlight coordinates
-                rect = self.pdf_label.rect()  # Placeholder rectangle
-                self.pdf_label.add_highlight(note.excerpt, rect)
+            if note.excerpt and not note.quads and (note.id, current_page) not in self._excerpt_misses:
+                quads = self._find_excerpt_quads(note.excerpt)
+                if quads:
+                    self.note_manager.set_note_quads(note.id, quads)
+                else:
+                    self._excerpt_misses.add((note.id, current_page))
+        
+        highlights = self._page_highlight_quads(self.pdf_handler.current_page)
+        self.pdf_label.set_page_highlights(self.pdf_handler.current_page, highlights)
+        if self.continuous_mode:
+            self.continuous_view.refresh_highlights()
+        
+        self.clear_highlights_btn.setEnabled(len(highlights) > 0)
+    
+    def _page_highlight_quads(self, page: int) -> list:
+        """Stored highlight boxes of a 0-based page, in reading order"""
+        if not self.pdf_handler.document_id:
+            return []
         
-        self.clear_highlights_btn.setEnabled(len(page_notes) > 0)
+        page_notes = self.note_manager.get_notes_for_page(self.pdf_handler.document_id, page + 1)
+        return sorted(
+            (note.quads for note in page_notes if note.excerpt and note.quads),
+            key=lambda quads: (quads[0][1], quads[0][0])
+        )
+    
+    def _find_excerpt_quads(self, excerpt: str) -> list:
+        """Locate an excerpt on the current page and return its boxes in PDF points"""
+        if not self.pdf_handler.current_doc:
+            return []
+        
+        page = self.pdf_handler.current_page
+        text = ' '.join(excerpt.split())
+        rects = self.pdf_handler.search_page(page, text) or self.pdf_handler.search_page(page, text[:60])
+        return [[round(x0, 2), round(y0, 2), round(x1, 2), round(y1, 2)] for x0, y0, x1, y1 in rects]
     
     def _update_document_info(self):
         """Update document information display"""
@@ -777,6 +1048,7 @@ Progress: {progress}%
         self.page_spinbox.setEnabled(has_doc)
         self.zoom_in_btn.setEnabled(has_doc)
         self.zoom_out_btn.setEnabled(has_doc)
+        self.continuous_btn.setEnabled(has_doc)
         
         # Note-taking controls
         self.highlight_mode_btn.setEnabled(has_doc)
@@ -800,22 +1072,50 @@ Progress: {progress}%
         """Update all UI state after page change"""
         self._update_navigation_state()
         self._update_document_info()
+        self.thumbnail_strip.set_current_page(self.pdf_handler.current_page)
+        self._update_chapter_progress()
+    
+    def _setup_refresh_sections(self):
+        """Tie each display to the events that change it"""
+        self.refresh.add_section(
+            'session_stats', self._update_stats_display, self.stats_display,
+            topics=(PAGE_CHANGED, DOCUMENT_OPENED, DOCUMENT_CLOSED, ESTIMATE_UPDATED),
+            tick_ms=1000  # Shows seconds spent on the current page
+        )
+        self.refresh.add_section(
+            'reading_clock', self._update_reading_clock, self.reading_time_label,
+            topics=(DOCUMENT_OPENED, DOCUMENT_CLOSED),
+            tick_ms=15000  # Shows whole minutes
+        )
+        self.refresh.add_section(
+            'estimation', self._update_time_estimation, self,
+            topics=(PROGRESS_SAVED, SESSION_COMMITTED)
+        )
+    
+    @staticmethod
+    def _format_session_time(duration_min: float) -> str:
+        """Session length as H:MM or M:00"""
+        hours = int(duration_min // 60)
+        minutes = int(duration_min % 60)
+        return f"{hours}:{minutes:02d}" if hours > 0 else f"{minutes}:00"
+    
+    def _update_reading_clock(self):
+        """Update the session clock in the status bar"""
+        stats = self.pdf_handler.get_reading_stats() if self.pdf_handler.current_doc else {}
+        time_str = self._format_session_time(stats.get('session_duration', 0)) if stats else "0:00"
+        self.reading_time_label.setText(f"⏰ {time_str}")
     
     def _update_stats_display(self):
         """Update reading statistics display - ENHANCED WITH ESTIMATION"""
         if not self.pdf_handler.current_doc:
             self.stats_display.setText("No active session")
-            self.reading_time_label.setText("⏰ 0:00")
             return
         
         stats = self.pdf_handler.get_reading_stats()
         
         if stats:
             # Format session duration
-            duration_min = stats.get('session_duration', 0)
-            hours = int(duration_min // 60)
-            minutes = int(duration_min % 60)
-            time_str = f"{hours}:{minutes:02d}" if hours > 0 else f"{minutes}:00"
+            time_str = self._format_session_time(stats.get('session_duration', 0))
             
             # Build stats text
             stats_text = f"""
@@ -845,8 +1145,8 @@ Avg time/page: {self.current_estimation.get('avg_time_per_page_seconds', 0):.1f}
             else:
                 stats_text += "\n\n⏱️ Building time estimates..."
             
-            self.stats_display.setText(stats_text)
-            self.reading_time_label.setText(f"⏰ {time_str}")
+            if self.stats_display.toPlainText() != stats_text:
+                self.stats_display.setText(stats_text)
     
     def _update_notes_stats(self):
         """Update note-taking statistics"""
@@ -873,10 +1173,8 @@ Highlights: {len(highlights)}
     def _autosave_progress(self):
         """Auto-save reading progress"""
         if self.pdf_handler.current_doc:
+            # Estimates refresh on the resulting progress event
             self.pdf_handler._save_progress()
-            # Trigger estimation update after saving progress
-            if self.time_estimator:
-                QTimer.singleShot(500, self._update_time_estimation)
     
     def export_notes(self, export_path: str = None):
         """Export notes for current document"""
@@ -893,47 +1191,36 @@ Highlights: {len(highlights)}
             )
         
         if export_path:
-            try:
-                # Export notes for current document
-                exported_count = 0
-                with open(export_path, 'w', encoding='utf-8') as f:
-                    doc_info = self.pdf_handler.get_document_info()
-                    f.write(f"# Notes for {doc_info.get('title', 'Document')}\n\n")
-                    f.write(f"*Exported on {datetime.now().strftime('%Y-%m-%d %H:%M')}*\n\n")
-                    
-                    # Add time estimation summary
-                    if self.current_estimation:
-                        f.write("## Reading Progress & Time Estimation\n\n")
-                        f.write(f"- **Current Page**: {self.current_estimation.get('current_page', 0)} / {self.current_estimation.get('total_pages', 0)}\n")
-                        f.write(f"- **Progress**: {self.current_estimation.get('progress_percent', 0):.1f}%\n")
-                        f.write(f"- **Estimated time to finish**: {self.current_estimation.get('estimated_time_remaining_formatted', 'Unknown')}\n")
-                        f.write(f"- **Reading speed**: {self.current_estimation.get('avg_time_per_page_seconds', 0):.1f} seconds per page\n\n")
-                    
-                    # Group notes by topic
-                    from collections import defaultdict
-                    notes_by_topic = defaultdict(list)
-                    for note in self.current_document_notes:
-                        topic_name = self.note_manager.topics.get(note.topic_id, type('', (), {'name': 'Unknown'})).name
-                        notes_by_topic[topic_name].append(note)
-                    
-                    for topic_name, notes in notes_by_topic.items():
-                        f.write(f"## {topic_name}\n\n")
-                        for note in sorted(notes, key=lambda n: n.page_number):
-                            f.write(f"### {note.title}\n\n")
-                            if note.excerpt:
-                                f.write(f"**Highlight:** _{note.excerpt}_\n\n")
-                            if note.content:
-                                f.write(f"{note.content}\n\n")
-                            f.write(f"*Page {note.page_number}*\n\n---\n\n")
-                            exported_count += 1
-                
-                QMessageBox.information(
-                    self, 
-                    "Export Complete", 
-                    f"Successfully exported {exported_count} notes to {export_path}"
-                )
-            except Exception as e:
-                QMessageBox.critical(self, "Export Error", f"Failed to export notes:\n{str(e)}")
+            doc_info = self.pdf_handler.get_document_info()
+            topic_names = {topic_id: topic.name for topic_id, topic in self.note_manager.topics.items()}
+            
+            # Format and write on a worker thread
+            self._export_worker = DocumentNotesExportWorker(
+                export_path,
+                doc_info.get('title', 'Document'),
+                self.current_document_notes,
+                topic_names,
+                self.current_estimation,
+                self
+            )
+            self._export_worker.export_finished.connect(self._on_export_finished)
+            self._export_worker.export_failed.connect(self._on_export_failed)
+            self._export_worker.start()
+            self.status_label.setText("📤 Exporting notes...")
+    
+    def _on_export_finished(self, exported_count: int, export_path: str):
+        """Report a completed notes export"""
+        self.status_label.setText(f"📤 Exported {exported_count} notes")
+        QMessageBox.information(
+            self, 
+            "Export Complete", 
+            f"Successfully exported {exported_count} notes to {export_path}"
+        )
+    
+    def _on_export_failed(self, error: str):
+        """Report a failed notes export"""
+        self.status_label.setText("❌ Export failed")
+        QMessageBox.critical(self, "Export Error", f"Failed to export notes:\n{error}")
     
     def get_time_estimation_summary(self) -> dict:
         """Get current time estimation summary for external use"""
@@ -941,6 +1228,10 @@ Highlights: {len(highlights)}
     
     def closeEvent(self, event):
         """Handle widget close event"""
+        self.open_pipeline.cancel()
+        self.refresh.stop()
+        self.page_cache.close()
+        
         # Close time estimation resources
         if self.time_estimator:
             try:
@@ -954,7 +1245,13 @@ Highlights: {len(highlights)}
             except:
                 pass
         
-        if self.pdf_handler.current_doc:
-            self.pdf_handler.close_pdf()
+        # Saves progress and stops the PDF worker processes
+        self.pdf_handler.shutdown()
+        
+        # Make sure queued note writes reach disk
+        if self.owns_note_manager:
+            self.note_manager.close()
+        else:
+            self.note_manager.flush()
         
         super().closeEvent(event)
\ No newline at end of file
@@ -0,0 +1,125 @@
+"""
+Refresh Scheduler - Re-renders only the view sections whose data changed
+Dirty sections are coalesced into at most one refresh per frame, and sections
+whose widget is hidden or minimised wait until it is shown again
+"""
+
+from typing import Callable, Dict, Iterable, List, Optional, Set
+from PyQt6.QtCore import QObject, QEvent, QTimer
+from PyQt6.QtWidgets import QWidget
+from events.event_bus import event_bus
+
+FRAME_MS = 16  # One refresh per ~60 Hz frame
+
+class RefreshSection:
+    """A part of a view with its own refresh function"""
+
+    def __init__(self, name: str, refresh: Callable[[], None], widget: Optional[QWidget]):
+        self.name = name
+        self.refresh = refresh
+        self.widget = widget  # Refresh is skipped while this is not on screen
+        self.ticker: Optional[QTimer] = None  # For sections showing a running clock
+
+class RefreshScheduler(QObject):
+    """Collects dirty sections and refreshes the visible ones on the next frame"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.sections: Dict[str, RefreshSection] = {}
+        self.dirty: Set[str] = set()
+        self.watched_windows = set()
+        self.unsubscribers: List[Callable[[], None]] = []
+
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.setInterval(FRAME_MS)
+        self.frame_timer.timeout.connect(self.flush)
+
+    def add_section(self, name: str, refresh: Callable[[], None], widget: Optional[QWidget] = None,
+                    topics: Iterable[str] = (), tick_ms: Optional[int] = None):
+        """Register a section, refreshed after any event on topics and every tick_ms while shown"""
+        section = RefreshSection(name, refresh, widget)
+        self.sections[name] = section
+
+        for topic in topics:
+            self.unsubscribers.append(
+                event_bus.subscribe(topic, lambda name=name, **_: self.mark_dirty(name))
+            )
+
+        if widget is not None:
+            widget.installEventFilter(self)
+
+        if tick_ms:
+            section.ticker = QTimer(self)
+            section.ticker.setInterval(tick_ms)
+            section.ticker.timeout.connect(lambda: self.mark_dirty(name))
+            self._update_ticker(section)
+
+        self.mark_dirty(name)
+
+    def mark_dirty(self, *names: str):
+        """Schedule sections for the next frame"""
+        self.dirty.update(name for name in names if name in self.sections)
+        if self.dirty and not self.frame_timer.isActive():
+            self.frame_timer.start()
+
+    def flush(self):
+        """Refresh dirty sections that are on screen; hidden ones stay dirty"""
+        for name in [name for name in self.sections if name in self.dirty]:
+            section = self.sections[name]
+            if not self._is_shown(section):
+                self._update_ticker(section)
+                continue
+
+            self.dirty.discard(name)
+            try:
+                section.refresh()
+            except Exception as e:
+                print(f"❌ Error refreshing {name}: {e}")
+
+    def stop(self):
+        """Stop refreshing, e.g. when the window closes"""
+        self.frame_timer.stop()
+        for section in self.sections.values():
+            if section.ticker:
+                section.ticker.stop()
+        for unsubscribe in self.unsubscribers:
+            unsubscribe()
+        self.unsubscribers = []
+        self.dirty.clear()
+
+    def _is_shown(self, section: RefreshSection) -> bool:
+        widget = section.widget
+        if widget is None:
+            return True
+        if not widget.isVisible():
+            return False
+
+        window = widget.window()
+        if window not in self.watched_windows:
+            # Minimising leaves children "visible", so watch the window's state too
+            window.installEventFilter(self)
+            self.watched_windows.add(window)
+        return not window.isMinimized()
+
+    def _update_ticker(self, section: RefreshSection):
+        """Clocks only tick while someone can see them"""
+        if not section.ticker:
+            return
+        if self._is_shown(section):
+            if not section.ticker.isActive():
+                section.ticker.start()
+        else:
+            section.ticker.stop()
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.Type.Show, QEvent.Type.Hide, QEvent.Type.WindowStateChange):
+            # Deferred so visibility has settled for the whole widget tree
+            QTimer.singleShot(0, self._on_visibility_changed)
+        return False
+
+    def _on_visibility_changed(self):
+        for section in self.sections.values():
+            self._update_ticker(section)
+        if self.dirty:
+            self.mark_dirty()
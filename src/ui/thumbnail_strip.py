@@ -0,0 +1,157 @@
+"""
+Thumbnail Strip - Page overview fed by a low-priority background renderer
+Thumbnails persist on disk per document, so reopening a book shows them instantly
+"""
+
+from concurrent.futures import Future
+from typing import Optional, Set, Tuple
+from PyQt6.QtWidgets import QListWidget, QListWidgetItem, QListView, QAbstractItemView
+from PyQt6.QtCore import Qt, QTimer, QSize, pyqtSignal
+from PyQt6.QtGui import QPixmap, QIcon, QColor
+from pdf_handler.disk_cache import ThumbnailCache
+
+THUMBNAIL_DPI = 24          # Small fixed resolution, about 200px tall for a letter page
+THUMBNAIL_SIZE = QSize(90, 120)
+RENDER_INTERVAL_MS = 15     # Idle gap between renders so the reader stays responsive
+CACHE_HITS_PER_TICK = 24    # Cached thumbnails are cheap to decode, load them in bursts
+
+class ThumbnailStrip(QListWidget):
+    """Vertical strip of page thumbnails"""
+
+    # Signals
+    page_selected = pyqtSignal(int)  # 0-based page
+
+    def __init__(self, pdf_handler, parent=None):
+        super().__init__(parent)
+        self.pdf_handler = pdf_handler
+        self.cache: Optional[ThumbnailCache] = None
+        self.done_pages: Set[int] = set()
+        self.pending_render: Optional[Tuple[int, Future]] = None  # Engine render in flight
+
+        self.setViewMode(QListView.ViewMode.ListMode)
+        self.setIconSize(THUMBNAIL_SIZE)
+        self.setUniformItemSizes(True)
+        self.setSpacing(4)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+
+        self.placeholder = QPixmap(THUMBNAIL_SIZE)
+        self.placeholder.fill(QColor(240, 240, 240))
+
+        # Keeps one thumbnail rendering in the background; the visible rows always go first
+        self.render_timer = QTimer(self)
+        self.render_timer.setInterval(RENDER_INTERVAL_MS)
+        self.render_timer.timeout.connect(self._render_next)
+
+        self.itemClicked.connect(lambda item: self.page_selected.emit(self.row(item)))
+
+    def load_document(self):
+        """Show placeholders for the open document and start filling them in"""
+        self.render_timer.stop()
+        self.clear()
+        self.done_pages = set()
+        self._cancel_pending()
+
+        if not self.pdf_handler.current_doc or not self.pdf_handler.content_hash:
+            self.cache = None
+            return
+
+        self.cache = ThumbnailCache(self.pdf_handler.content_hash, THUMBNAIL_DPI)
+        placeholder_icon = QIcon(self.placeholder)
+        for page in range(self.pdf_handler.total_pages):
+            item = QListWidgetItem(placeholder_icon, str(page + 1))
+            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.addItem(item)
+
+        self.set_current_page(self.pdf_handler.current_page)
+        self.render_timer.start()
+
+    def clear_document(self):
+        """Drop all thumbnails"""
+        self.render_timer.stop()
+        self.clear()
+        self.cache = None
+        self.done_pages = set()
+        self._cancel_pending()
+
+    def set_current_page(self, page: int):
+        """Select the current page and keep it in view"""
+        item = self.item(page)
+        if item is None:
+            return
+        self.blockSignals(True)
+        self.setCurrentItem(item)
+        self.blockSignals(False)
+        self.scrollToItem(item, QAbstractItemView.ScrollHint.EnsureVisible)
+
+    def _visible_rows(self) -> range:
+        """Rows currently shown in the viewport"""
+        first_item = self.itemAt(self.viewport().rect().topLeft())
+        last_item = self.itemAt(self.viewport().rect().bottomLeft())
+        first = self.row(first_item) if first_item else 0
+        last = self.row(last_item) if last_item else self.count() - 1
+        return range(first, last + 1)
+
+    def _next_page(self) -> Optional[int]:
+        """Pick the next page: visible rows first, then outwards from them"""
+        visible = self._visible_rows()
+        for page in visible:
+            if page not in self.done_pages:
+                return page
+
+        for distance in range(1, self.count()):
+            for page in (visible.start - distance, visible.stop - 1 + distance):
+                if 0 <= page < self.count() and page not in self.done_pages:
+                    return page
+        return None
+
+    def _render_next(self):
+        """Fill in thumbnails, decoding cached ones in bursts with at most one render in flight"""
+        if not self.cache or not self.pdf_handler.current_doc:
+            self.render_timer.stop()
+            return
+
+        if self.pending_render:
+            page, future = self.pending_render
+            if not future.done():
+                return
+            self.pending_render = None
+            self._finish_render(page, future)
+
+        for _ in range(CACHE_HITS_PER_TICK):
+            page = self._next_page()
+            if page is None:
+                self.render_timer.stop()
+                return
+
+            self.done_pages.add(page)
+            png_data = self.cache.get(page)
+            if png_data is None:
+                future = self.pdf_handler.request_page_png(page, THUMBNAIL_DPI / 72)
+                if future:
+                    self.pending_render = (page, future)
+                return
+
+            self._set_thumbnail(page, png_data)
+
+    def _finish_render(self, page: int, future: Future):
+        """Cache and show a thumbnail rendered by the PDF engine"""
+        try:
+            png_data = future.result()
+        except Exception as e:
+            print(f"❌ Error rendering thumbnail {page + 1}: {e}")
+            return
+        self.cache.put(page, png_data)
+        self._set_thumbnail(page, png_data)
+
+    def _cancel_pending(self):
+        if self.pending_render:
+            self.pending_render[1].cancel()
+            self.pending_render = None
+
+    def _set_thumbnail(self, page: int, png_data: bytes):
+        """Show thumbnail image data on its row"""
+        item = self.item(page)
+        pixmap = QPixmap()
+        if item is not None and pixmap.loadFromData(png_data, "PNG"):
+            item.setIcon(QIcon(pixmap))